@@ -5,22 +5,44 @@ import dbus
 from bluezero import constants
 from bluezero import dbus_tools
 from bluezero import device
+from bluezero import property_cache
+from bluezero import scan_scheduler
+from bluezero import signal_hub
 from bluezero import tools
 
 
 logger = tools.create_module_logger(__name__)
 
 
+def _resolved_cache(gatt_obj):
+    """
+    Return the property cache of a remote GATT object.
+
+    :param gatt_obj: :class:`Service`, :class:`Characteristic` or
+        :class:`Descriptor`
+    :raises RuntimeError: If ``resolve_gatt`` has not found the object
+    """
+    # pylint: disable=protected-access
+    if gatt_obj._prop_cache is None:
+        raise RuntimeError(f'{type(gatt_obj).__name__} is not resolved. '
+                           f'Call resolve_gatt() once the services of the '
+                           f'device are resolved.')
+    return gatt_obj._prop_cache
+
+
 class Service:
     """Remote GATT Service."""
 
-    def __init__(self, adapter_addr, device_addr, srv_uuid):
+    def __init__(self, adapter_addr, device_addr, srv_uuid,
+                 freshness=property_cache.LIVE):
         """
         Remote GATT Service Initialisation.
 
         :param adapter_addr: Adapter address.
         :param device_addr: device address.
         :param srv_uuid: Service UUID.
+        :param freshness: (optional) How property reads are served. One of
+            the modes in :mod:`bluezero.property_cache`.
         """
         self.adapter_addr = adapter_addr
         self.device_addr = device_addr
@@ -28,6 +50,9 @@ class Service:
         self.rmt_device = device.Device(adapter_addr, device_addr)
         self.service_methods = None
         self.service_props = None
+        property_cache.check_mode(freshness)
+        self._freshness = freshness
+        self._prop_cache = None
 
         if self.rmt_device.services_resolved:
             self.resolve_gatt()
@@ -45,6 +70,38 @@ class Service:
             self.service_props = dbus_tools.get_props(self.adapter_addr,
                                                       self.device_addr,
                                                       self.srv_uuid)
+            self._prop_cache = property_cache.PropertyCache(
+                self.service_props, constants.GATT_SERVICE_IFACE,
+                self.service_props.object_path, self._freshness)
+
+    @property
+    def freshness(self):
+        """
+        How property reads are served.
+
+        One of the modes in :mod:`bluezero.property_cache`.
+        """
+        return self._freshness
+
+    @freshness.setter
+    def freshness(self, new_mode):
+        property_cache.check_mode(new_mode)
+        if self._prop_cache is not None:
+            self._prop_cache.mode = new_mode
+        self._freshness = new_mode
+
+    def snapshot(self):
+        """Return a dictionary of all the Service properties."""
+        return _resolved_cache(self).snapshot()
+
+    def refresh(self):
+        """
+        Fetch all the Service properties with one ``GetAll`` call.
+
+        In ``SNAPSHOT`` and ``SIGNAL`` mode the properties are then read
+        from the result.
+        """
+        return _resolved_cache(self).refresh()
 
     @property
     def UUID(self):  # pylint: disable=invalid-name
@@ -53,8 +110,7 @@ class Service:
 
         :return: string for example '00001800-0000-1000-8000-00805f9b34fb'
         """
-        return self.service_props.Get(
-            constants.GATT_SERVICE_IFACE, 'UUID')
+        return self._prop_cache.get('UUID')
 
     @property
     def device(self):
@@ -63,8 +119,7 @@ class Service:
 
         :return: DBus object of device
         """
-        return self.service_props.Get(
-            constants.GATT_SERVICE_IFACE, 'Device')
+        return self._prop_cache.get('Device')
 
     @property
     def primary(self):
@@ -73,14 +128,14 @@ class Service:
 
         :return: boolean
         """
-        return self.service_props.Get(
-            constants.GATT_SERVICE_IFACE, 'Primary')
+        return self._prop_cache.get('Primary')
 
 
 class Characteristic:
     """Remote GATT Characteristic."""
 
-    def __init__(self, adapter_addr, device_addr, srv_uuid, chrc_uuid):
+    def __init__(self, adapter_addr, device_addr, srv_uuid, chrc_uuid,
+                 freshness=property_cache.LIVE):
         """
         Remote GATT Characteristic Initialisation.
 
@@ -88,6 +143,8 @@ class Characteristic:
         :param device_addr: device address.
         :param srv_uuid: Service UUID.
         :param chrc_uuid: Characteristic UUID.
+        :param freshness: (optional) How property reads are served. One of
+            the modes in :mod:`bluezero.property_cache`.
         """
         self.adapter_addr = adapter_addr
         self.device_addr = device_addr
@@ -97,6 +154,13 @@ class Characteristic:
         self.characteristic_methods = None
         self.characteristic_props = None
         self._prop_chngd_sig = None
+        property_cache.check_mode(freshness)
+        self._freshness = freshness
+        self._prop_cache = None
+        # Restored when the characteristic is resolved again
+        self._characteristic_cb = None
+        #: True if notifications have been started and not stopped
+        self.notify_wanted = False
 
     def resolve_gatt(self):
         """
@@ -116,9 +180,53 @@ class Characteristic:
                 self.device_addr,
                 self.srv_uuid,
                 self.chrc_uuid)
+            if self._prop_cache is not None:
+                self._prop_cache.close()
+            self._prop_cache = property_cache.PropertyCache(
+                self.characteristic_props, constants.GATT_CHRC_IFACE,
+                self.characteristic_props.object_path, self._freshness)
+            if self._characteristic_cb is not None:
+                # Subscribe again in case the object path has changed
+                self.add_characteristic_cb(self._characteristic_cb)
             return True
         return False
 
+    @property
+    def object_path(self):
+        """D-Bus path of the characteristic, or None if not resolved."""
+        if self.characteristic_props is None:
+            return None
+        return self.characteristic_props.object_path
+
+    @property
+    def freshness(self):
+        """
+        How property reads are served.
+
+        One of the modes in :mod:`bluezero.property_cache`.
+        """
+        return self._freshness
+
+    @freshness.setter
+    def freshness(self, new_mode):
+        property_cache.check_mode(new_mode)
+        if self._prop_cache is not None:
+            self._prop_cache.mode = new_mode
+        self._freshness = new_mode
+
+    def snapshot(self):
+        """Return a dictionary of all the Characteristic properties."""
+        return _resolved_cache(self).snapshot()
+
+    def refresh(self):
+        """
+        Fetch all the Characteristic properties with one ``GetAll`` call.
+
+        In ``SNAPSHOT`` and ``SIGNAL`` mode the properties are then read
+        from the result.
+        """
+        return _resolved_cache(self).refresh()
+
     @property
     def UUID(self):  # pylint: disable=invalid-name
         """
@@ -126,8 +234,7 @@ class Characteristic:
 
         :return: string example '00002a00-0000-1000-8000-00805f9b34fb'
         """
-        return self.characteristic_props.Get(
-            constants.GATT_CHRC_IFACE, 'UUID')
+        return self._prop_cache.get('UUID')
 
     @property
     def service(self):
@@ -136,8 +243,7 @@ class Characteristic:
 
         :return: DBus object of device
         """
-        return self.characteristic_props.Get(
-            constants.GATT_CHRC_IFACE, 'Service')
+        return self._prop_cache.get('Service')
 
     @property
     def value(self):
@@ -165,8 +271,7 @@ class Characteristic:
 
         :return: Boolean
         """
-        return self.characteristic_props.Get(
-            constants.GATT_CHRC_IFACE, 'Notifying')
+        return self._prop_cache.get('Notifying')
 
     @property
     def flags(self):
@@ -175,8 +280,7 @@ class Characteristic:
 
         :return: list example ['read', 'write', 'notify']
         """
-        return self.characteristic_props.Get(
-            constants.GATT_CHRC_IFACE, 'Flags')
+        return self._prop_cache.get('Flags')
 
     def read_raw_value(self, flags=''):
         """
@@ -194,7 +298,8 @@ class Characteristic:
                             org.bluez.Error.NotSupported
         """
         try:
-            return self.characteristic_methods.ReadValue(dbus.Array())
+            with scan_scheduler.transfer(self.adapter_addr):
+                return self.characteristic_methods.ReadValue(dbus.Array())
         except AttributeError:
             logger.error('Service: %s with Characteristic: %s not defined on '
                          'device: %s', self.srv_uuid, self.chrc_uuid,
@@ -211,19 +316,42 @@ class Characteristic:
             https://git.kernel.org/pub/scm/bluetooth/bluez.git/tree/doc/gatt-api.txt
         """
         try:
-            self.characteristic_methods.WriteValue(value, dbus.Array(flags))
+            with scan_scheduler.transfer(self.adapter_addr):
+                self.characteristic_methods.WriteValue(
+                    dbus_tools.to_byte_array(value), dbus.Array(flags))
         except AttributeError:
             logger.error('Service: %s with Characteristic: %s not defined '
                          'on device: %s. Cannot write_value',  self.srv_uuid,
                          self.chrc_uuid, self.device_addr)
 
+    def _notify_call(self, method, reply_handler):
+        """
+        Call StartNotify or StopNotify, counted as a transfer until the reply
+        """
+        adapter_addr = self.adapter_addr
+        scan_scheduler.transfer_started(adapter_addr)
+
+        def reply():
+            scan_scheduler.transfer_finished(adapter_addr)
+            reply_handler()
+
+        def error(err):
+            scan_scheduler.transfer_finished(adapter_addr)
+            generic_error_cb(err)
+
+        try:
+            method(reply_handler=reply, error_handler=error,
+                   dbus_interface=constants.GATT_CHRC_IFACE)
+        except Exception:
+            scan_scheduler.transfer_finished(adapter_addr)
+            raise
+
     def start_notify(self):
         """Initialise notifications for this characteristic."""
+        self.notify_wanted = True
         try:
-            self.characteristic_methods.StartNotify(
-                reply_handler=self.start_notify_cb,
-                error_handler=generic_error_cb,
-                dbus_interface=constants.GATT_CHRC_IFACE)
+            self._notify_call(self.characteristic_methods.StartNotify,
+                              self.start_notify_cb)
         except AttributeError:
             logger.error('Service: %s with Characteristic: %s not defined '
                          'on device: %s. Cannot start_notify',  self.srv_uuid,
@@ -231,11 +359,10 @@ class Characteristic:
 
     def stop_notify(self):
         """Stop notifications for this characteristic."""
+        self.notify_wanted = False
         try:
-            self.characteristic_methods.StopNotify(
-                reply_handler=self.stop_notify_cb,
-                error_handler=generic_error_cb,
-                dbus_interface=constants.GATT_CHRC_IFACE)
+            self._notify_call(self.characteristic_methods.StopNotify,
+                              self.stop_notify_cb)
         except AttributeError:
             logger.error('Service: %s with Characteristic: %s not defined on'
                          'on device: %s', self.srv_uuid, self.chrc_uuid,
@@ -245,13 +372,44 @@ class Characteristic:
         """
         Add a callback for this characteristic.
 
+        Each notification received is counted as a transfer by
+        :mod:`bluezero.scan_scheduler`.
+
         :param callback: callback function to be added.
         """
-        if callback is None:
+        if self._prop_chngd_sig is not None:
             self._prop_chngd_sig.remove()
-        else:
-            self._prop_chngd_sig = self.characteristic_props.connect_to_signal(
-                'PropertiesChanged', callback)
+            self._prop_chngd_sig = None
+        self._characteristic_cb = callback
+        if callback is not None:
+            adapter_addr = self.adapter_addr
+
+            def properties_changed(iface, changed_props, invalidated_props):
+                if 'Value' in changed_props:
+                    scan_scheduler.transfer_activity(adapter_addr)
+                callback(iface, changed_props, invalidated_props)
+
+            hub = signal_hub.get_hub(dbus_tools.get_system_bus())
+            self._prop_chngd_sig = hub.subscribe(
+                properties_changed, 'PropertiesChanged',
+                dbus.PROPERTIES_IFACE,
+                path=self.characteristic_props.object_path)
+
+    def close(self):
+        """
+        Remove the characteristic callback and any property signal
+        subscription.
+        """
+        self.add_characteristic_cb(None)
+        if self._prop_cache is not None:
+            self._prop_cache.close()
+        self.rmt_device.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def props_changed_cb(self, iface, changed_props, invalidated_props):
         """
@@ -286,7 +444,8 @@ class Descriptor:
     """Remote GATT Descriptor."""
 
     def __init__(self, adapter_addr, device_addr,
-                 srv_uuid, chrc_uuid, dscr_uuid):
+                 srv_uuid, chrc_uuid, dscr_uuid,
+                 freshness=property_cache.LIVE):
         """
         Remote GATT Descriptor Initialisation.
 
@@ -295,6 +454,8 @@ class Descriptor:
         :param srv_uuid: Service UUID.
         :param chrc_uuid: Characteristic UUID.
         :param dscr_uuid: Descriptor UUID.
+        :param freshness: (optional) How property reads are served. One of
+            the modes in :mod:`bluezero.property_cache`.
         """
         self.adapter_addr = adapter_addr
         self.device_addr = device_addr
@@ -304,10 +465,67 @@ class Descriptor:
         self.dscr_uuid = dscr_uuid
         self.descriptor_methods = None
         self.descriptor_props = None
+        property_cache.check_mode(freshness)
+        self._freshness = freshness
+        self._prop_cache = None
 
         if self.rmt_device.services_resolved:
             self.resolve_gatt()
 
+    def resolve_gatt(self):
+        """
+        Get the methods and properties for the discovered descriptor
+
+        :return: Boolean of if the descriptor has been resolved
+        """
+        if self.rmt_device.services_resolved:
+            self.descriptor_methods = dbus_tools.get_methods(
+                self.adapter_addr,
+                self.device_addr,
+                self.srv_uuid,
+                self.chrc_uuid,
+                self.dscr_uuid)
+            self.descriptor_props = dbus_tools.get_props(
+                self.adapter_addr,
+                self.device_addr,
+                self.srv_uuid,
+                self.chrc_uuid,
+                self.dscr_uuid)
+            self._prop_cache = property_cache.PropertyCache(
+                self.descriptor_props, constants.GATT_DESC_IFACE,
+                self.descriptor_props.object_path, self._freshness)
+            return True
+        return False
+
+    @property
+    def freshness(self):
+        """
+        How property reads are served.
+
+        One of the modes in :mod:`bluezero.property_cache`.
+        """
+        return self._freshness
+
+    @freshness.setter
+    def freshness(self, new_mode):
+        property_cache.check_mode(new_mode)
+        if self._prop_cache is not None:
+            self._prop_cache.mode = new_mode
+        self._freshness = new_mode
+
+    def snapshot(self):
+        """Return a dictionary of all the Descriptor properties."""
+        return _resolved_cache(self).snapshot()
+
+    def refresh(self):
+        """
+        Fetch all the Descriptor properties with one ``GetAll`` call.
+
+        In ``SNAPSHOT`` and ``SIGNAL`` mode the properties are then read
+        from the result.
+        """
+        return _resolved_cache(self).refresh()
+
     @property
     def UUID(self):  # pylint: disable=invalid-name
         """
@@ -315,7 +533,7 @@ class Descriptor:
 
         :return: string example '00002a00-0000-1000-8000-00805f9b34fb'
         """
-        return self.descriptor_props.Get(constants.GATT_DESC_IFACE, 'UUID')
+        return self._prop_cache.get('UUID')
 
     @property
     def characteristic(self):
@@ -324,7 +542,7 @@ class Descriptor:
 
         :return: DBus object
         """
-        return self.descriptor_props.Get(constants.GATT_DESC_IFACE, 'UUID')
+        return self._prop_cache.get('Characteristic')
 
     @property
     def value(self):
@@ -336,8 +554,7 @@ class Descriptor:
 
         :return: DBus byte array
         """
-        return self.descriptor_props.Get(
-            constants.GATT_CHRC_IFACE, 'Value')
+        return self._prop_cache.get('Value')
 
     @property
     def flags(self):
@@ -346,8 +563,7 @@ class Descriptor:
 
         :return: list example ['read', 'write']
         """
-        return self.descriptor_props.Get(
-            constants.GATT_CHRC_IFACE, 'Flags')
+        return self._prop_cache.get('Flags')
 
     def read_raw_value(self, flags=''):
         """
@@ -360,7 +576,8 @@ class Descriptor:
 
         :return: dbus byte array
         """
-        return self.descriptor_methods.ReadValue(dbus.Array(flags))
+        with scan_scheduler.transfer(self.adapter_addr):
+            return self.descriptor_methods.ReadValue(dbus.Array(flags))
 
     def write_value(self, value, flags=''):
         """
@@ -372,7 +589,9 @@ class Descriptor:
 
         :return:
         """
-        self.descriptor_methods.WriteValue(value, dbus.Array(flags))
+        with scan_scheduler.transfer(self.adapter_addr):
+            self.descriptor_methods.WriteValue(
+                dbus_tools.to_byte_array(value), dbus.Array(flags))
 
 
 class Profile:
@@ -387,15 +606,12 @@ class Profile:
         self.profile_path = dbus_tools.get_profile_path(adapter_addr,
                                                         device_addr,
                                                         profile_uuid)
-        self.bus = dbus.SystemBus()
-        self.profile_object = self.bus.get_object(
-            constants.BLUEZ_SERVICE_NAME,
-            self.profile_path)
-        self.profile_methods = dbus.Interface(
-            self.profile_object,
-            constants.GATT_PROFILE_IFACE)
-        self.profile_props = dbus.Interface(self.profile_object,
-                                            dbus.PROPERTIES_IFACE)
+        self.bus = dbus_tools.get_system_bus()
+        self.profile_object = dbus_tools.get_dbus_obj(self.profile_path)
+        self.profile_methods = dbus_tools.get_dbus_iface(
+            constants.GATT_PROFILE_IFACE, self.profile_object)
+        self.profile_props = dbus_tools.get_dbus_iface(
+            dbus.PROPERTIES_IFACE, self.profile_object)
 
     def release(self):
         """
@@ -440,16 +656,32 @@ class GattManager:
 
         :param manager_path: dbus path to the GATT Manager.
         """
-        self.manager_path = dbus_tools.get_dbus_path(adapter_addr)
-        self.bus = dbus.SystemBus()
-        self.manager_obj = self.bus.get_object(
-            constants.BLUEZ_SERVICE_NAME,
-            self.manager_path)
-        self.manager_methods = dbus.Interface(
-            self.manager_obj,
-            constants.GATT_MANAGER_IFACE)
-        self.manager_props = dbus.Interface(self.manager_obj,
-                                            dbus.PROPERTIES_IFACE)
+        self.bus = dbus_tools.get_system_bus()
+        # Applications registered and their options, for rebind
+        self._registered = {}
+        self._bind(dbus_tools.get_dbus_path(adapter_addr))
+
+    def _bind(self, adapter_path):
+        """Create the D-Bus proxies for the manager at an adapter path"""
+        self.manager_path = adapter_path
+        self.manager_obj = dbus_tools.get_dbus_obj(self.manager_path)
+        self.manager_methods = dbus_tools.get_dbus_iface(
+            constants.GATT_MANAGER_IFACE, self.manager_obj)
+        self.manager_props = dbus_tools.get_dbus_iface(
+            dbus.PROPERTIES_IFACE, self.manager_obj)
+
+    def rebind(self, adapter_path):
+        """
+        Use the adapter at a new path and register the applications again.
+
+        Use with :meth:`bluezero.adapter.Adapter.add_rebind_callback` after
+        an adapter has been unplugged and plugged back in.
+
+        :param adapter_path: D-Bus path of the adapter
+        """
+        self._bind(adapter_path)
+        for application, options in tuple(self._registered.items()):
+            self.register_application(application, options)
 
     def register_application(self, application, options):
         """
@@ -459,6 +691,7 @@ class GattManager:
         :param options:
         :return:
         """
+        self._registered[application] = options
         self.manager_methods.RegisterApplication(
             application.get_path(),
             dbus.Dictionary(options, signature='sv'),
@@ -473,4 +706,5 @@ class GattManager:
         :param application: Application object.
         :return:
         """
+        self._registered.pop(application, None)
         self.manager_methods.UnregisterApplication(application)
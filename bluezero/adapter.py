@@ -1,5 +1,7 @@
 """Class and methods that represent a Bluetooth Adapter."""
 
+from typing import NamedTuple
+
 # D-Bus imports
 import dbus
 import dbus.mainloop.glib
@@ -9,11 +11,19 @@ from bluezero import constants
 from bluezero import dbus_tools
 from bluezero import async_tools
 from bluezero import device
+from bluezero import discovery_filter
+from bluezero import property_cache
+from bluezero import rssi_history
+from bluezero import scan_scheduler
+from bluezero import signal_hub
 from bluezero import tools
 
 
 logger = tools.create_module_logger(__name__)
 
+#: Milliseconds between checks for devices that have been lost
+LOST_TICK_MS = 1000
+
 dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
 
 
@@ -22,9 +32,70 @@ class AdapterError(Exception):
     pass
 
 
+class AdapterInfo(NamedTuple):
+    """
+    Read only summary of an adapter from the BlueZ object tree.
+
+    Creating one makes no D-Bus calls. Use :meth:`adapter` to get the full
+    :class:`Adapter` when it is needed.
+    """
+    #: D-Bus object path
+    path: str
+    #: Adapter MAC address
+    address: str
+    #: Adapter name
+    name: str
+    #: Adapter alias
+    alias: str
+    #: True if the adapter is powered
+    powered: bool
+    #: True if the adapter is discovering
+    discovering: bool
+
+    @classmethod
+    def from_props(cls, path, props):
+        """
+        Create from the ``Adapter1`` properties in ``GetManagedObjects``.
+
+        :param path: D-Bus object path of the adapter
+        :param props: Dictionary of the adapter properties
+        """
+        return cls(str(path), str(props['Address']),
+                   str(props.get('Name', '')), str(props.get('Alias', '')),
+                   bool(props.get('Powered', False)),
+                   bool(props.get('Discovering', False)))
+
+    def adapter(self, freshness=property_cache.LIVE):
+        """
+        Return a full :class:`Adapter` for this adapter.
+
+        :param freshness: (optional) How property reads are served.
+        """
+        return Adapter(self.address, freshness, adapter_path=self.path)
+
+
+def available_info(mngd_objs=None):
+    """
+    A generator yielding an :class:`AdapterInfo` for every attached adapter.
+
+    :param mngd_objs: (optional) Result of ``GetManagedObjects`` to use.
+        Fetched with one call if not given.
+    """
+    if mngd_objs is None:
+        mngd_objs = dbus_tools.get_managed_objects()
+    found = False
+    for path, obj in mngd_objs.items():
+        props = obj.get(constants.ADAPTER_INTERFACE, None)
+        if props:
+            found = True
+            yield AdapterInfo.from_props(path, props)
+    if not found:
+        raise AdapterError('No Bluetooth adapter found')
+
+
 def list_adapters():
     """Return list of adapters address available on system."""
-    return [dongle.address for dongle in Adapter.available()]
+    return [info.address for info in available_info()]
 
 
 class Adapter:
@@ -33,6 +104,13 @@ class Adapter:
     This class instantiates an object that interacts with the physical
     Bluetooth device.
 
+    If the adapter is unplugged, :attr:`present` becomes False. When an
+    adapter with the same address is added again, even at a new path such
+    as ``hci1``, the object is rebound to it. The powered state, discovery
+    filter and discovery set through this object are restored and the
+    callbacks added with :meth:`add_rebind_callback` are called. The event
+    loop must be running to receive the signals.
+
     :Example:
 
     >>> from bluezero import adapter
@@ -45,77 +123,108 @@ class Adapter:
     def available():
         """
         A generator yielding an Adapter object for every attached adapter.
+
+        The object tree is fetched once. Use :func:`available_info` if only
+        the address or name is needed.
         """
-        mng_objs = dbus_tools.get_managed_objects()
-        found = False
-        for obj in mng_objs.values():
-            adapter = obj.get(constants.ADAPTER_INTERFACE, None)
-            if adapter:
-                found = True
-                yield Adapter(adapter['Address'])
-        if not found:
-            raise AdapterError('No Bluetooth adapter found')
-
-    def __init__(self, adapter_addr=None):
+        for info in available_info():
+            yield info.adapter()
+
+    def __init__(self, adapter_addr=None, freshness=property_cache.LIVE,
+                 adapter_path=None):
         """Default initialiser.
 
         Creates the interface to the local Bluetooth adapter device.
         If address is not given then first device is list is used.
 
         :param adapter_addr: Address of Bluetooth adapter to use.
+        :param freshness: (optional) How property reads are served. One of
+            the modes in :mod:`bluezero.property_cache`.
+        :param adapter_path: (optional) D-Bus path of the adapter. If known
+            the path lookup is skipped.
         """
-        self.bus = dbus.SystemBus()
-
-        if adapter_addr is None:
-            adapters = list_adapters()
-            if len(adapters) > 0:
-                adapter_addr = adapters[0]
-
-        self.path = dbus_tools.get_dbus_path(adapter=adapter_addr)
-        self.adapter_object = self.bus.get_object(
-            constants.BLUEZ_SERVICE_NAME,
-            self.path)
-        self.adapter_methods = dbus.Interface(self.adapter_object,
-                                              constants.ADAPTER_INTERFACE)
-
-        self.adapter_props = dbus.Interface(self.adapter_object,
-                                            dbus.PROPERTIES_IFACE)
-
-        self._nearby_timeout = 10
-        self._nearby_count = 0
+        self.bus = dbus_tools.get_system_bus()
+
+        if adapter_path is None:
+            if adapter_addr is None:
+                adapters = list(available_info())
+                adapter_addr = adapters[0].address
+                adapter_path = adapters[0].path
+            else:
+                adapter_path = dbus_tools.get_dbus_path(adapter=adapter_addr)
+
+        # Filled on first use if not known so signals are filtered without
+        # D-Bus calls. Also used to find the adapter again if it is replugged
+        self._address = adapter_addr.upper() if adapter_addr else None
+        self._bind(adapter_path)
+        self._prop_cache = property_cache.PropertyCache(
+            self.adapter_props, constants.ADAPTER_INTERFACE, self.path,
+            freshness)
+
+        #: The :class:`device.DeviceRegistry` for devices found by signals
+        self.devices = device.DeviceRegistry(self.path)
+
+        self._discovery_filter = discovery_filter.DiscoveryFilter()
+        self._supported_filters = None
+
+        self._nearby = None
+        self._nearby_timer = None
+        self._duty_cycle = None
         self.mainloop = async_tools.EventLoop()
 
+        #: False while the adapter is unplugged
+        self.present = True
+        # State set by the application that is applied again on rebind
+        self._powered = None
+        self._discovering = False
+        self._rebind_callbacks = []
+
+        #: The :class:`~bluezero.rssi_history.RssiHistory` of the devices
+        #: if :meth:`track_rssi` has been called, otherwise None
+        self.rssi_history = None
+        self._last_seen = device.LastSeen()
+        self._connected_paths = set()
+        self._lost_timer = None
         self.on_disconnect = None
         self.on_connect = None
         self.on_device_found = None
-        self.bus.add_signal_receiver(self._interfaces_added,
-                                     dbus_interface=constants.DBUS_OM_IFACE,
-                                     signal_name='InterfacesAdded')
-
-        self.bus.add_signal_receiver(self._interfaces_removed,
-                                     dbus_interface=constants.DBUS_OM_IFACE,
-                                     signal_name='InterfacesRemoved')
-
-        self.bus.add_signal_receiver(self._properties_changed,
-                                     dbus_interface=dbus.PROPERTIES_IFACE,
-                                     signal_name='PropertiesChanged',
-                                     arg0=constants.DEVICE_INTERFACE,
-                                     path_keyword='path')
+        self.on_device_updated = None
+        self.on_device_lost = None
+        hub = signal_hub.get_hub(self.bus)
+        self._signal_subs = [
+            hub.subscribe(self._interfaces_added, 'InterfacesAdded',
+                          constants.DBUS_OM_IFACE),
+            hub.subscribe(self._interfaces_removed, 'InterfacesRemoved',
+                          constants.DBUS_OM_IFACE),
+            hub.subscribe(self._properties_changed, 'PropertiesChanged',
+                          dbus.PROPERTIES_IFACE,
+                          arg0=constants.DEVICE_INTERFACE,
+                          path_keyword='path'),
+        ]
+
+    def _bind(self, adapter_path):
+        """Create the D-Bus proxies for the adapter object at a path"""
+        self.path = adapter_path
+        self.adapter_object = dbus_tools.get_dbus_obj(self.path)
+        self.adapter_methods = dbus_tools.get_dbus_iface(
+            constants.ADAPTER_INTERFACE, self.adapter_object)
+        self.adapter_props = dbus_tools.get_dbus_iface(
+            dbus.PROPERTIES_IFACE, self.adapter_object)
 
     @property
     def address(self):
         """Return the adapter MAC address."""
-        return self.adapter_props.Get(constants.ADAPTER_INTERFACE, 'Address')
+        return self._prop_cache.get('Address')
 
     @property
     def name(self):
         """Return the adapter name."""
-        return self.adapter_props.Get(constants.ADAPTER_INTERFACE, 'Name')
+        return self._prop_cache.get('Name')
 
     @property
     def bt_class(self):
         """Return the Bluetooth class of device."""
-        return self.adapter_props.Get(constants.ADAPTER_INTERFACE, 'Class')
+        return self._prop_cache.get('Class')
 
     @property
     def alias(self):
@@ -123,31 +232,54 @@ class Adapter:
 
         :param new_alias: the new alias of the adapter.
         """
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'Alias')
+        return self._prop_cache.get('Alias')
 
     @alias.setter
     def alias(self, new_alias):
-        self.adapter_props.Set(
-            constants.ADAPTER_INTERFACE, 'Alias', new_alias)
+        self._prop_cache.set('Alias', new_alias)
 
     def get_all(self):
         """Return dictionary of all the Adapter attributes."""
         return self.adapter_props.GetAll(constants.ADAPTER_INTERFACE)
 
+    @property
+    def freshness(self):
+        """
+        How property reads are served.
+
+        One of the modes in :mod:`bluezero.property_cache`.
+        """
+        return self._prop_cache.mode
+
+    @freshness.setter
+    def freshness(self, new_mode):
+        self._prop_cache.mode = new_mode
+
+    def snapshot(self):
+        """Return a dictionary of all the Adapter properties."""
+        return self._prop_cache.snapshot()
+
+    def refresh(self):
+        """
+        Fetch all the Adapter properties with one ``GetAll`` call.
+
+        In ``SNAPSHOT`` and ``SIGNAL`` mode the properties are then read
+        from the result.
+        """
+        return self._prop_cache.refresh()
+
     @property
     def powered(self):
         """power state of the Adapter.
 
         :param new_state: boolean.
         """
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'Powered')
+        return self._prop_cache.get('Powered')
 
     @powered.setter
     def powered(self, new_state):
-        self.adapter_props.Set(
-            constants.ADAPTER_INTERFACE, 'Powered', new_state)
+        self._prop_cache.set('Powered', new_state)
+        self._powered = new_state
 
     @property
     def pairable(self):
@@ -155,77 +287,170 @@ class Adapter:
 
         :param new_state: boolean.
         """
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'Pairable')
+        return self._prop_cache.get('Pairable')
 
     @pairable.setter
     def pairable(self, new_state):
-        self.adapter_props.Set(
-            constants.ADAPTER_INTERFACE, 'Pairable', new_state)
+        self._prop_cache.set('Pairable', new_state)
 
     @property
     def pairabletimeout(self):
         """The pairable timeout of the Adapter."""
-        return self.adapter_props.Get(constants.ADAPTER_INTERFACE,
-                                      'PairableTimeout')
+        return self._prop_cache.get('PairableTimeout')
 
     @pairabletimeout.setter
     def pairabletimeout(self, new_timeout):
-        self.adapter_props.Set(constants.ADAPTER_INTERFACE,
-                               'PairableTimeout', new_timeout)
+        self._prop_cache.set('PairableTimeout', new_timeout)
 
     @property
     def discoverable(self):
         """Discoverable state of the Adapter."""
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'Discoverable')
+        return self._prop_cache.get('Discoverable')
 
     @discoverable.setter
     def discoverable(self, new_state):
-        self.adapter_props.Set(constants.ADAPTER_INTERFACE,
-                               'Discoverable', new_state)
+        self._prop_cache.set('Discoverable', new_state)
 
     @property
     def discoverabletimeout(self):
         """Discoverable timeout of the Adapter."""
-        return self.adapter_props.Get(constants.ADAPTER_INTERFACE,
-                                      'DiscoverableTimeout')
+        return self._prop_cache.get('DiscoverableTimeout')
 
     @discoverabletimeout.setter
     def discoverabletimeout(self, new_timeout):
-        self.adapter_props.Set(constants.ADAPTER_INTERFACE,
-                               'DiscoverableTimeout', new_timeout)
+        self._prop_cache.set('DiscoverableTimeout', new_timeout)
 
     @property
     def discovering(self):
         """Return whether the adapter is discovering."""
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'Discovering')
-
-    def _discovering_timeout(self):
-        """Test to see if discovering should stop."""
-        self._nearby_count += 1
-        if self._nearby_count > self._nearby_timeout:
-            self.stop_discovery()
-            self.mainloop.quit()
-            return False
-        return True
+        return self._prop_cache.get('Discovering')
+
+    def _nearby_timeout(self):
+        """Stop discovering when the nearby_discovery timeout is reached."""
+        self._nearby_timer = None
+        self._stop_nearby()
+        return False
+
+    def _stop_nearby(self):
+        """Stop the discovery started by nearby_discovery"""
+        if self._nearby_timer is not None:
+            async_tools.remove_timer(self._nearby_timer)
+            self._nearby_timer = None
+        self.stop_discovery()
+        self.mainloop.quit()
+
+    def _nearby_seen(self, path, props):
+        """Update the nearby_discovery search with a device signal"""
+        search = self._nearby
+        if not self.devices.owns(path):
+            return
+        if search.needs_all_props and path not in search.props \
+                and 'Address' not in props:
+            # Known to BlueZ before discovery so the signal only has changes
+            props = dict(self.devices.get(path).snapshot(), **props)
+        if search.update(str(path), props):
+            self._stop_nearby()
 
     @property
     def uuids(self):
         """List of 128-bit UUIDs that represent available remote services."""
-        return self.adapter_props.Get(
-            constants.ADAPTER_INTERFACE, 'UUIDs')
+        return self._prop_cache.get('UUIDs')
 
-    def nearby_discovery(self, timeout=10):
-        """Start discovery of nearby Bluetooth devices."""
-        self._nearby_timeout = timeout
-        self._nearby_count = 0
+    def nearby_discovery(self, timeout=10, address=None, name=None,
+                         uuid=None, rssi=None, count=None, predicate=None):
+        """
+        Discover nearby Bluetooth devices.
+
+        Runs the event loop until the devices being searched for are found
+        or ``timeout`` seconds have passed. With no search terms discovery
+        runs for the full timeout.
+
+        A device matches if it meets all of the given search terms.
+        Discovery stops once ``count`` devices match.
+
+        :param timeout: (optional) Maximum seconds to discover for.
+        :param address: (optional) Address of the device to find.
+        :param name: (optional) Name of the device to find.
+        :param uuid: (optional) Service UUID the device must advertise.
+        :param rssi: (optional) Minimum RSSI in dBm.
+        :param count: (optional) Number of matching devices to find.
+            Defaults to 1 when other search terms are given.
+        :param predicate: (optional) Function that is given a dictionary
+            of the device properties and returns True for a match.
+        :return: List of :class:`device.Device` that matched, in the order
+            they were found
+        """
+        self._nearby = discovery_filter.DeviceSearch(
+            address, name, uuid, rssi, count, predicate)
+        self._nearby_timer = async_tools.add_timer_ms(
+            int(timeout * 1000), self._nearby_timeout)
+        try:
+            self.adapter_methods.StartDiscovery()
+            self.mainloop.run()
+        finally:
+            search, self._nearby = self._nearby, None
+            if self._nearby_timer is not None:
+                async_tools.remove_timer(self._nearby_timer)
+                self._nearby_timer = None
+        return [self.devices.get(path, search.props[path].get('Address'))
+                for path in search.matched]
 
-        # GLib.timeout_add(1000, self._discovering_timeout)
-        async_tools.add_timer_ms(1000, self._discovering_timeout)
-        self.adapter_methods.StartDiscovery()
-        self.mainloop.run()
+    @property
+    def discovery_filter(self):
+        """
+        The :class:`~bluezero.discovery_filter.DiscoveryFilter` set by
+        this object.
+
+        Assign None to clear the filter.
+        """
+        return self._discovery_filter
+
+    @discovery_filter.setter
+    def discovery_filter(self, new_filter):
+        if new_filter is None:
+            new_filter = discovery_filter.DiscoveryFilter()
+        supported = self.supported_discovery_filters()
+        if supported is not None:
+            unsupported = new_filter.keys() - set(supported)
+            if unsupported:
+                raise ValueError(f'Discovery filters not supported by BlueZ: '
+                                 f'{", ".join(sorted(unsupported))}')
+        self.adapter_methods.SetDiscoveryFilter(new_filter.to_dbus())
+        self._discovery_filter = new_filter
+
+    def set_discovery_filter(self, **fields):
+        """
+        Change fields of the discovery filter, keeping the others.
+
+        A field given as None is removed from the filter.
+
+        :param fields: Fields of
+            :class:`~bluezero.discovery_filter.DiscoveryFilter`
+            e.g. ``rssi=-70, transport='le'``
+        """
+        self.discovery_filter = self._discovery_filter.updated(**fields)
+
+    def clear_discovery_filter(self):
+        """Remove all discovery filter fields."""
+        self.discovery_filter = None
+
+    def supported_discovery_filters(self):
+        """
+        Return the filter keys bluetoothd supports, e.g. 'RSSI'.
+
+        Read with ``GetDiscoveryFilters`` the first time it is called.
+
+        :return: List of filter keys or None if BlueZ can't report them
+        """
+        if self._supported_filters is None:
+            try:
+                self._supported_filters = [
+                    str(key)
+                    for key in self.adapter_methods.GetDiscoveryFilters()]
+            except dbus.exceptions.DBusException as dbus_err:
+                logger.debug('Unable to get discovery filters: %s', dbus_err)
+                self._supported_filters = []
+        return self._supported_filters or None
 
     def show_duplicates(self):
         """
@@ -234,14 +459,14 @@ class Adapter:
         ServiceData irrespective of whether they have been
         discovered previously
         """
-        self.adapter_methods.SetDiscoveryFilter({'DuplicateData': True})
+        self.set_discovery_filter(duplicate_data=True)
 
     def hide_duplicates(self):
         """
         Hide advertisements from a device during
         Device Discovery if it contains information already discovered
         """
-        self.adapter_methods.SetDiscoveryFilter({'DuplicateData': False})
+        self.set_discovery_filter(duplicate_data=False)
 
     def start_discovery(self):
         """
@@ -250,11 +475,127 @@ class Adapter:
         :return: True on success otherwise False
         """
         self.adapter_methods.StartDiscovery()
+        self._discovering = True
 
     def stop_discovery(self):
         """Stop scanning of nearby Bluetooth devices."""
+        self._discovering = False
         self.adapter_methods.StopDiscovery()
 
+    def start_duty_cycle(self, window, interval,
+                         priority=scan_scheduler.BALANCED,
+                         holdoff=scan_scheduler.DEFAULT_HOLDOFF):
+        """
+        Discover for ``window`` seconds in every ``interval``.
+
+        Discovery is paused while GATT transfers on this adapter are in
+        flight, depending on ``priority``. See
+        :mod:`bluezero.scan_scheduler`. Any previous duty cycle is stopped.
+        The event loop must be running for the windows to change.
+
+        :param window: Seconds to discover for in each interval
+        :param interval: Seconds from the start of one window to the next
+        :param priority: (optional) One of the priorities in
+            :mod:`bluezero.scan_scheduler`
+        :param holdoff: (optional) Seconds with no transfers in flight
+            before paused discovery resumes
+        :return: The running :class:`~bluezero.scan_scheduler.ScanScheduler`
+        """
+        self.stop_duty_cycle()
+        self._duty_cycle = scan_scheduler.ScanScheduler(
+            self, window, interval, priority, holdoff)
+        self._duty_cycle.start()
+        return self._duty_cycle
+
+    def stop_duty_cycle(self):
+        """Stop the duty cycle and the discovery it started."""
+        if self._duty_cycle is not None:
+            self._duty_cycle.stop()
+            self._duty_cycle = None
+
+    @property
+    def duty_cycle(self):
+        """
+        The running :class:`~bluezero.scan_scheduler.ScanScheduler` or None.
+        """
+        return self._duty_cycle
+
+    def add_rebind_callback(self, callback):
+        """
+        Call a function when the adapter is plugged back in.
+
+        The adapter has already been rebound to its new path and its
+        powered state, discovery filter and discovery restored. Use this to
+        register advertisements and GATT applications again.
+
+        :param callback: Function that is given this :class:`Adapter`
+        """
+        self._rebind_callbacks.append(callback)
+
+    def remove_rebind_callback(self, callback):
+        """
+        Stop calling a function added with :meth:`add_rebind_callback`.
+
+        :param callback: The function that was added
+        """
+        if callback in self._rebind_callbacks:
+            self._rebind_callbacks.remove(callback)
+
+    def _adapter_added(self, path, props):
+        """Rebind when an adapter with this address is plugged in"""
+        address = props.get('Address')
+        if address is None or self._address is None or \
+                str(address).upper() != self._address:
+            return
+        if self.present and path == self.path:
+            return
+        self._rebind(path)
+
+    def _adapter_removed(self):
+        """Release the state that belongs to the removed adapter object"""
+        self.present = False
+        logger.warning('Adapter %s removed from %s', self._address, self.path)
+        if self._duty_cycle is not None:
+            self._duty_cycle.stop()
+        self.devices.clear()
+        self._last_seen.clear()
+        self._connected_paths.clear()
+        if self.rssi_history is not None:
+            self.rssi_history.clear()
+
+    def _rebind(self, path):
+        """Use the adapter object at a new path and restore its state"""
+        logger.info('Adapter %s bound to %s', self._address, path)
+        freshness = self._prop_cache.mode
+        self._prop_cache.close()
+        self.devices.clear()
+        self._bind(path)
+        self._prop_cache = property_cache.PropertyCache(
+            self.adapter_props, constants.ADAPTER_INTERFACE, self.path,
+            freshness)
+        self.devices = device.DeviceRegistry(self.path)
+        self._supported_filters = None
+        self.present = True
+        try:
+            if self._powered is not None:
+                self._prop_cache.set('Powered', self._powered)
+            if self._discovery_filter.fields():
+                self.adapter_methods.SetDiscoveryFilter(
+                    self._discovery_filter.to_dbus())
+            if self._duty_cycle is not None:
+                self._duty_cycle.start()
+            elif self._discovering:
+                self.adapter_methods.StartDiscovery()
+        except dbus.exceptions.DBusException as dbus_err:
+            logger.error('Unable to restore adapter %s: %s',
+                         self._address, dbus_err)
+        for callback in tuple(self._rebind_callbacks):
+            try:
+                callback(self)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Error in rebind callback for %s',
+                                 self._address)
+
     def remove_device(self, device_path):
         """Removes device at the given D-Bus path"""
         self.adapter_methods.RemoveDevice(device_path)
@@ -267,62 +608,279 @@ class Adapter:
         """Stop the EventLoop for async operations"""
         self.mainloop.quit()
 
+    def close(self):
+        """
+        Remove the signal subscriptions and release the cached devices.
+
+        Callbacks are not called after the adapter is closed. Closing more
+        than once has no effect.
+        """
+        for sub in self._signal_subs:
+            sub.remove()
+        self._signal_subs = []
+        self.on_device_lost = None
+        self.rssi_history = None
+        if self._nearby_timer is not None:
+            async_tools.remove_timer(self._nearby_timer)
+            self._nearby_timer = None
+        self._nearby = None
+        self.stop_duty_cycle()
+        self.devices.clear()
+        self._prop_cache.close()
+        self.mainloop.quit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def on_device_updated(self):
+        """
+        Callback for when the properties of a device of this adapter change.
+
+        It is given the :class:`~bluezero.device.Device` and a dictionary of
+        the properties that changed.
+        """
+        return self._on_device_updated
+
+    @on_device_updated.setter
+    def on_device_updated(self, callback):
+        self._on_device_updated = callback
+
+    @property
+    def on_device_lost(self):
+        """
+        Callback for when a device of this adapter is no longer seen.
+
+        It is given the :class:`~bluezero.device.Device`. A device is lost
+        when no signal has been received from it for
+        :attr:`device_lost_timeout` seconds while it is not connected, or
+        when BlueZ removes it. Devices are only tracked while a callback is
+        set and the event loop must be running.
+        """
+        return self._on_device_lost
+
+    @on_device_lost.setter
+    def on_device_lost(self, callback):
+        self._on_device_lost = callback
+        if callback is not None and self._lost_timer is None:
+            self._lost_timer = async_tools.add_timer_ms(LOST_TICK_MS,
+                                                        self._age_devices)
+        elif callback is None:
+            if self._lost_timer is not None:
+                async_tools.remove_timer(self._lost_timer)
+                self._lost_timer = None
+            self._last_seen.clear()
+
+    @property
+    def device_lost_timeout(self):
+        """Seconds without a signal before a device is lost."""
+        return self._last_seen.timeout
+
+    @device_lost_timeout.setter
+    def device_lost_timeout(self, seconds):
+        self._last_seen.timeout = seconds
+
+    def track_rssi(self, samples=rssi_history.DEFAULT_SAMPLES,
+                   **filter_args):
+        """
+        Keep the recent RSSI samples of the devices of this adapter.
+
+        The samples are taken from the device signals, so the event loop
+        must be running.
+
+        :param samples: (optional) Number of samples kept for each device
+        :param filter_args: (optional) Passed to
+            :class:`~bluezero.rssi_history.RssiHistory`
+        :return: The :class:`~bluezero.rssi_history.RssiHistory`
+        """
+        self.rssi_history = rssi_history.RssiHistory(samples, **filter_args)
+        return self.rssi_history
+
+    def _device_seen(self, path, changed):
+        """
+        Update the last seen time, connected state and RSSI of a device
+        """
+        if self.rssi_history is not None:
+            self.rssi_history.update(path, changed)
+        if 'Connected' in changed:
+            if changed['Connected']:
+                self._connected_paths.add(path)
+            else:
+                self._connected_paths.discard(path)
+        if self._on_device_lost is not None:
+            self._last_seen.seen(path)
+
+    def _age_devices(self):
+        """Report the devices that have not been seen within the timeout"""
+        for path in self._last_seen.expired():
+            if path in self._connected_paths:
+                # Connected devices stop advertising
+                self._last_seen.seen(path)
+            else:
+                self._device_lost(path)
+        return True
+
+    def _device_lost(self, path):
+        """Call the on_device_lost callback for a device"""
+        try:
+            self._on_device_lost(self.devices.get(path))
+        except Exception:  # pylint: disable=broad-except
+            logger.exception('Error in on_device_lost callback for %s', path)
+
+    @property
+    def on_connect(self):
+        """
+        Callback for when a device connects.
+
+        The callback can take no arguments, a :class:`device.Device`, or
+        the adapter address and the device address.
+        """
+        return self._on_connect
+
+    @on_connect.setter
+    def on_connect(self, callback):
+        self._on_connect = callback
+        self._connect_cb = self._connection_dispatcher(callback)
+
+    @property
+    def on_disconnect(self):
+        """
+        Callback for when a device disconnects.
+
+        The callback can take a :class:`device.Device`, or the adapter
+        address and the device address. A callback with no arguments is
+        deprecated.
+        """
+        return self._on_disconnect
+
+    @on_disconnect.setter
+    def on_disconnect(self, callback):
+        if callback is not None and tools.get_fn_parameters(callback) == 0:
+            logger.warning("using deprecated version of disconnect "
+                           "callback, move to on_disconnect(dev) "
+                           "with device parameter")
+        self._on_disconnect = callback
+        self._disconnect_cb = self._connection_dispatcher(callback)
+
+    def _connection_dispatcher(self, callback):
+        """
+        Wrap a user callback so it is called with the adapter address, the
+        device address and the D-Bus path of the device in the signal. The
+        callback is inspected once, here, rather than on every signal.
+        """
+        if callback is None:
+            return None
+        param_count = tools.get_fn_parameters(callback)
+        if param_count == 0:
+            def dispatch(adapter_addr, device_addr, path):
+                callback()
+        elif param_count == 1:
+            def dispatch(adapter_addr, device_addr, path):
+                callback(self._device(adapter_addr, device_addr, path))
+        elif param_count == 2:
+            def dispatch(adapter_addr, device_addr, path):
+                callback(adapter_addr, device_addr)
+        else:
+            dispatch = None
+        return dispatch
+
+    def _device(self, adapter_addr, device_addr, path):
+        """
+        Return the Device for a signal, from the registry when the device
+        belongs to this adapter.
+        """
+        path = str(path)
+        if self.devices.owns(path):
+            return self.devices.get(path, device_addr)
+        return device.Device(adapter_addr=adapter_addr,
+                             device_addr=device_addr, device_path=path)
+
+    def _cached_address(self):
+        """Return the adapter address, reading it over D-Bus only once."""
+        if self._address is None:
+            self._address = self.address
+        return self._address
+
     def _properties_changed(self, interface, changed, invalidated, path):
         """
         Handle DBus PropertiesChanged signal and
         call appropriate user callback
         """
+        if self._nearby is not None:
+            self._nearby_seen(path, changed)
+        path = str(path)
+        if self.devices.owns(path):
+            self._device_seen(path, changed)
+            if self._on_device_updated is not None:
+                try:
+                    self._on_device_updated(
+                        self.devices.get(path),
+                        dbus_tools.dbus_to_python(changed, 'a{sv}'))
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('Error in on_device_updated callback '
+                                     'for %s', path)
+        if 'Connected' not in changed:
+            return
         device_address = dbus_tools.get_device_address_from_dbus_path(path)
         adapter_addr = dbus_tools.get_adapter_address_from_dbus_path(path)
-        if 'Connected' in changed:
-            if all((changed['Connected'],
-                    self.address == adapter_addr,
-                    self.on_connect)):
-                if tools.get_fn_parameters(self.on_connect) == 0:
-                    self.on_connect()
-                elif tools.get_fn_parameters(self.on_connect) == 1:
-                    new_dev = device.Device(
-                        adapter_addr=self.address,
-                        device_addr=device_address)
-                    self.on_connect(new_dev)
-                elif tools.get_fn_parameters(self.on_connect) == 2:
-                    self.on_connect(adapter_addr, device_address)
-            elif not changed['Connected'] and self.on_disconnect:
-                if tools.get_fn_parameters(self.on_disconnect) == 0:
-                    logger.warning("using deprecated version of disconnect "
-                                   "callback, move to on_disconnect(dev) "
-                                   "with device parameter")
-                    self.on_disconnect()
-                elif tools.get_fn_parameters(self.on_disconnect) == 1:
-                    new_dev = device.Device(
-                        adapter_addr=self.address,
-                        device_addr=device_address)
-                    self.on_disconnect(new_dev)
-                elif tools.get_fn_parameters(self.on_disconnect) == 2:
-                    self.on_disconnect(self.address, device_address)
+        if adapter_addr is None:
+            logger.debug('No adapter known for %s', path)
+            return
+        if changed['Connected']:
+            if self._connect_cb and self._cached_address() == adapter_addr:
+                self._connect_cb(adapter_addr, device_address, path)
+        elif self._disconnect_cb:
+            self._disconnect_cb(self._cached_address(), device_address, path)
 
     def _interfaces_added(self, path, device_info):
         """
         Handle DBus InterfacesAdded signal and
         call appropriate user callback
         """
+        if constants.ADAPTER_INTERFACE in device_info:
+            adapter_props = device_info[constants.ADAPTER_INTERFACE]
+            dbus_tools.update_adapter_address(path,
+                                              adapter_props.get('Address'))
+            self._adapter_added(str(path), adapter_props)
         dev_iface = constants.DEVICE_INTERFACE
         if constants.DEVICE_INTERFACE in device_info:
+            if self._nearby is not None:
+                self._nearby_seen(path, device_info[dev_iface])
+            if self.devices.owns(path):
+                self._device_seen(str(path), device_info[dev_iface])
             dev_addr = device_info[dev_iface].get('Address')
             dev_connected = device_info[dev_iface].get('Connected')
             if self.on_device_found and dev_addr:
-                new_dev = device.Device(
-                    adapter_addr=self.address,
-                    device_addr=dev_addr)
-                self.on_device_found(new_dev)
+                self.on_device_found(
+                    self._device(self._cached_address(), dev_addr, path))
             if all((self.on_connect, dev_connected, dev_addr)):
-                new_dev = device.Device(
-                    adapter_addr=self.address,
-                    device_addr=dev_addr)
-                self.on_connect(new_dev)
+                self.on_connect(
+                    self._device(self._cached_address(), dev_addr, path))
 
     def _interfaces_removed(self, path, device_info):
         """
         Handle DBus InterfacesRemoved signal and
         call appropriate user callback
         """
+        if constants.ADAPTER_INTERFACE in device_info:
+            if str(path) == self.path and self.present:
+                if self._address is None:
+                    # Read from the cache before the entry is removed
+                    self._address = \
+                        dbus_tools.get_adapter_address_from_dbus_path(path)
+                    if self._address is None:
+                        logger.warning('Address of %s not known so it can '
+                                       'not be rebound', path)
+                self._adapter_removed()
+            dbus_tools.update_adapter_address(path)
+        if constants.DEVICE_INTERFACE in device_info:
+            path = str(path)
+            self._connected_paths.discard(path)
+            if self._last_seen.remove(path):
+                self._device_lost(path)
+            if self.rssi_history is not None:
+                self.rssi_history.remove(path)
+            self.devices.remove(path)
@@ -68,7 +68,7 @@ class Advertisement(dbus.service.Object):
         """
         # Setup D-Bus object paths and register service
         self.path = '/ukBaz/bluezero/advertisement{0:04d}'.format(advert_id)
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
         self.mainloop = async_tools.EventLoop()
         self.interface = constants.LE_ADVERTISEMENT_IFACE
         dbus.service.Object.__init__(self, self.bus, self.path)
@@ -93,6 +93,25 @@ class Advertisement(dbus.service.Object):
         """Stop GLib event loop"""
         self.mainloop.quit()
 
+    def close(self):
+        """
+        Stop the event loop and remove the advertisement from D-Bus.
+
+        Unregister it from the :class:`AdvertisingManager` first. The same
+        ``advert_id`` can be used again once it is closed.
+        """
+        self.mainloop.quit()
+        try:
+            self.remove_from_connection()
+        except LookupError:
+            logger.debug('Advertisement %s is not on D-Bus', self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def get_path(self):
         """Return the DBus object path"""
         return dbus.ObjectPath(self.path)
@@ -128,7 +147,7 @@ class Advertisement(dbus.service.Object):
         """Manufacturer Data to be broadcast"""
         return self.Set(constants.LE_ADVERTISEMENT_IFACE,
                         'ManufacturerData',
-                        {company_id: dbus.Array(data, signature='y')})
+                        {company_id: dbus_tools.to_byte_array(data)})
 
     def solicit_UUIDs(self):  # pylint: disable=invalid-name
         """Manufacturer Data to be broadcast (Currently not supported)"""
@@ -145,7 +164,7 @@ class Advertisement(dbus.service.Object):
         for uuid in data:
             self.Set(constants.LE_ADVERTISEMENT_IFACE,
                      'ServiceData',
-                     {uuid: dbus.Array(data[uuid], signature='y')})
+                     {uuid: dbus_tools.to_byte_array(data[uuid])})
 
     @property
     def include_tx_power(self):
@@ -283,27 +302,46 @@ class AdvertisingManager:
 
     def __init__(self, adapter_addr=None):
 
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
 
         if adapter_addr is None:
             adapters = list(adapter.Adapter.available())
             if len(adapters) > 0:
                 use_adapter = adapters[0]
                 adapter_addr = use_adapter.address
+            for unused in adapters[1:]:
+                unused.close()
         else:
             use_adapter = adapter.Adapter(adapter_addr)
 
-        if not use_adapter.discoverable:
-            use_adapter.discoverable = True
-        self.advert_mngr_path = dbus_tools.get_dbus_path(adapter=adapter_addr)
-        self.advert_mngr_obj = self.bus.get_object(
-            constants.BLUEZ_SERVICE_NAME,
-            self.advert_mngr_path)
-        self.advert_mngr_methods = dbus.Interface(
-            self.advert_mngr_obj,
-            constants.LE_ADVERTISING_MANAGER_IFACE)
-        self.advert_mngr_props = dbus.Interface(self.advert_mngr_obj,
-                                                dbus.PROPERTIES_IFACE)
+        with use_adapter:
+            if not use_adapter.discoverable:
+                use_adapter.discoverable = True
+        # Advertisements registered and their options, for rebind
+        self._registered = {}
+        self._bind(dbus_tools.get_dbus_path(adapter=adapter_addr))
+
+    def _bind(self, adapter_path):
+        """Create the D-Bus proxies for the manager at an adapter path"""
+        self.advert_mngr_path = adapter_path
+        self.advert_mngr_obj = dbus_tools.get_dbus_obj(self.advert_mngr_path)
+        self.advert_mngr_methods = dbus_tools.get_dbus_iface(
+            constants.LE_ADVERTISING_MANAGER_IFACE, self.advert_mngr_obj)
+        self.advert_mngr_props = dbus_tools.get_dbus_iface(
+            dbus.PROPERTIES_IFACE, self.advert_mngr_obj)
+
+    def rebind(self, adapter_path):
+        """
+        Use the adapter at a new path and register the advertisements again.
+
+        Use with :meth:`bluezero.adapter.Adapter.add_rebind_callback` after
+        an adapter has been unplugged and plugged back in.
+
+        :param adapter_path: D-Bus path of the adapter
+        """
+        self._bind(adapter_path)
+        for advertisement, options in tuple(self._registered.items()):
+            self.register_advertisement(advertisement, options)
 
     def register_advertisement(self, advertisement, options=dbus.Array()):
         """
@@ -314,6 +352,7 @@ class AdvertisingManager:
         :param options:
         :return:
         """
+        self._registered[advertisement] = options
         self.advert_mngr_methods.RegisterAdvertisement(
             advertisement.path,
             dbus.Dictionary(options, signature='sv'),
@@ -330,6 +369,7 @@ class AdvertisingManager:
         :param advertisement:
         :return:
         """
+        self._registered.pop(advertisement, None)
         self.advert_mngr_methods.UnregisterAdvertisement(
             advertisement.path
         )
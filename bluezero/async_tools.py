@@ -1,6 +1,8 @@
 """
 Collection of functions to work with the GLib Event Loop
 """
+import asyncio
+
 # Main eventloop import
 import dbus
 import dbus.mainloop.glib
@@ -12,19 +14,220 @@ logger = tools.create_module_logger(__name__)
 
 
 def add_timer_ms(time, callback, data=None):
-    """Call given callback every x milliseconds"""
+    """
+    Call given callback every x milliseconds
+
+    :return: Source ID to use with :func:`remove_timer`
+    """
     if data:
-        GLib.timeout_add(time, callback, data)
-    else:
-        GLib.timeout_add(time, callback)
+        return GLib.timeout_add(time, callback, data)
+    return GLib.timeout_add(time, callback)
 
 
 def add_timer_seconds(time, callback, data=None):
-    """Call given callback every x seconds"""
+    """
+    Call given callback every x seconds
+
+    :return: Source ID to use with :func:`remove_timer`
+    """
     if data:
-        GLib.timeout_add_seconds(time, callback, data)
-    else:
-        GLib.timeout_add_seconds(time, callback)
+        return GLib.timeout_add_seconds(time, callback, data)
+    return GLib.timeout_add_seconds(time, callback)
+
+
+def remove_timer(source_id):
+    """Stop a timer using the source ID returned when it was added"""
+    GLib.source_remove(source_id)
+
+
+def run_pending_events():
+    """
+    Dispatch the events that are waiting on the GLib event loop.
+
+    Use this to receive D-Bus signals from code that polls instead of
+    running the event loop.
+    """
+    main_context = GLib.MainContext.default()
+    while main_context.pending():
+        main_context.iteration(False)
+
+
+class PendingCall:
+    """
+    A D-Bus method call that has been sent and is waiting for its reply.
+
+    Pass :meth:`reply_handler` and :meth:`error_handler` as the handlers of
+    an asynchronous D-Bus call. The result can be received with callbacks,
+    or by awaiting the call in a coroutine. The replies are dispatched by
+    the GLib event loop, which must be running. If it runs in another thread
+    the result is passed to the asyncio event loop safely.
+
+    :Example:
+
+    >>> async def connect(dev):
+    ...     await dev.connect_async(timeout=10)
+    """
+    #: Waiting for the reply
+    PENDING = 'pending'
+    #: The call succeeded
+    DONE = 'done'
+    #: The call returned an error
+    FAILED = 'failed'
+    #: The call was cancelled before the reply
+    CANCELLED = 'cancelled'
+
+    def __init__(self, name, reply_handler=None, error_handler=None,
+                 cancel=None):
+        """
+        Default initialiser.
+
+        :param name: Name of the call, used in log messages
+        :param reply_handler: (optional) Called with the result on success
+        :param error_handler: (optional) Called with the
+            ``DBusException`` on failure
+        :param cancel: (optional) Function called to stop the operation in
+            BlueZ when the call is cancelled, e.g. ``CancelPairing``
+        """
+        self.name = name
+        self.state = self.PENDING
+        self._result = None
+        self._error = None
+        self._cancel = cancel
+        self._done_callbacks = []
+        if reply_handler is not None:
+            def on_reply(call):
+                if call.state == self.DONE:
+                    reply_handler(*([] if call._result is None
+                                    else [call._result]))
+            self._done_callbacks.append(on_reply)
+        if error_handler is not None:
+            def on_error(call):
+                if call.state == self.FAILED:
+                    error_handler(call._error)
+            self._done_callbacks.append(on_error)
+
+    def __repr__(self):
+        return f'<PendingCall {self.name} {self.state}>'
+
+    def __await__(self):
+        return self.future().__await__()
+
+    def done(self):
+        """Return True if the call has finished, failed or been cancelled."""
+        return self.state != self.PENDING
+
+    def cancelled(self):
+        """Return True if the call was cancelled."""
+        return self.state == self.CANCELLED
+
+    def result(self):
+        """
+        Return the result of the call.
+
+        :raises dbus.exceptions.DBusException: if the call failed
+        :raises asyncio.CancelledError: if the call was cancelled
+        :raises asyncio.InvalidStateError: if there is no reply yet
+        """
+        if self.state == self.PENDING:
+            raise asyncio.InvalidStateError(f'{self.name} has no reply yet')
+        if self.state == self.CANCELLED:
+            raise asyncio.CancelledError(self.name)
+        if self.state == self.FAILED:
+            raise self._error
+        return self._result
+
+    def exception(self):
+        """
+        Return the ``DBusException`` if the call failed, otherwise None.
+        """
+        return self._error
+
+    def add_done_callback(self, callback):
+        """
+        Call a function with this call when it is done.
+
+        It is called straight away if the call is already done.
+
+        :param callback: Function that is given this :class:`PendingCall`
+        """
+        if self.done():
+            callback(self)
+        else:
+            self._done_callbacks.append(callback)
+
+    def reply_handler(self, *args):
+        """Handle the reply of the D-Bus call."""
+        if not self.done():
+            self._result = args[0] if len(args) == 1 else (args or None)
+            self._finish(self.DONE)
+
+    def error_handler(self, error):
+        """Handle an error returned by the D-Bus call."""
+        if not self.done():
+            logger.debug('%s failed: %s', self.name, error)
+            self._error = error
+            self._finish(self.FAILED)
+
+    def cancel(self):
+        """
+        Stop waiting for the reply and cancel the operation in BlueZ.
+
+        :return: True if the call was cancelled, False if it was done
+        """
+        if self.done():
+            return False
+        self._finish(self.CANCELLED)
+        if self._cancel is not None:
+            try:
+                self._cancel()
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Unable to cancel %s', self.name)
+        return True
+
+    def _finish(self, state):
+        """Set the final state and call the done callbacks"""
+        self.state = state
+        callbacks, self._done_callbacks = self._done_callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Error in %s callback', self.name)
+
+    def future(self, loop=None):
+        """
+        Return an asyncio future for the result of the call.
+
+        Cancelling the future cancels the call.
+
+        :param loop: (optional) asyncio event loop. The running loop is used
+            if not given.
+        :return: ``asyncio.Future``
+        """
+        if loop is None:
+            loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(call):
+            if future.done():
+                return
+            if call.state == self.DONE:
+                future.set_result(call._result)
+            elif call.state == self.FAILED:
+                future.set_exception(call._error)
+            else:
+                future.cancel()
+
+        def on_done(call):
+            loop.call_soon_threadsafe(set_result, call)
+
+        def on_future_done(done_future):
+            if done_future.cancelled():
+                self.cancel()
+
+        future.add_done_callback(on_future_done)
+        self.add_done_callback(on_done)
+        return future
 
 
 class EventLoop:
@@ -73,10 +73,14 @@ class Beacon:
         ad_manager = advertisement.AdvertisingManager(self.dongle.address)
         ad_manager.register_advertisement(self.broadcaster, {})
 
+        def rebind(dongle):
+            ad_manager.rebind(dongle.path)
+
+        self.dongle.add_rebind_callback(rebind)
         try:
             self.broadcaster.start()
         except KeyboardInterrupt:
             self.broadcaster.stop()
             ad_manager.unregister_advertisement(self.broadcaster)
         finally:
-            pass
+            self.dongle.remove_rebind_callback(rebind)
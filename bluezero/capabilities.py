@@ -0,0 +1,221 @@
+"""
+Features of the running BlueZ daemon, found once per process.
+
+:func:`bluezero.dbus_tools.bluez_version` and
+:func:`bluezero.dbus_tools.bluez_experimental_mode` start a process on every
+call. This module instead works out what the daemon supports from D-Bus and
+keeps the result:
+
+- The interfaces on the adapter object (e.g. ``AdvertisementMonitorManager1``)
+  and the ``SupportedFeatures``, ``SupportedIncludes`` and
+  ``SupportedSecondaryChannels`` of ``LEAdvertisingManager1`` all come from
+  one ``GetManagedObjects`` call (none if the object mirror is enabled).
+- Experimental mode is read from the command line of the ``bluetoothd``
+  process, found with ``GetConnectionUnixProcessID``. If ``/proc`` is not
+  shared with the daemon (e.g. in a container) the adapter's
+  ``ExperimentalFeatures`` property is used instead.
+
+BlueZ does not publish its version on D-Bus. Prefer testing for a feature.
+:attr:`Capabilities.version` is available for logging. It runs
+``bluetoothctl -v`` at most once per process, and only when it is read.
+
+:Example:
+
+>>> from bluezero import capabilities
+>>> caps = capabilities.probe()
+>>> caps.advertisement_monitor
+True
+>>> caps.supports_adv_feature('HardwareOffload')
+False
+"""
+import subprocess
+
+from bluezero import constants
+from bluezero import dbus_tools
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+_probed = {}
+_version = []
+# Short options of bluetoothd that take a value, e.g. -p or -f
+_VALUE_OPTIONS = b'pPf'
+# Short option whose value is optional and must be in the same argument
+_OPTIONAL_VALUE_OPTIONS = b'd'
+
+
+class Capabilities:
+    """
+    What the BlueZ daemon supports for one adapter.
+    """
+
+    def __init__(self, adapter_path, interfaces, experimental=None):
+        """
+        Default initialiser.
+
+        :param adapter_path: D-Bus path of the adapter
+        :param interfaces: Dictionary of interface name to properties for
+            the adapter object, as returned by ``GetManagedObjects``
+        :param experimental: True or False if known, otherwise None
+        """
+        self.adapter_path = adapter_path
+        self.interfaces = frozenset(str(iface) for iface in interfaces)
+        adv_props = interfaces.get(constants.LE_ADVERTISING_MANAGER_IFACE, {})
+        self.adv_features = frozenset(
+            str(feature) for feature in adv_props.get('SupportedFeatures', []))
+        self.adv_includes = frozenset(
+            str(include) for include in adv_props.get('SupportedIncludes', []))
+        self.adv_secondary_channels = frozenset(
+            str(channel)
+            for channel in adv_props.get('SupportedSecondaryChannels', []))
+        self.adv_instances = adv_props.get('SupportedInstances')
+        if experimental is None:
+            adapter_props = interfaces.get(constants.ADAPTER_INTERFACE, {})
+            if adapter_props.get('ExperimentalFeatures'):
+                experimental = True
+        self.experimental = experimental
+
+    def __repr__(self):
+        return (f'<Capabilities {self.adapter_path} '
+                f'interfaces={sorted(self.interfaces)} '
+                f'experimental={self.experimental}>')
+
+    def has_interface(self, interface):
+        """
+        Return True if the adapter object has the given interface.
+
+        :param interface: D-Bus interface name e.g. 'org.bluez.GattManager1'
+        """
+        return interface in self.interfaces
+
+    def supports_adv_feature(self, feature):
+        """
+        Return True if ``LEAdvertisingManager1`` lists the feature.
+
+        :param feature: Name from ``SupportedFeatures``
+            e.g. 'CanSetTxPower'
+        """
+        return feature in self.adv_features
+
+    @property
+    def le_advertising(self):
+        """True if the adapter supports LE advertising."""
+        return self.has_interface(constants.LE_ADVERTISING_MANAGER_IFACE)
+
+    @property
+    def gatt_server(self):
+        """True if local GATT applications can be registered."""
+        return self.has_interface(constants.GATT_MANAGER_IFACE)
+
+    @property
+    def advertisement_monitor(self):
+        """True if ``AdvertisementMonitorManager1`` is available."""
+        return self.has_interface(constants.ADV_MONITOR_MANAGER_IFACE)
+
+    @property
+    def version(self):
+        """
+        Version string of the BlueZ daemon, or None if it can't be found.
+
+        Found with ``bluetoothctl -v`` the first time it is read in a
+        process.
+        """
+        if not _version:
+            try:
+                _version.append(dbus_tools.bluez_version())
+            except (OSError, IndexError, subprocess.SubprocessError) as err:
+                logger.debug('Unable to get BlueZ version: %s', err)
+                _version.append(None)
+        return _version[0]
+
+
+def _daemon_experimental():
+    """
+    Look for the experimental option on the bluetoothd command line.
+
+    :return: True or False, or None if the command line can't be read
+    """
+    bus = dbus_tools.get_system_bus()
+    try:
+        pid = bus.call_blocking(constants.DBUS_SERVICE_NAME,
+                                constants.DBUS_OBJECT_PATH,
+                                constants.DBUS_SERVICE_NAME,
+                                'GetConnectionUnixProcessID', 's',
+                                [constants.BLUEZ_SERVICE_NAME])
+        with open(f'/proc/{int(pid)}/cmdline', 'rb') as cmdline:
+            args = cmdline.read().split(b'\0')
+    except Exception as err:  # pylint: disable=broad-except
+        logger.debug('Unable to read bluetoothd command line: %s', err)
+        return None
+    return _has_experimental_flag(args[1:])
+
+
+def _has_experimental_flag(args):
+    """
+    Look for ``-E`` or ``--experimental`` in bluetoothd arguments.
+
+    Short options can be combined (e.g. ``-nE``) and the values of options
+    such as ``-p`` are skipped.
+
+    :param args: List of arguments as bytes, without the program name
+    :return: True or False
+    """
+    skip_next = False
+    for arg in args:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == b'--':
+            break
+        if arg.startswith(b'--'):
+            if arg.split(b'=', 1)[0] == b'--experimental':
+                return True
+            continue
+        if not arg.startswith(b'-'):
+            continue
+        for index, flag in enumerate(arg[1:], start=1):
+            flag = bytes([flag])
+            if flag == b'E':
+                return True
+            if flag in _OPTIONAL_VALUE_OPTIONS:
+                break
+            if flag in _VALUE_OPTIONS:
+                # The value is the rest of the argument or the next one
+                skip_next = index == len(arg) - 1
+                break
+    return False
+
+
+def probe(adapter_path=None):
+    """
+    Return the capabilities for an adapter, probing on the first call.
+
+    :param adapter_path: (optional) D-Bus path of the adapter. The first
+        adapter found is used if not given.
+    :return: :class:`Capabilities`
+    """
+    caps = _probed.get(adapter_path)
+    if caps is not None:
+        return caps
+    mngd_objs = dbus_tools.get_managed_objects()
+    path = adapter_path
+    if path is None:
+        path = next((str(obj_path) for obj_path, ifaces in mngd_objs.items()
+                     if constants.ADAPTER_INTERFACE in ifaces), None)
+    caps = Capabilities(path, mngd_objs.get(path, {}),
+                        _daemon_experimental())
+    logger.debug('BlueZ capabilities: %s', caps)
+    _probed[adapter_path] = caps
+    _probed[path] = caps
+    return caps
+
+
+def reset():
+    """
+    Forget the probed capabilities.
+
+    Call this when ``bluetoothd`` has been restarted or an adapter has been
+    added.
+    """
+    _probed.clear()
+    _version.clear()
@@ -1,15 +1,59 @@
 """Classes that represent the GATT features of a remote device."""
 
+import collections
+import random
+import time
 from time import sleep
 
+import dbus
+
 from bluezero import adapter
+from bluezero import async_tools
+from bluezero import constants
+from bluezero import dbus_tools
 from bluezero import device
 from bluezero import GATT
+from bluezero import property_cache
+from bluezero import signal_hub
 from bluezero import tools
 
 logger = tools.create_module_logger(__name__)
 
 
+class ReconnectStats:
+    """
+    Reconnections made by a :class:`Central` in persistent mode.
+    """
+
+    def __init__(self):
+        #: Number of connection attempts made after a disconnection
+        self.attempts = 0
+        #: Number of times the connection was restored
+        self.reconnects = 0
+        #: Seconds from each disconnection until notifications were
+        #: restored, most recent last
+        self.latencies = collections.deque(maxlen=100)
+
+    def __repr__(self):
+        return (f'<ReconnectStats attempts={self.attempts} '
+                f'reconnects={self.reconnects} mean={self.mean} '
+                f'max={self.max}>')
+
+    @property
+    def mean(self):
+        """Mean reconnect latency in seconds, or None."""
+        if not self.latencies:
+            return None
+        return sum(self.latencies) / len(self.latencies)
+
+    @property
+    def max(self):
+        """Longest reconnect latency in seconds, or None."""
+        if not self.latencies:
+            return None
+        return max(self.latencies)
+
+
 class Central:
     """Create a BLE instance taking the Central role."""
 
@@ -25,6 +69,18 @@ class Central:
         self.rmt_device = device.Device(self.dongle.address, device_addr)
 
         self._characteristics = []
+        #: Called with this :class:`Central` each time the connection is
+        #: restored in persistent mode
+        self.on_reconnect = None
+        #: The :class:`ReconnectStats` of persistent mode
+        self.reconnect_stats = ReconnectStats()
+        self._reconnect = None
+        self._reconnect_sub = None
+        self._reconnect_timer = None
+        self._reconnect_call = None
+        self._reconnect_attempt = 0
+        self._disconnected_at = None
+        self._user_disconnect = False
 
     @staticmethod
     def available(adapter_address=None):
@@ -87,18 +143,140 @@ class Central:
         :param profile: (optional) profile to use for the connection.
         :param timeout: (optional) seconds to wait for connection.
         """
+        self._user_disconnect = False
         if profile is None:
             self.rmt_device.connect(timeout=timeout)
         else:
             self.rmt_device.connect(profile, timeout=timeout)
         while not self.rmt_device.services_resolved:
             sleep(0.5)
+            if self.rmt_device.freshness == property_cache.SIGNAL:
+                # Let the PropertiesChanged signal update the device
+                async_tools.run_pending_events()
         self.load_gatt()
 
     def disconnect(self):
         """Disconnect from the remote device."""
+        self._user_disconnect = True
         self.rmt_device.disconnect()
 
+    def enable_reconnect(self, backoff=1.0, max_backoff=60.0, jitter=0.5,
+                         timeout=35):
+        """
+        Keep the connection to the remote device.
+
+        When the device disconnects, other than by :meth:`disconnect`, it is
+        connected again after a backoff that doubles with each failed
+        attempt. Once its services are resolved, characteristics whose
+        object paths have changed are resolved again and notifications that
+        were started are started again. The event loop must be running.
+
+        :param backoff: (optional) Seconds before the first attempt
+        :param max_backoff: (optional) Most seconds between attempts
+        :param jitter: (optional) Fraction of each delay that is random, so
+            devices that dropped together do not all reconnect at once
+        :param timeout: (optional) Seconds to wait for each connection
+        """
+        self._reconnect = (backoff, max_backoff, jitter, timeout)
+        if self._reconnect_sub is None:
+            hub = signal_hub.get_hub(self.dongle.bus)
+            self._reconnect_sub = hub.subscribe(
+                self._device_changed, 'PropertiesChanged',
+                dbus.PROPERTIES_IFACE,
+                path=self.rmt_device.remote_device_path,
+                arg0=constants.DEVICE_INTERFACE)
+
+    def disable_reconnect(self):
+        """Stop keeping the connection to the remote device."""
+        self._reconnect = None
+        if self._reconnect_sub is not None:
+            self._reconnect_sub.remove()
+            self._reconnect_sub = None
+        if self._reconnect_timer is not None:
+            async_tools.remove_timer(self._reconnect_timer)
+            self._reconnect_timer = None
+        if self._reconnect_call is not None:
+            self._reconnect_call.cancel()
+            self._reconnect_call = None
+        self._disconnected_at = None
+
+    def _device_changed(self, interface, changed, invalidated):
+        """Handle the PropertiesChanged signal of the remote device"""
+        if self._reconnect is None:
+            return
+        if 'Connected' in changed and not changed['Connected']:
+            if self._user_disconnect or self._reconnect_timer is not None \
+                    or self._reconnect_call is not None:
+                return
+            logger.info('%s disconnected, reconnecting',
+                        self.rmt_device.remote_device_path)
+            if self._disconnected_at is None:
+                self._disconnected_at = time.monotonic()
+                self._reconnect_attempt = 0
+            # Otherwise the link dropped again before the services were
+            # resolved, so the backoff carries on from the last attempt
+            self._schedule_reconnect()
+        elif changed.get('ServicesResolved') and \
+                self._disconnected_at is not None and \
+                self._reconnect_timer is None:
+            self._restore()
+
+    def _schedule_reconnect(self):
+        """Wait for the jittered backoff before the next attempt"""
+        backoff, max_backoff, jitter, _ = self._reconnect
+        delay = min(backoff * 2 ** self._reconnect_attempt, max_backoff)
+        delay *= 1 - jitter * random.random()
+        self._reconnect_timer = async_tools.add_timer_ms(
+            int(delay * 1000), self._reconnect_now)
+
+    def _reconnect_now(self):
+        """Make a connection attempt"""
+        self._reconnect_timer = None
+        self._reconnect_attempt += 1
+        self.reconnect_stats.attempts += 1
+
+        def connected(call):
+            if call is self._reconnect_call:
+                self._reconnect_call = None
+            if self._reconnect is None or call.cancelled():
+                return
+            if call.exception() is not None:
+                logger.info('Reconnect to %s failed: %s',
+                            self.rmt_device.remote_device_path,
+                            call.exception())
+                self._schedule_reconnect()
+            elif self.rmt_device.services_resolved:
+                self._restore()
+
+        self._reconnect_call = self.rmt_device.connect_async(
+            timeout=self._reconnect[3])
+        self._reconnect_call.add_done_callback(connected)
+        return False
+
+    def _restore(self):
+        """Resolve the changed characteristics and restart notifications"""
+        if self._disconnected_at is None:
+            return
+        # One fetch of the object tree for all the characteristics
+        index = dbus_tools.get_path_index()
+        for chrc in self._characteristics:
+            path = dbus_tools.get_dbus_path(chrc.adapter_addr,
+                                            chrc.device_addr,
+                                            chrc.srv_uuid, chrc.chrc_uuid,
+                                            index=index)
+            if path != chrc.object_path:
+                chrc.resolve_gatt()
+            if chrc.notify_wanted:
+                chrc.start_notify()
+        latency = time.monotonic() - self._disconnected_at
+        self._disconnected_at = None
+        self.reconnect_stats.reconnects += 1
+        self.reconnect_stats.latencies.append(latency)
+        logger.info('Reconnected to %s in %.3f s',
+                    self.rmt_device.remote_device_path, latency)
+        if self.on_reconnect is not None:
+            self.on_reconnect(self)
+
     def run(self):
         """Start event loop"""
         self.dongle.run()
@@ -106,3 +284,22 @@ class Central:
     def quit(self):
         """Stop event loop"""
         self.dongle.quit()
+
+    def close(self):
+        """
+        Release the adapter, remote device and characteristics.
+
+        Signal subscriptions are removed so a new Central can be created for
+        each connection without leaking match rules.
+        """
+        self.disable_reconnect()
+        for chrc in self._characteristics:
+            chrc.close()
+        self.rmt_device.close()
+        self.dongle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
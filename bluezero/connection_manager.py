@@ -0,0 +1,376 @@
+"""
+Connect to many devices, a few at a time.
+
+:meth:`bluezero.central.Central.connect` blocks until a device is
+connected and its services resolved, so a gateway polling hundreds of
+sensors visits them one after another. A :class:`ConnectionManager` holds a
+queue of devices and runs the same steps for up to ``max_connections`` of
+them at once on the GLib event loop:
+
+#. ``connect`` - :meth:`~bluezero.device.Device.connect_async`
+#. ``resolve`` - wait for the ``ServicesResolved`` signal
+#. ``work`` - call the ``work`` function given, e.g. to read
+   characteristics or to subscribe to notifications
+#. ``disconnect`` - :meth:`~bluezero.device.Device.disconnect_async`
+
+Devices are started in the order they were added. A device that fails is
+retried after a backoff that doubles with each attempt, going to the back
+of the queue so it does not hold up the others. The time each step takes is
+recorded for every device and in :attr:`ConnectionManager.latencies`.
+
+The ``work`` function is given the :class:`Job`. It can return a
+:class:`~bluezero.async_tools.PendingCall` that it completes later, for
+example when enough notifications have arrived, and the device is kept
+connected until then. Cancelling that call fails the job without a retry.
+
+:Example:
+
+>>> from bluezero import adapter
+>>> from bluezero import connection_manager
+>>> from bluezero import GATT
+>>> dongle = adapter.Adapter()
+>>> def read_battery(job):
+...     with GATT.Characteristic(dongle.address, job.address,
+...                              '180f', '2a19') as chrc:
+...         chrc.resolve_gatt()
+...         job.result = chrc.value
+>>> with dongle:
+...     manager = connection_manager.ConnectionManager(
+...         dongle, read_battery, max_connections=4)
+...     manager.add(['11:22:33:44:55:66', '11:22:33:44:55:67'])
+...     for job in manager.run():
+...         print(job.address, job.state, job.result, job.latencies)
+"""
+import asyncio
+import collections
+import time
+
+import dbus
+
+from bluezero import async_tools
+from bluezero import constants
+from bluezero import signal_hub
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+#: The steps of a job in the order they are run
+STAGES = ('connect', 'resolve', 'work', 'disconnect')
+
+
+class Job:
+    """
+    The connection workflow for one device.
+    """
+    #: Waiting in the queue or for a retry
+    QUEUED = 'queued'
+    #: Connected or connecting
+    ACTIVE = 'active'
+    #: The work function completed
+    DONE = 'done'
+    #: All the attempts failed
+    FAILED = 'failed'
+
+    def __init__(self, address):
+        """
+        Default initialiser.
+
+        :param address: Address of the remote device
+        """
+        self.address = address
+        self.state = self.QUEUED
+        #: Number of attempts started
+        self.attempts = 0
+        #: The :class:`~bluezero.device.Device` while the job is active
+        self.device = None
+        #: Stage the job is in or failed in
+        self.stage = None
+        #: The error of the last failed attempt
+        self.error = None
+        #: Set by the work function for the caller to use
+        self.result = None
+        #: Dictionary of stage name to seconds, for the last attempt
+        self.latencies = {}
+        self._stage_started = None
+
+    def __repr__(self):
+        return (f'<Job {self.address} {self.state} stage={self.stage} '
+                f'attempts={self.attempts}>')
+
+    def begin_stage(self, stage):
+        """
+        Move to the next stage.
+
+        :param stage: Name of the stage, or None when the job has stopped
+        :return: Seconds the previous stage took, or None if there was none
+        """
+        now = time.monotonic()
+        latency = None
+        if self._stage_started is not None:
+            latency = now - self._stage_started
+            self.latencies[self.stage] = latency
+        if stage is not None:
+            self.stage = stage
+        self._stage_started = None if stage is None else now
+        return latency
+
+    def abandon_stage(self):
+        """Stop timing the current stage without recording it."""
+        self._stage_started = None
+
+
+class ConnectionManager:
+    """
+    Run a connection workflow for a queue of devices concurrently.
+    """
+
+    def __init__(self, dongle, work, max_connections=4, retries=2,
+                 backoff=1.0, max_backoff=30.0, connect_timeout=35,
+                 resolve_timeout=30):
+        """
+        Default initialiser.
+
+        :param dongle: :class:`~bluezero.adapter.Adapter` to connect with
+        :param work: Function given each connected :class:`Job`. It can
+            return a :class:`~bluezero.async_tools.PendingCall` to keep the
+            device connected until the call is done.
+        :param max_connections: (optional) Most devices connected at once.
+            Check the limit of the controller.
+        :param retries: (optional) Attempts after the first for a device
+        :param backoff: (optional) Seconds to wait before the first retry.
+            Doubled for each further retry.
+        :param max_backoff: (optional) Most seconds to wait before a retry
+        :param connect_timeout: (optional) Seconds to wait for a connection
+        :param resolve_timeout: (optional) Seconds to wait for the services
+            to be resolved
+        """
+        if max_connections < 1:
+            raise ValueError(f'max_connections must be at least 1: '
+                             f'{max_connections}')
+        self.dongle = dongle
+        self.work = work
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.connect_timeout = connect_timeout
+        self.resolve_timeout = resolve_timeout
+        #: Called with each :class:`Job` when it is done or has failed
+        self.on_job_done = None
+        #: Dictionary of stage name to the most recent latencies in seconds
+        self.latencies = {stage: collections.deque(maxlen=1000)
+                          for stage in STAGES}
+        self.jobs = []
+        self._queue = collections.deque()
+        self._active = set()
+        self._retry_timers = {}
+        # Signal subscription and timeout timer of jobs waiting to resolve
+        self._waits = {}
+        self._running = False
+
+    def add(self, addresses):
+        """
+        Add devices to the back of the queue.
+
+        :param addresses: Address or list of addresses of remote devices
+        :return: List of the :class:`Job` objects added
+        """
+        if isinstance(addresses, str):
+            addresses = [addresses]
+        jobs = [Job(address) for address in addresses]
+        self.jobs.extend(jobs)
+        self._queue.extend(jobs)
+        if self._running:
+            self._pump()
+        return jobs
+
+    def pending(self):
+        """Return the number of jobs that are not done or failed."""
+        return sum(1 for job in self.jobs
+                   if job.state in (Job.QUEUED, Job.ACTIVE))
+
+    def run(self):
+        """
+        Run the event loop until every job is done or has failed.
+
+        :return: List of all the :class:`Job` objects
+        """
+        self._running = True
+        try:
+            self._pump()
+            if self.pending():
+                self.dongle.run()
+        finally:
+            self._running = False
+        return self.jobs
+
+    def stop(self):
+        """Stop starting jobs and quit the event loop."""
+        for timer in self._retry_timers.values():
+            async_tools.remove_timer(timer)
+        self._retry_timers = {}
+        self._queue.clear()
+        self._running = False
+        self.dongle.quit()
+
+    def stage_stats(self):
+        """
+        Return a summary of the recent latencies of each stage.
+
+        :return: Dictionary of stage name to (count, mean, max) in seconds,
+            or None for a stage with no latencies
+        """
+        return {stage: (len(values), sum(values) / len(values), max(values))
+                if values else None
+                for stage, values in self.latencies.items()}
+
+    def _pump(self):
+        """Start queued jobs while there are free connections"""
+        while self._running and self._queue and \
+                len(self._active) < self.max_connections:
+            self._start(self._queue.popleft())
+        if self._running and not self.pending():
+            self.dongle.quit()
+
+    def _start(self, job):
+        """Start an attempt at the workflow for a job"""
+        job.state = Job.ACTIVE
+        job.attempts += 1
+        job.error = None
+        job.latencies = {}
+        self._active.add(job)
+        job.device = self.dongle.devices.get(
+            self.dongle.devices.path_for(job.address), job.address)
+        self._begin_stage(job, 'connect')
+        call = job.device.connect_async(timeout=self.connect_timeout)
+
+        def connected(done_call):
+            if done_call.cancelled():
+                return
+            if done_call.exception() is not None:
+                self._failed(job, done_call.exception())
+            else:
+                self._wait_resolved(job)
+        call.add_done_callback(connected)
+
+    def _begin_stage(self, job, stage):
+        """Record the latency of the current stage and start the next"""
+        previous = job.stage
+        latency = job.begin_stage(stage)
+        if latency is not None:
+            self.latencies[previous].append(latency)
+
+    def _wait_resolved(self, job):
+        """Wait for the ServicesResolved signal of the device"""
+        self._begin_stage(job, 'resolve')
+
+        def properties_changed(interface, changed, invalidated):
+            if changed.get('ServicesResolved'):
+                self._resolved(job)
+
+        def timeout():
+            self._waits[job] = (self._waits[job][0], None)
+            self._failed(job, TimeoutError(
+                f'Services of {job.address} not resolved'))
+            return False
+
+        hub = signal_hub.get_hub(self.dongle.bus)
+        self._waits[job] = (
+            hub.subscribe(properties_changed, 'PropertiesChanged',
+                          dbus.PROPERTIES_IFACE,
+                          path=job.device.remote_device_path,
+                          arg0=constants.DEVICE_INTERFACE),
+            async_tools.add_timer_ms(int(self.resolve_timeout * 1000),
+                                     timeout))
+        # Resolved before the subscription, e.g. from an earlier connection
+        if job.device.services_resolved:
+            self._resolved(job)
+
+    def _stop_waiting(self, job):
+        """Remove the signal subscription and timer of a job"""
+        subscription, timer = self._waits.pop(job, (None, None))
+        if subscription is not None:
+            subscription.remove()
+        if timer is not None:
+            async_tools.remove_timer(timer)
+
+    def _resolved(self, job):
+        """Run the work function once the services are resolved"""
+        if job.stage != 'resolve':
+            return
+        self._stop_waiting(job)
+        self._begin_stage(job, 'work')
+        try:
+            result = self.work(job)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.exception('Work for %s failed', job.address)
+            self._failed(job, err)
+            return
+        if isinstance(result, async_tools.PendingCall):
+            def worked(done_call):
+                if done_call.cancelled():
+                    self._failed(job, asyncio.CancelledError(
+                        f'Work for {job.address} cancelled'), retry=False)
+                elif done_call.exception() is not None:
+                    self._failed(job, done_call.exception())
+                else:
+                    self._disconnect(job)
+            result.add_done_callback(worked)
+        else:
+            self._disconnect(job)
+
+    def _disconnect(self, job):
+        """Disconnect after the work is done"""
+        self._begin_stage(job, 'disconnect')
+
+        def disconnected(done_call):
+            if done_call.exception() is not None:
+                logger.warning('Disconnect from %s failed: %s',
+                               job.address, done_call.exception())
+            self._begin_stage(job, None)
+            job.state = Job.DONE
+            self._finish(job)
+        job.device.disconnect_async().add_done_callback(disconnected)
+
+    def _failed(self, job, error, retry=True):
+        """Disconnect and retry a job or mark it as failed"""
+        if job.state != Job.ACTIVE:
+            return
+        self._stop_waiting(job)
+        logger.info('%s failed at %s: %s', job.address, job.stage, error)
+        job.error = error
+        job.abandon_stage()
+        if job.stage != 'connect':
+            job.device.disconnect_async()
+        if retry and job.attempts <= self.retries and self._running:
+            job.state = Job.QUEUED
+            delay = min(self.backoff * 2 ** (job.attempts - 1),
+                        self.max_backoff)
+
+            def retry():
+                self._retry_timers.pop(job, None)
+                self._queue.append(job)
+                self._pump()
+                return False
+            self._retry_timers[job] = async_tools.add_timer_ms(
+                int(delay * 1000), retry)
+            self._release(job)
+            self._pump()
+        else:
+            job.state = Job.FAILED
+            self._finish(job)
+
+    def _finish(self, job):
+        """Release the connection of a finished job"""
+        self._release(job)
+        if self.on_job_done is not None:
+            try:
+                self.on_job_done(job)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception('Error in on_job_done for %s', job.address)
+        self._pump()
+
+    def _release(self, job):
+        """Free the connection slot used by a job"""
+        self._active.discard(job)
+        job.device = None
@@ -43,11 +43,82 @@ GATT_DESC_IFACE = 'org.bluez.GattDescriptor1'
 LE_ADVERTISING_MANAGER_IFACE = 'org.bluez.LEAdvertisingManager1'
 #: BlueZ DBus Advertisement Interface
 LE_ADVERTISEMENT_IFACE = 'org.bluez.LEAdvertisement1'
+#: BlueZ DBus Advertisement Monitor Manager Interface
+ADV_MONITOR_MANAGER_IFACE = 'org.bluez.AdvertisementMonitorManager1'
 
 # Bluez Media D-Bus object paths
 #: BlueZ DBus Media player Interface
 MEDIA_PLAYER_IFACE = 'org.bluez.MediaPlayer1'
 
+# D-Bus daemon
+#: Bus name and interface of the D-Bus daemon itself
+DBUS_SERVICE_NAME = 'org.freedesktop.DBus'
+#: Object path of the D-Bus daemon
+DBUS_OBJECT_PATH = '/org/freedesktop/DBus'
+
+# D-Bus method signatures
+#: Input and output signatures of the methods Bluezero calls on BlueZ.
+#: Proxy objects are created without introspection and use this table to
+#: marshal method arguments.
+BLUEZ_METHOD_SIGNATURES = {
+    DBUS_OM_IFACE: {
+        'GetManagedObjects': ('', 'a{oa{sa{sv}}}'),
+    },
+    DBUS_PROP_IFACE: {
+        'Get': ('ss', 'v'),
+        'Set': ('ssv', ''),
+        'GetAll': ('s', 'a{sv}'),
+    },
+    ADAPTER_INTERFACE: {
+        'StartDiscovery': ('', ''),
+        'StopDiscovery': ('', ''),
+        'RemoveDevice': ('o', ''),
+        'SetDiscoveryFilter': ('a{sv}', ''),
+        'GetDiscoveryFilters': ('', 'as'),
+    },
+    DEVICE_INTERFACE: {
+        'Connect': ('', ''),
+        'Disconnect': ('', ''),
+        'ConnectProfile': ('s', ''),
+        'DisconnectProfile': ('s', ''),
+        'Pair': ('', ''),
+        'CancelPairing': ('', ''),
+    },
+    GATT_CHRC_IFACE: {
+        'ReadValue': ('a{sv}', 'ay'),
+        'WriteValue': ('aya{sv}', ''),
+        'AcquireWrite': ('a{sv}', 'hq'),
+        'AcquireNotify': ('a{sv}', 'hq'),
+        'StartNotify': ('', ''),
+        'StopNotify': ('', ''),
+    },
+    GATT_DESC_IFACE: {
+        'ReadValue': ('a{sv}', 'ay'),
+        'WriteValue': ('aya{sv}', ''),
+    },
+    GATT_MANAGER_IFACE: {
+        'RegisterApplication': ('oa{sv}', ''),
+        'UnregisterApplication': ('o', ''),
+    },
+    GATT_PROFILE_IFACE: {
+        'Release': ('', ''),
+    },
+    LE_ADVERTISING_MANAGER_IFACE: {
+        'RegisterAdvertisement': ('oa{sv}', ''),
+        'UnregisterAdvertisement': ('o', ''),
+    },
+    MEDIA_PLAYER_IFACE: {
+        'Play': ('', ''),
+        'Pause': ('', ''),
+        'Stop': ('', ''),
+        'Next': ('', ''),
+        'Previous': ('', ''),
+        'FastForward': ('', ''),
+        'Rewind': ('', ''),
+        'Press': ('y', ''),
+    },
+}
+
 # Bluezero local D-Bus publish location
 #: Bluezero D-Bus Name
 BLUEZERO_DBUS_NAME = 'ukBaz.bluezero'
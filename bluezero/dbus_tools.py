@@ -3,21 +3,39 @@
 # Standard libraries
 import re
 import subprocess
+import weakref
 
 # D-Bus import
 import dbus
 
 # python-bluezero constants import
 from bluezero import constants
+from bluezero import object_manager
 from bluezero import tools
 
 logger = tools.create_module_logger(__name__)
 
+_bus = None
+_om_iface = None
+_adapter_addresses = {}
+_proxies = weakref.WeakValueDictionary()
+_ifaces = weakref.WeakValueDictionary()
+#: Count of proxy objects created and reused by :func:`get_dbus_obj`
+proxy_stats = {'created': 0, 'reused': 0}
+_method_signatures = {
+    f'{iface}.{method}': in_sig
+    for iface, methods in constants.BLUEZ_METHOD_SIGNATURES.items()
+    for method, (in_sig, _) in methods.items()
+}
+
 
 def bluez_version():
     """
     get the version of the BlueZ daemon being used on the system
 
+    This runs ``bluetoothctl -v`` on every call. To test for a feature use
+    :func:`bluezero.capabilities.probe` instead.
+
     :return: String of BlueZ version
     """
     cmd = ['bluetoothctl', '-v']
@@ -29,6 +47,11 @@ def bluez_version():
 def bluez_experimental_mode():
     """
     Return True if the BlueZ daemon service is in experimental mode
+
+    This runs ``service bluetooth status`` on every call.
+    :attr:`bluezero.capabilities.Capabilities.experimental` is found
+    without starting a process and is only looked up once.
+
     :return: True if experimental enabled
     """
     status = subprocess.check_output('service bluetooth status', shell=True)
@@ -66,33 +89,91 @@ def properties_changed(interface, changed, invalidated, path):
                          prop, changed[prop])
 
 
+def get_system_bus():
+    """
+    Return the system bus connection that is shared by all of Bluezero.
+
+    If the connection has changed since the last call (e.g. the bus was
+    restarted) then all cached proxy objects are dropped.
+
+    :return: dbus.SystemBus connection
+    """
+    global _bus, _om_iface  # pylint: disable=global-statement
+    bus = dbus.SystemBus()
+    if bus is not _bus:
+        _bus = bus
+        _om_iface = None
+        _proxies.clear()
+        _ifaces.clear()
+    return bus
+
+
 def get_dbus_obj(dbus_path):
     """
     Get the the DBus object for the given path
+
+    Proxy objects are shared. The same proxy is returned for a path while
+    any Bluezero object is still holding a reference to it.
+
+    Proxies are created without introspection. Method arguments are
+    marshalled using the signatures in
+    :data:`bluezero.constants.BLUEZ_METHOD_SIGNATURES`.
+
     :param dbus_path:
     :return:
     """
-    bus = dbus.SystemBus()
-    return bus.get_object(constants.BLUEZ_SERVICE_NAME, dbus_path)
+    bus = get_system_bus()
+    key = str(dbus_path)
+    proxy = _proxies.get(key)
+    if proxy is None:
+        proxy = bus.get_object(constants.BLUEZ_SERVICE_NAME, dbus_path,
+                               introspect=False)
+        # dbus-python looks up the signature of a method call in this map
+        # when none is given, so seeding it replaces an Introspect call
+        proxy._introspect_method_map.update(_method_signatures)
+        _proxies[key] = proxy
+        proxy_stats['created'] += 1
+    else:
+        proxy_stats['reused'] += 1
+    return proxy
 
 
 def get_dbus_iface(iface, dbus_obj):
     """
     Return the DBus interface object for given interface and DBus object
+
+    Interface objects are shared in the same way as the proxy objects
+    from :func:`get_dbus_obj`.
+
     :param iface:
     :param dbus_obj:
     :return:
     """
-    return dbus.Interface(dbus_obj, iface)
+    key = (id(dbus_obj), iface)
+    dbus_iface = _ifaces.get(key)
+    if dbus_iface is None:
+        dbus_iface = dbus.Interface(dbus_obj, iface)
+        _ifaces[key] = dbus_iface
+    return dbus_iface
 
 
 def get_managed_objects():
-    """Return the objects currently managed by the DBus Object Manager."""
-    bus = dbus.SystemBus()
-    manager = dbus.Interface(bus.get_object(
-        constants.BLUEZ_SERVICE_NAME, '/'),
-        constants.DBUS_OM_IFACE)
-    return manager.GetManagedObjects()
+    """
+    Return the objects currently managed by the DBus Object Manager.
+
+    If the object mirror has been enabled with
+    :func:`bluezero.object_manager.enable_mirror` then the mirrored copy is
+    returned and no D-Bus call is made.
+    """
+    global _om_iface  # pylint: disable=global-statement
+    mirror = object_manager.get_mirror()
+    if mirror is not None:
+        return mirror.get_managed_objects()
+    get_system_bus()
+    if _om_iface is None:
+        _om_iface = get_dbus_iface(constants.DBUS_OM_IFACE,
+                                   get_dbus_obj('/'))
+    return _om_iface.GetManagedObjects()
 
 
 def get_mac_addr_from_dbus_path(path):
@@ -119,42 +200,100 @@ def get_device_address_from_dbus_path(path):
 
 
 def get_adapter_address_from_dbus_path(path):
-    """Return the address of the adapter from the a DBus path"""
-    result = re.match(r'/org/bluez/hci\d+', path)
-    mngd_objs = get_managed_objects()
-    return mngd_objs[result.group(0)][constants.ADAPTER_INTERFACE]['Address']
+    """
+    Return the address of the adapter from the a DBus path
+
+    Adapter addresses are cached by path. The cache is filled with one
+    ``GetManagedObjects`` call the first time an unknown adapter is seen.
+
+    :return: Address of the adapter, or None if the path is not under an
+        adapter or the adapter is not known to BlueZ
+    """
+    match = re.match(r'/org/bluez/hci\d+', str(path))
+    if match is None:
+        return None
+    adapter_path = match.group(0)
+    address = _adapter_addresses.get(adapter_path)
+    if address is None:
+        refresh_adapter_addresses()
+        address = _adapter_addresses.get(adapter_path)
+    return address
 
 
-def _get_dbus_path2(objects, parent_path, iface_in, prop, value):
+def refresh_adapter_addresses():
     """
-    Find DBus path for given DBus interface with property of a given value.
+    Rebuild the adapter path to address cache from ``GetManagedObjects``.
+
+    :return: Dictionary of adapter path to address
+    """
+    _adapter_addresses.clear()
+    for path, interfaces in get_managed_objects().items():
+        adapter = interfaces.get(constants.ADAPTER_INTERFACE)
+        if adapter is not None:
+            _adapter_addresses[str(path)] = str(adapter['Address'])
+    return dict(_adapter_addresses)
+
+
+def update_adapter_address(path, address=None):
+    """
+    Update the adapter path to address cache when an adapter is added or
+    removed.
+
+    :param path: D-Bus path of the adapter
+    :param address: Address of the adapter. None if it has been removed.
+    """
+    if address is None:
+        _adapter_addresses.pop(str(path), None)
+    else:
+        _adapter_addresses[str(path)] = str(address)
 
-    :param objects: Dictionary of objects to search
-    :param parent_path: Parent path to include in search
-    :param iface_in: The interface of interest
-    :param prop: The property to search for
-    :param value: The value of the property being searched for
+
+def get_path_index():
+    """
+    Return an index of the BlueZ object paths.
+
+    When the object mirror is enabled its incrementally updated index is used.
+    Otherwise an index is built from a single ``GetManagedObjects`` call, so
+    pass it to :func:`get_dbus_path` to look up many paths with one fetch.
+
+    :return: :class:`~bluezero.object_manager.PathIndex`
+    """
+    mirror = object_manager.get_mirror()
+    if mirror is not None:
+        return mirror.get_index()
+    return object_manager.PathIndex(get_managed_objects())
+
+
+def _resolve_dbus_path(levels, index=None):
+    """
+    Find the DBus path of an object one level of the object tree at a time.
+
+    :param levels: List of (interface, address or UUID) from the adapter
+        down. Levels with a value of None are skipped.
+    :param index: (optional) :class:`~bluezero.object_manager.PathIndex` to
+        use. Fetched if not given.
     :return: Path of object searched for
     """
-    if parent_path is None:
-        return None
-    for path, iface in objects.items():
-        props = iface.get(iface_in)
-        if props is None:
+    if index is None:
+        index = get_path_index()
+    _dbus_obj_path = None
+    parent_path = None
+    for iface, value in levels:
+        if value is None:
             continue
-        dev_name = "dev_" + value.lower().replace(":", "_")
-        if (props[prop].lower() == value.lower() or
-            path.lower().endswith(dev_name)) \
-                and path.startswith(parent_path):
-            return path
-    return None
+        if iface == constants.ADAPTER_INTERFACE:
+            parent_path = '/org/bluez'
+        _dbus_obj_path = index.lookup(iface, value, parent_path)
+        parent_path = _dbus_obj_path
+    return _dbus_obj_path
 
 
 def get_dbus_path(adapter=None,
                   device=None,
                   service=None,
                   characteristic=None,
-                  descriptor=None):
+                  descriptor=None,
+                  index=None):
     """
     Return a DBus path for the given properties
     :param adapter: Adapter address
@@ -162,51 +301,17 @@ def get_dbus_path(adapter=None,
     :param service: GATT Service UUID
     :param characteristic: GATT Characteristic UUID
     :param descriptor: GATT Descriptor UUID
+    :param index: (optional) Result of :func:`get_path_index` to look up
+        the path in, instead of fetching the object tree
     :return: DBus path
     """
-    bus = dbus.SystemBus()
-    manager = dbus.Interface(
-        bus.get_object(constants.BLUEZ_SERVICE_NAME, '/'),
-        constants.DBUS_OM_IFACE)
-    mngd_objs = manager.GetManagedObjects()
-
-    _dbus_obj_path = None
-
-    if adapter is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         '/org/bluez',
-                                         constants.ADAPTER_INTERFACE,
-                                         'Address',
-                                         adapter)
-
-    if device is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.DEVICE_INTERFACE,
-                                         'Address',
-                                         device)
-
-    if service is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.GATT_SERVICE_IFACE,
-                                         'UUID',
-                                         service)
-
-    if characteristic is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.GATT_CHRC_IFACE,
-                                         'UUID',
-                                         characteristic)
-
-    if descriptor is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.GATT_DESC_IFACE,
-                                         'UUID',
-                                         descriptor)
-    return _dbus_obj_path
+    return _resolve_dbus_path([
+        (constants.ADAPTER_INTERFACE, adapter),
+        (constants.DEVICE_INTERFACE, device),
+        (constants.GATT_SERVICE_IFACE, service),
+        (constants.GATT_CHRC_IFACE, characteristic),
+        (constants.GATT_DESC_IFACE, descriptor),
+    ], index)
 
 
 def get_profile_path(adapter,
@@ -220,34 +325,11 @@ def get_profile_path(adapter,
     :param profile:
     :return:
     """
-    bus = dbus.SystemBus()
-    manager = dbus.Interface(
-        bus.get_object(constants.BLUEZ_SERVICE_NAME, '/'),
-        constants.DBUS_OM_IFACE)
-    mngd_objs = manager.GetManagedObjects()
-
-    _dbus_obj_path = None
-
-    if adapter is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         '/org/bluez',
-                                         constants.ADAPTER_INTERFACE,
-                                         'Address',
-                                         adapter)
-    if device is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.DEVICE_INTERFACE,
-                                         'Address',
-                                         device)
-
-    if profile is not None:
-        _dbus_obj_path = _get_dbus_path2(mngd_objs,
-                                         _dbus_obj_path,
-                                         constants.GATT_PROFILE_IFACE,
-                                         'UUID',
-                                         profile)
-    return _dbus_obj_path
+    return _resolve_dbus_path([
+        (constants.ADAPTER_INTERFACE, adapter),
+        (constants.DEVICE_INTERFACE, device),
+        (constants.GATT_PROFILE_IFACE, profile),
+    ])
 
 
 def get_iface(adapter=None,
@@ -409,40 +491,130 @@ def get(dbus_prop_obj, dbus_iface, prop_name, default=None):
 
 def str_to_dbusarray(word):
     """Helper function to represent Python string as D-Dbus Byte array"""
-    return dbus.Array([dbus.Byte(ord(letter)) for letter in word], 'y')
+    return dbus.Array(bytes(map(ord, word)), 'y')
 
 
 def bytes_to_dbusarray(bytesarray):
     """Helper function to represent Python bytearray as D-Bus Byte array"""
-    return dbus.Array([dbus.Byte(elem) for elem in bytesarray], 'y')
-
-
-def dbus_to_python(data):
-    """convert dbus data types to python native data types"""
-    if isinstance(data, dbus.String):
-        data = str(data)
-    elif isinstance(data, dbus.Boolean):
-        data = bool(data)
-    elif isinstance(data, dbus.Byte):
-        data = int(data)
-    elif isinstance(data, dbus.UInt16):
-        data = int(data)
-    elif isinstance(data, dbus.UInt32):
-        data = int(data)
-    elif isinstance(data, dbus.Int64):
-        data = int(data)
-    elif isinstance(data, dbus.Double):
-        data = float(data)
-    elif isinstance(data, dbus.ObjectPath):
-        data = str(data)
-    elif isinstance(data, dbus.Array):
-        if data.signature == dbus.Signature('y'):
-            data = bytearray(data)
-        else:
-            data = [dbus_to_python(value) for value in data]
-    elif isinstance(data, dbus.Dictionary):
-        new_data = dict()
-        for key in data:
-            new_data[dbus_to_python(key)] = dbus_to_python(data[key])
-        data = new_data
-    return data
+    return dbus.Array(bytes(bytesarray), 'y')
+
+
+def to_byte_array(value):
+    """
+    Return a byte payload in the form that is quickest to send as ``ay``.
+
+    dbus-python copies a ``dbus.ByteArray`` into a message in one step
+    rather than marshalling a ``dbus.Byte`` for each element.
+
+    :param value: bytes, bytearray, memoryview, array('B') or a list of
+        integers in the range 0 to 255
+    :return: ``dbus.ByteArray``
+    """
+    if type(value) is dbus.ByteArray:  # pylint: disable=unidiomatic-typecheck
+        return value
+    return dbus.ByteArray(value)
+
+
+def _array_to_python(data):
+    """Convert a D-Bus array. Byte arrays are copied in one step."""
+    if data.signature == 'y':
+        return bytearray(data)
+    return [dbus_to_python(value) for value in data]
+
+
+def _dict_to_python(data):
+    """Convert a D-Bus dictionary"""
+    return {dbus_to_python(key): dbus_to_python(value)
+            for key, value in data.items()}
+
+
+def _struct_to_python(data):
+    """Convert a D-Bus struct"""
+    return tuple(dbus_to_python(value) for value in data)
+
+
+_to_python = {
+    dbus.String: str,
+    dbus.ObjectPath: str,
+    dbus.Signature: str,
+    dbus.Boolean: bool,
+    dbus.Byte: int,
+    dbus.Int16: int,
+    dbus.UInt16: int,
+    dbus.Int32: int,
+    dbus.UInt32: int,
+    dbus.Int64: int,
+    dbus.UInt64: int,
+    dbus.Double: float,
+    dbus.ByteArray: bytearray,
+    dbus.Array: _array_to_python,
+    dbus.Dictionary: _dict_to_python,
+    dbus.Struct: _struct_to_python,
+}
+_basic_to_python = {
+    'y': int, 'n': int, 'q': int, 'i': int, 'u': int, 'x': int, 't': int,
+    'b': bool, 'd': float, 's': str, 'o': str, 'g': str,
+}
+_signature_converters = {}
+
+
+def _compile_converter(signature, pos=0):
+    """
+    Build a converter for the single complete type starting at ``pos``.
+
+    :return: Tuple of the converter and the position after the type
+    """
+    code = signature[pos]
+    if code in _basic_to_python:
+        return _basic_to_python[code], pos + 1
+    if code == 'v':
+        return dbus_to_python, pos + 1
+    if code == 'a' and signature[pos + 1] == 'y':
+        return bytearray, pos + 2
+    if code == 'a' and signature[pos + 1] == '{':
+        key_conv, pos = _compile_converter(signature, pos + 2)
+        value_conv, pos = _compile_converter(signature, pos)
+        return (lambda data: {key_conv(key): value_conv(value)
+                              for key, value in data.items()}), pos + 1
+    if code == 'a':
+        item_conv, pos = _compile_converter(signature, pos + 1)
+        return (lambda data: [item_conv(value) for value in data]), pos
+    if code == '(':
+        convs = []
+        pos += 1
+        while signature[pos] != ')':
+            conv, pos = _compile_converter(signature, pos)
+            convs.append(conv)
+        return (lambda data: tuple(conv(value) for conv, value
+                                   in zip(convs, data))), pos + 1
+    raise ValueError(f'Unsupported D-Bus signature: {signature}')
+
+
+def dbus_to_python(data, signature=None):
+    """
+    convert dbus data types to python native data types
+
+    Byte arrays are converted to ``bytearray``. Values of a type that is
+    not a D-Bus type are returned unchanged.
+
+    :param data: Value to convert
+    :param signature: (optional) D-Bus signature of ``data``, e.g. ``a{sv}``.
+        When given, a converter built for that signature is used which
+        avoids looking up the type of the outer containers.
+    :return: Python value
+    """
+    if signature is not None:
+        converter = _signature_converters.get(signature)
+        if converter is None:
+            try:
+                converter, end = _compile_converter(signature)
+            except IndexError:
+                end = -1
+            if end != len(signature):
+                raise ValueError(f'Unsupported D-Bus signature: {signature}')
+            _signature_converters[signature] = converter
+        return converter(data)
+    converter = _to_python.get(type(data))
+    if converter is None:
+        return data
+    return converter(data)
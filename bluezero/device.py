@@ -3,19 +3,107 @@
 Classes:
 
 - Device -- Remote Bluetooth Device Class
+- DeviceInfo -- Read only summary of a remote device
+- DeviceRegistry -- One Device instance per D-Bus path for an adapter
 """
+from collections import OrderedDict
+import sys
+import time
+from typing import NamedTuple
+import weakref
+from typing import Optional
+
 import dbus
 import dbus.exceptions
 
+from bluezero import async_tools
 from bluezero import constants
 from bluezero import dbus_tools
 import bluezero.adapter
+from bluezero import property_cache
 from bluezero import tools
 
 
 logger = tools.create_module_logger(__name__)
 
 
+class DeviceInfo(NamedTuple):
+    """
+    Read only summary of a remote device from the BlueZ object tree.
+
+    Creating one makes no D-Bus calls. Use :meth:`device` to get the full
+    :class:`Device` when it is needed.
+    """
+    #: D-Bus object path
+    path: str
+    #: Remote device address
+    address: str
+    #: Address of the local adapter the device was found with
+    adapter: str
+    #: Remote device name or None
+    name: Optional[str]
+    #: Remote device alias
+    alias: str
+    #: Last received signal strength or None
+    rssi: Optional[int]
+    #: Tuple of 128-bit service UUIDs
+    uuids: tuple
+    #: True if the device is connected
+    connected: bool
+    #: True if the device is paired
+    paired: bool
+
+    @classmethod
+    def from_props(cls, path, adapter_addr, props):
+        """
+        Create from the ``Device1`` properties in ``GetManagedObjects``.
+
+        :param path: D-Bus object path of the device
+        :param adapter_addr: Address of the local adapter
+        :param props: Dictionary of the device properties
+        """
+        name = props.get('Name')
+        rssi = props.get('RSSI')
+        return cls(str(path), str(props['Address']), str(adapter_addr),
+                   None if name is None else str(name),
+                   str(props.get('Alias', '')),
+                   None if rssi is None else int(rssi),
+                   tuple(str(uuid) for uuid in props.get('UUIDs', [])),
+                   bool(props.get('Connected', False)),
+                   bool(props.get('Paired', False)))
+
+    def device(self, freshness=property_cache.LIVE):
+        """
+        Return a full :class:`Device` for this remote device.
+
+        :param freshness: (optional) How property reads are served.
+        """
+        return Device(self.adapter, self.address, freshness,
+                      device_path=self.path)
+
+
+def available_info(adapter_address=None, mngd_objs=None):
+    """
+    A generator yielding a :class:`DeviceInfo` for every discovered device.
+
+    :param adapter_address: (optional) Only devices of this adapter
+    :param mngd_objs: (optional) Result of ``GetManagedObjects`` to use.
+        Fetched with one call if not given.
+    """
+    if mngd_objs is None:
+        mngd_objs = dbus_tools.get_managed_objects()
+    adapters = {
+        info.path: info.address
+        for info in bluezero.adapter.available_info(mngd_objs)
+    }
+    for path, obj in mngd_objs.items():
+        props = obj.get(constants.DEVICE_INTERFACE, None)
+        if props:
+            adapter = adapters[props['Adapter']]
+            if adapter_address is None or adapter == adapter_address:
+                yield DeviceInfo.from_props(path, adapter, props)
+
+
 class Device:
     """Remote Bluetooth Device Class.
 
@@ -25,20 +113,19 @@ class Device:
 
     @staticmethod
     def available(adapter_address=None):
-        """A generator yielding a Device object for every discovered device."""
-        mng_objs = dbus_tools.get_managed_objects()
-        adapters = {
-            adapter.path: adapter.address
-            for adapter in bluezero.adapter.Adapter.available()
-        }
-        for obj in mng_objs.values():
-            device = obj.get(constants.DEVICE_INTERFACE, None)
-            if device:
-                adapter = adapters[device['Adapter']]
-                if adapter_address is None or adapter == adapter_address:
-                    yield Device(adapter, device['Address'])
-
-    def __init__(self, adapter_addr, device_addr):
+        """
+        A generator yielding a Device object for every discovered device.
+
+        The object tree is fetched once. Use :func:`available_info` if only
+        the address or name is needed.
+
+        :param adapter_address: (optional) Only devices of this adapter
+        """
+        for info in available_info(adapter_address):
+            yield info.device()
+
+    def __init__(self, adapter_addr, device_addr,
+                 freshness=property_cache.LIVE, device_path=None):
         """Default initialiser.
 
         Creates object for the specified remote Bluetooth device.
@@ -46,35 +133,74 @@ class Device:
 
         :param adapter_addr: Address of the local Bluetooth adapter.
         :param device_addr: Address of the remote Bluetooth device.
+        :param freshness: (optional) How property reads are served. One of
+            the modes in :mod:`bluezero.property_cache`.
+        :param device_path: (optional) D-Bus path of the remote device. If
+            known, e.g. from a signal, the path lookup is skipped.
         """
-        self.bus = dbus.SystemBus()
-        device_path = dbus_tools.get_dbus_path(adapter_addr, device_addr)
+        self.bus = dbus_tools.get_system_bus()
+        if device_path is None:
+            device_path = dbus_tools.get_dbus_path(adapter_addr, device_addr)
         if not device_path:
             raise ValueError("Cannot find a device: " + device_addr +
                              " using adapter: " + adapter_addr)
 
         self.remote_device_path = device_path
-        self.remote_device_obj = self.bus.get_object(
-            constants.BLUEZ_SERVICE_NAME,
+        self.remote_device_obj = dbus_tools.get_dbus_obj(
             self.remote_device_path)
-        self.remote_device_methods = dbus.Interface(
-            self.remote_device_obj,
-            constants.DEVICE_INTERFACE)
-        self.remote_device_props = dbus.Interface(self.remote_device_obj,
-                                                  dbus.PROPERTIES_IFACE)
+        self.remote_device_methods = dbus_tools.get_dbus_iface(
+            constants.DEVICE_INTERFACE, self.remote_device_obj)
+        self.remote_device_props = dbus_tools.get_dbus_iface(
+            dbus.PROPERTIES_IFACE, self.remote_device_obj)
+        self._prop_cache = property_cache.PropertyCache(
+            self.remote_device_props, constants.DEVICE_INTERFACE,
+            self.remote_device_path, freshness)
+
+    def close(self):
+        """Remove any property signal subscription of the device."""
+        self._prop_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def freshness(self):
+        """
+        How property reads are served.
+
+        One of the modes in :mod:`bluezero.property_cache`.
+        """
+        return self._prop_cache.mode
+
+    @freshness.setter
+    def freshness(self, new_mode):
+        self._prop_cache.mode = new_mode
+
+    def snapshot(self):
+        """Return a dictionary of all the remote device properties."""
+        return self._prop_cache.snapshot()
+
+    def refresh(self):
+        """
+        Fetch all the remote device properties with one ``GetAll`` call.
+
+        In ``SNAPSHOT`` and ``SIGNAL`` mode the properties are then read
+        from the result.
+        """
+        return self._prop_cache.refresh()
 
     @property
     def address(self):
         """Return the remote device address."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Address')
+        return self._prop_cache.get('Address')
 
     @property
     def name(self):
         """Return the remote device name."""
-        return dbus_tools.get(
-            self.remote_device_props, constants.DEVICE_INTERFACE,
-            'Name', None)
+        return self._prop_cache.get('Name', None)
 
     @property
     def icon(self):
@@ -83,90 +209,67 @@ class Device:
 
         This is set according to the freedesktop.org icon naming specification.
         """
-        return dbus_tools.get(
-            self.remote_device_props, constants.DEVICE_INTERFACE, 'Icon', None)
+        return self._prop_cache.get('Icon', None)
 
     @property
     def bt_class(self):
         """The Bluetooth class of device of the remote device."""
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'Class', None)
+        return self._prop_cache.get('Class', None)
 
     @property
     def appearance(self):
         """External appearance of device, as found on GAP service."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Appearance')
+        return self._prop_cache.get('Appearance')
 
     @property
     def uuids(self):
         """List of 128-bit UUIDs that represent available remote services."""
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'UUIDs', None)
+        return self._prop_cache.get('UUIDs', None)
 
     @property
     def paired(self):
         """Indicate whether the remote device is paired."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Paired')
+        return self._prop_cache.get('Paired')
 
     @property
     def connected(self):
         """Indicate whether the remote device is currently connected."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Connected')
+        return self._prop_cache.get('Connected')
 
     @property
     def trusted(self):
         """Indicate whether the remote device is seen as trusted."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE,
-            'Trusted')
+        return self._prop_cache.get('Trusted')
 
     @trusted.setter
     def trusted(self, new_state):
         """Indicate whether the remote device is seen as trusted."""
-        self.remote_device_props.Set(
-            constants.DEVICE_INTERFACE,
-            'Trusted',
-            new_state)
+        self._prop_cache.set('Trusted', new_state)
 
     @property
     def blocked(self):
         """Indicate whether the remote device is seen as blocked."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE,
-            'Blocked')
+        return self._prop_cache.get('Blocked')
 
     @blocked.setter
     def blocked(self, new_state):
         """Indicate whether the remote device is seen as blocked."""
-        self.remote_device_props.Set(
-            constants.DEVICE_INTERFACE,
-            'Blocked',
-            new_state)
+        self._prop_cache.set('Blocked', new_state)
 
     @property
     def alias(self):
         """remote device alias"""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Alias')
+        return self._prop_cache.get('Alias')
 
     @alias.setter
     def alias(self, new_alias):
         """remote device alias."""
-        self.remote_device_props.Set(
-            constants.DEVICE_INTERFACE,
-            'Alias',
-            new_alias)
+        self._prop_cache.set('Alias', new_alias)
 
     @property
     def _adapter(self):
         """The D-Bus object path of the adapter the device belongs to."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE, 'Adapter')
+        return self._prop_cache.get('Adapter')
 
     @property
     def adapter(self):
@@ -183,9 +286,7 @@ class Device:
 
         Set to true if the device only supports the pre-2.1 pairing mechanism.
         """
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE,
-            'LegacyPairing')
+        return self._prop_cache.get('LegacyPairing')
 
     @legacy_pairing.setter
     def legacy_pairing(self, new_status):
@@ -193,10 +294,7 @@ class Device:
 
         Set to true if the device only supports the pre-2.1 pairing mechanism.
         """
-        self.remote_device_props.Set(
-            constants.DEVICE_INTERFACE,
-            'LegacyPairing',
-            new_status)
+        self._prop_cache.set('LegacyPairing', new_status)
 
     @property
     def modalias(self):
@@ -205,9 +303,7 @@ class Device:
 
         Used by the kernel and udev.
         """
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'Modalias', None)
+        return self._prop_cache.get('Modalias', None)
 
     @property
     def RSSI(self):  # pylint: disable=invalid-name
@@ -216,16 +312,12 @@ class Device:
 
         (This is inquiry or advertising RSSI).
         """
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'RSSI', None)
+        return self._prop_cache.get('RSSI', None)
 
     @property
     def tx_power(self):
         """Advertised transmitted power level (inquiry or advertising)."""
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'TxPower', None)
+        return self._prop_cache.get('TxPower', None)
 
     @property
     def manufacturer_data(self):
@@ -234,9 +326,7 @@ class Device:
 
         Keys are 16 bits Manufacturer ID followed by its byte array value.
         """
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'ManufacturerData', None)
+        return self._prop_cache.get('ManufacturerData', None)
 
     @property
     def service_data(self):
@@ -245,16 +335,12 @@ class Device:
 
         Keys are the UUIDs in string format followed by its byte array value.
         """
-        return dbus_tools.get(self.remote_device_props,
-                              constants.DEVICE_INTERFACE,
-                              'ServiceData', None)
+        return self._prop_cache.get('ServiceData', None)
 
     @property
     def services_resolved(self):
         """Indicate whether or not service discovery has been resolved."""
-        return self.remote_device_props.Get(
-            constants.DEVICE_INTERFACE,
-            'ServicesResolved')
+        return self._prop_cache.get('ServicesResolved')
 
     @property
     def services_available(self):
@@ -289,12 +375,11 @@ class Device:
                                        constants.DEVICE_INTERFACE,
                                        'Connect', '', [], timeout=timeout)
             else:
-                # need a device to test next line with.  for now, timeout
-                # ignored for profile connections.
-                # self.bus.call_blocking(constants.BLUEZ_SERVICE_NAME,
-                # self.remote_device_path, constants.DEVICE_INTERFACE,
-                # 'ConnectProfile', 's', [profile], timeout=timeout)
-                self.remote_device_methods.ConnectProfile(profile)
+                self.bus.call_blocking(constants.BLUEZ_SERVICE_NAME,
+                                       self.remote_device_path,
+                                       constants.DEVICE_INTERFACE,
+                                       'ConnectProfile', 's', [profile],
+                                       timeout=timeout)
         except dbus.exceptions.DBusException as dbus_exception:
             dbus_error_type = 'org.freedesktop.DBus.Error.NoReply'
             if dbus_exception.get_dbus_name() == dbus_error_type:
@@ -305,3 +390,311 @@ class Device:
     def disconnect(self):
         """Disconnect from the remote device."""
         self.remote_device_methods.Disconnect()
+
+    def _call_async(self, method, signature, args, timeout, reply_handler,
+                    error_handler, cancel=None):
+        """Call a Device1 method without waiting for the reply"""
+        call = async_tools.PendingCall(
+            f'{method} {self.remote_device_path}', reply_handler,
+            error_handler, cancel)
+        self.bus.call_async(constants.BLUEZ_SERVICE_NAME,
+                            self.remote_device_path,
+                            constants.DEVICE_INTERFACE, method, signature,
+                            args, call.reply_handler, call.error_handler,
+                            timeout=-1 if timeout is None else timeout)
+        return call
+
+    def _disconnect_quietly(self):
+        """Disconnect without waiting, only logging an error"""
+        def error_handler(error):
+            logger.debug('Disconnect %s failed: %s',
+                         self.remote_device_path, error)
+        self._call_async('Disconnect', '', [], None, None, error_handler)
+
+    def connect_async(self, profile=None, timeout=35, reply_handler=None,
+                      error_handler=None):
+        """
+        Start a connection to the remote device without blocking.
+
+        The result can be received with the handlers or by awaiting the
+        returned call. Cancelling the call disconnects, which stops
+        BlueZ trying to connect.
+
+        :param profile: (optional) UUID of the profile to connect
+        :param timeout: (optional) Seconds to wait for the connection
+        :param reply_handler: (optional) Called with no arguments when
+            connected
+        :param error_handler: (optional) Called with the
+            ``DBusException`` if the connection fails
+        :return: :class:`~bluezero.async_tools.PendingCall`
+        """
+        if profile is None:
+            call = self._call_async('Connect', '', [], timeout,
+                                    reply_handler, error_handler,
+                                    self._disconnect_quietly)
+        else:
+            call = self._call_async('ConnectProfile', 's', [profile],
+                                    timeout, reply_handler, error_handler,
+                                    self._disconnect_quietly)
+
+        def no_reply(done_call):
+            error = done_call.exception()
+            if error is not None and error.get_dbus_name() == \
+                    'org.freedesktop.DBus.Error.NoReply':
+                # move driver back from connecting state to disconnected state
+                self._disconnect_quietly()
+        call.add_done_callback(no_reply)
+        return call
+
+    def disconnect_async(self, timeout=None, reply_handler=None,
+                         error_handler=None):
+        """
+        Disconnect from the remote device without blocking.
+
+        :param timeout: (optional) Seconds to wait for the reply. The D-Bus
+            default if not given.
+        :param reply_handler: (optional) Called with no arguments when
+            disconnected
+        :param error_handler: (optional) Called with the ``DBusException``
+            if the disconnection fails
+        :return: :class:`~bluezero.async_tools.PendingCall`
+        """
+        return self._call_async('Disconnect', '', [], timeout,
+                                reply_handler, error_handler)
+
+    def pair_async(self, timeout=None, reply_handler=None,
+                   error_handler=None):
+        """
+        Pair with the remote device without blocking.
+
+        Cancelling the returned call calls ``CancelPairing``.
+
+        :param timeout: (optional) Seconds to wait for pairing. The D-Bus
+            default if not given.
+        :param reply_handler: (optional) Called with no arguments when
+            paired
+        :param error_handler: (optional) Called with the ``DBusException``
+            if pairing fails
+        :return: :class:`~bluezero.async_tools.PendingCall`
+        """
+        def cancel_pairing():
+            def cancel_error(error):
+                logger.debug('CancelPairing %s failed: %s',
+                             self.remote_device_path, error)
+            self._call_async('CancelPairing', '', [], None, None,
+                             cancel_error)
+        return self._call_async('Pair', '', [], timeout, reply_handler,
+                                error_handler, cancel_pairing)
+
+
+class DeviceRegistry:
+    """
+    The :class:`Device` objects of one adapter, one per D-Bus path.
+
+    Devices are created from the path and address in a signal so no lookup
+    of the object tree is needed, and the same instance is returned for every
+    later signal. Entries should be removed when BlueZ sends
+    ``InterfacesRemoved`` for the device. If more than ``max_devices`` are
+    held the least recently used is dropped but not closed, as callers may
+    still be using it. It is released when the last reference to it goes,
+    and :meth:`get` returns the same instance while one remains.
+    """
+
+    #: Default limit on the number of devices held
+    DEFAULT_MAX_DEVICES = 1024
+
+    def __init__(self, adapter_path, max_devices=DEFAULT_MAX_DEVICES,
+                 freshness=property_cache.LIVE):
+        """
+        Default initialiser.
+
+        :param adapter_path: D-Bus path of the local Bluetooth adapter.
+        :param max_devices: (optional) Number of devices to hold. No limit
+            if None. Devices dropped over the limit keep any ``SIGNAL``
+            subscription until they are garbage collected.
+        :param freshness: (optional) How property reads are served by the
+            devices created.
+        """
+        self.adapter_path = adapter_path
+        self.max_devices = max_devices
+        self.freshness = freshness
+        self._devices = OrderedDict()
+        # Dropped over max_devices but still referenced elsewhere
+        self._evicted = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._devices)
+
+    def __contains__(self, path):
+        return str(path) in self._devices
+
+    def owns(self, path):
+        """
+        Return True if the D-Bus path is a device of this adapter.
+
+        :param path: D-Bus object path
+        """
+        if not self.adapter_path:
+            return False
+        return str(path).startswith(self.adapter_path + '/dev_')
+
+    def path_for(self, device_addr):
+        """
+        Return the D-Bus path BlueZ uses for a device address.
+
+        :param device_addr: Address of the remote Bluetooth device.
+        """
+        return f'{self.adapter_path}/dev_{device_addr.replace(":", "_")}'
+
+    def get(self, path, device_addr=None):
+        """
+        Return the device for a D-Bus path, creating it if needed.
+
+        :param path: D-Bus path of the remote device
+        :param device_addr: (optional) Address of the remote device. Taken
+            from the path if not given.
+        :return: :class:`Device`
+        """
+        path = str(path)
+        dev = self._devices.get(path)
+        if dev is not None:
+            self._devices.move_to_end(path)
+            return dev
+        dev = self._evicted.pop(path, None)
+        if dev is None:
+            if device_addr is None:
+                device_addr = dbus_tools.get_device_address_from_dbus_path(
+                    path)
+            # The adapter address is only needed to look up the path
+            dev = Device(None, str(device_addr), self.freshness,
+                         device_path=path)
+        self._devices[path] = dev
+        if self.max_devices is not None:
+            while len(self._devices) > self.max_devices:
+                evicted_path, evicted = self._devices.popitem(last=False)
+                self._evicted[evicted_path] = evicted
+        return dev
+
+    def remove(self, path):
+        """
+        Forget the device for a D-Bus path.
+
+        The device is closed as the object has gone.
+
+        :param path: D-Bus path of the remote device
+        """
+        dev = self._devices.pop(str(path), None)
+        if dev is None:
+            dev = self._evicted.pop(str(path), None)
+        if dev is not None:
+            dev.close()
+
+    def clear(self):
+        """Forget all devices."""
+        for path in list(self._devices) + list(self._evicted.keys()):
+            self.remove(path)
+
+    def memory_usage(self):
+        """
+        Approximate number of bytes held by the registry.
+
+        This is the shallow size of each :class:`Device`, its attribute
+        dictionary and its property cache including any cached values. The
+        D-Bus proxies are counted but not the connection they share.
+
+        :return: Size in bytes
+        """
+        total = sys.getsizeof(self._devices)
+        for path, dev in self._devices.items():
+            cache = dev._prop_cache  # pylint: disable=protected-access
+            total += sum(sys.getsizeof(item) for item in (
+                path, dev, vars(dev), cache, vars(cache),
+                dev.remote_device_obj, dev.remote_device_methods,
+                dev.remote_device_props))
+            values = cache._cached  # pylint: disable=protected-access
+            if values is not None:
+                total += sys.getsizeof(values)
+        return total
+
+
+class LastSeen:
+    """
+    When each device was last seen, oldest first.
+
+    Every device has the same timeout, so the order devices were last seen
+    in is the order they expire in. Marking a device as seen moves it to
+    the end, and :meth:`expired` stops at the first device that has not
+    expired. Both cost the same however many devices are tracked.
+    """
+
+    #: Default seconds without a signal before a device is lost
+    DEFAULT_TIMEOUT = 30
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        """
+        Default initialiser.
+
+        :param timeout: (optional) Seconds without a signal before a device
+            has expired
+        """
+        self.timeout = timeout
+        self._seen = OrderedDict()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, path):
+        return str(path) in self._seen
+
+    def seen(self, path, now=None):
+        """
+        Record that a signal was received from a device.
+
+        :param path: D-Bus path of the remote device
+        :param now: (optional) ``time.monotonic()`` of the signal
+        :return: True if the device was not already tracked
+        """
+        path = str(path)
+        new = self._seen.pop(path, None) is None
+        self._seen[path] = time.monotonic() if now is None else now
+        return new
+
+    def last_seen(self, path):
+        """
+        Return the ``time.monotonic()`` a device was last seen, or None.
+
+        :param path: D-Bus path of the remote device
+        """
+        return self._seen.get(str(path))
+
+    def remove(self, path):
+        """
+        Stop tracking a device.
+
+        :param path: D-Bus path of the remote device
+        :return: True if the device was tracked
+        """
+        return self._seen.pop(str(path), None) is not None
+
+    def expired(self, now=None):
+        """
+        Remove and return the devices not seen within the timeout.
+
+        :param now: (optional) ``time.monotonic()`` to compare against
+        :return: List of D-Bus paths, oldest first
+        """
+        if now is None:
+            now = time.monotonic()
+        oldest = now - self.timeout
+        expired = []
+        while self._seen:
+            path, last_seen = next(iter(self._seen.items()))
+            if last_seen > oldest:
+                break
+            self._seen.popitem(last=False)
+            expired.append(path)
+        return expired
+
+    def clear(self):
+        """Stop tracking all devices."""
+        self._seen.clear()
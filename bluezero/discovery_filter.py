@@ -0,0 +1,237 @@
+"""
+Discovery filters applied by bluetoothd, and searches applied by Bluezero.
+
+With a filter set, bluetoothd drops advertisements that do not match before
+they are sent over D-Bus, so fewer ``InterfacesAdded`` and
+``PropertiesChanged`` signals reach the application. A
+:class:`DeviceSearch` then decides which of the devices reported are wanted
+and when discovery can stop.
+
+:Example:
+
+>>> from bluezero import adapter
+>>> from bluezero import discovery_filter
+>>> dongle = adapter.Adapter()
+>>> dongle.discovery_filter = discovery_filter.DiscoveryFilter(
+...     uuids=['180f'], rssi=-80, transport='le')
+>>> dongle.set_discovery_filter(duplicate_data=False)
+>>> dongle.start_discovery()
+"""
+import dbus
+
+from bluezero import dbus_tools
+from bluezero import tools
+
+#: Values accepted for ``transport``
+TRANSPORTS = ('auto', 'bredr', 'le')
+
+# Field name, BlueZ filter key and the D-Bus type of the value
+_FIELDS = (
+    ('uuids', 'UUIDs', None),
+    ('rssi', 'RSSI', dbus.Int16),
+    ('pathloss', 'Pathloss', dbus.UInt16),
+    ('transport', 'Transport', dbus.String),
+    ('duplicate_data', 'DuplicateData', dbus.Boolean),
+    ('discoverable', 'Discoverable', dbus.Boolean),
+    ('pattern', 'Pattern', dbus.String),
+)
+#: Map of field name to the key used by ``SetDiscoveryFilter``
+FILTER_KEYS = {field: key for field, key, _ in _FIELDS}
+
+
+class DiscoveryFilter:
+    """
+    The fields of an ``org.bluez.Adapter1.SetDiscoveryFilter`` call.
+
+    Fields that are None are left out of the filter so bluetoothd uses its
+    default for them.
+    """
+
+    def __init__(self, uuids=None, rssi=None, pathloss=None, transport=None,
+                 duplicate_data=None, discoverable=None, pattern=None):
+        """
+        Default initialiser.
+
+        :param uuids: Only report devices advertising one of these service
+            UUIDs. 16, 32 and 128-bit forms are accepted. A single UUID
+            can be given as a string.
+        :param rssi: Only report devices with an RSSI at or above this value
+            in dBm (-127 to 20)
+        :param pathloss: Only report devices with a pathloss at or below
+            this value in dB (0 to 137). Can't be used with ``rssi``.
+        :param transport: One of 'auto', 'bredr' or 'le'
+        :param duplicate_data: True to report every advertisement, False to
+            report only changes
+        :param discoverable: True to only report discoverable devices
+        :param pattern: Only report devices whose address or name starts
+            with this string
+        """
+        if isinstance(uuids, str):
+            uuids = [uuids]
+        self.uuids = uuids
+        self.rssi = rssi
+        self.pathloss = pathloss
+        self.transport = transport
+        self.duplicate_data = duplicate_data
+        self.discoverable = discoverable
+        self.pattern = pattern
+        self.validate()
+
+    def __repr__(self):
+        fields = ', '.join(f'{field}={value!r}'
+                           for field, value in self.fields().items())
+        return f'DiscoveryFilter({fields})'
+
+    def __eq__(self, other):
+        if not isinstance(other, DiscoveryFilter):
+            return NotImplemented
+        return self.fields() == other.fields()
+
+    def fields(self):
+        """
+        Return the fields that are set.
+
+        :return: Dictionary of field name to value
+        """
+        return {field: getattr(self, field) for field, _, _ in _FIELDS
+                if getattr(self, field) is not None}
+
+    def keys(self):
+        """
+        Return the ``SetDiscoveryFilter`` keys of the fields that are set.
+
+        :return: Set of keys e.g. ``{'RSSI', 'Transport'}``
+        """
+        return {FILTER_KEYS[field] for field in self.fields()}
+
+    def validate(self):
+        """
+        Check the field values are ones bluetoothd accepts.
+
+        :raises ValueError: if a value is out of range or ``rssi`` and
+            ``pathloss`` are both set
+        """
+        if self.rssi is not None and self.pathloss is not None:
+            raise ValueError('rssi and pathloss can not be used together')
+        if self.rssi is not None and not -127 <= self.rssi <= 20:
+            raise ValueError(f'rssi out of range: {self.rssi}')
+        if self.pathloss is not None and not 0 <= self.pathloss <= 137:
+            raise ValueError(f'pathloss out of range: {self.pathloss}')
+        if self.transport is not None and self.transport not in TRANSPORTS:
+            raise ValueError(f'Unknown transport: {self.transport}')
+
+    def updated(self, **fields):
+        """
+        Return a copy with some fields changed.
+
+        A field given as None is removed from the filter.
+
+        :param fields: Field names and values e.g. ``rssi=-70``
+        :return: :class:`DiscoveryFilter`
+        """
+        unknown = set(fields) - set(FILTER_KEYS)
+        if unknown:
+            raise ValueError(f'Unknown discovery filter fields: '
+                             f'{", ".join(sorted(unknown))}')
+        values = self.fields()
+        values.update(fields)
+        return DiscoveryFilter(**values)
+
+    def to_dbus(self):
+        """
+        Return the filter as the argument of ``SetDiscoveryFilter``.
+
+        :return: ``dbus.Dictionary`` of filter key to value
+        """
+        filter_dict = {}
+        for field, key, dbus_type in _FIELDS:
+            value = getattr(self, field)
+            if value is None:
+                continue
+            if field == 'uuids':
+                value = dbus.Array([tools.normalize_uuid(uuid)
+                                    for uuid in value], signature='s')
+            else:
+                value = dbus_type(value)
+            filter_dict[key] = value
+        return dbus.Dictionary(filter_dict, signature='sv')
+
+
+class DeviceSearch:
+    """
+    Devices seen during discovery and the test for when to stop.
+
+    Unlike a :class:`DiscoveryFilter` this is applied by Bluezero to the
+    signals it receives. A device matches if it meets all the given terms.
+    """
+
+    def __init__(self, address=None, name=None, uuid=None, rssi=None,
+                 count=None, predicate=None):
+        """
+        Default initialiser.
+
+        :param address: (optional) Address of the device to find.
+        :param name: (optional) Name of the device to find.
+        :param uuid: (optional) Service UUID the device must advertise.
+        :param rssi: (optional) Minimum RSSI in dBm.
+        :param count: (optional) Number of matching devices to find.
+            Defaults to 1 when other search terms are given.
+        :param predicate: (optional) Function that is given a dictionary
+            of the device properties and returns True for a match.
+        """
+        self.address = address.upper() if address else None
+        self.name = name
+        self.uuid = tools.normalize_uuid(uuid) if uuid else None
+        self.rssi = rssi
+        self.predicate = predicate
+        searching = any(term is not None
+                        for term in (address, name, uuid, rssi, predicate))
+        if count is None and searching:
+            count = 1
+        self.count = count
+        # Name, UUIDs and the predicate need more than the changed values
+        self.needs_all_props = any(term is not None
+                                   for term in (name, uuid, predicate))
+        self.props = {}
+        self.matched = []
+        # A device seen by several adapters has a path for each of them
+        self._matched_addresses = set()
+
+    def matches(self, props):
+        """Return True if the device properties meet all the terms"""
+        if self.address is not None and \
+                str(props.get('Address', '')).upper() != self.address:
+            return False
+        if self.name is not None and props.get('Name') != self.name:
+            return False
+        if self.uuid is not None:
+            uuids = [str(uuid).lower() for uuid in props.get('UUIDs', [])]
+            uuids.extend(str(uuid).lower()
+                         for uuid in props.get('ServiceData', {}))
+            if self.uuid not in uuids:
+                return False
+        if self.rssi is not None and props.get('RSSI', -999) < self.rssi:
+            return False
+        if self.predicate is not None:
+            return bool(self.predicate(
+                dbus_tools.dbus_to_python(props, 'a{sv}')))
+        return True
+
+    def update(self, path, changed):
+        """
+        Merge a device signal into the properties seen.
+
+        :param path: D-Bus path of the device
+        :param changed: Dictionary of the device properties in the signal
+        :return: True when enough devices have matched
+        """
+        props = self.props.get(path)
+        if props is None:
+            props = self.props[path] = {
+                'Address': dbus_tools.get_device_address_from_dbus_path(path)}
+        props.update(changed)
+        if path not in self.matched and self.matches(props):
+            self.matched.append(path)
+            self._matched_addresses.add(str(props['Address']).upper())
+        return (self.count is not None and
+                len(self._matched_addresses) >= self.count)
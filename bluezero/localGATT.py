@@ -44,7 +44,7 @@ class Application(dbus.service.Object):
 
         """
         # Initialise the D-Bus path and register it
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
         self.path = dbus.ObjectPath(constants.BLUEZERO_DBUS_OBJECT)
         dbus.service.Object.__init__(self, self.bus, self.path)
 
@@ -113,7 +113,7 @@ class Service(dbus.service.Object):
         """
         # Setup D-Bus object paths and register service
         self.path = self.PATH_BASE + str('{0:04d}'.format(service_id))
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
         self.interface = constants.GATT_SERVICE_IFACE
         dbus.service.Object.__init__(self, self.bus, self.path)
         self.props = {
@@ -234,13 +234,13 @@ class Characteristic(dbus.service.Object):
         service_path = (f'{constants.BLUEZERO_DBUS_OBJECT}/'
                         f'service{service_id:04d}')
         self.path = f'{service_path}/char{characteristic_id:04d}'
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
         dbus.service.Object.__init__(self, self.bus, self.path)
         self.props = {
             constants.GATT_CHRC_IFACE: {
                 'UUID': uuid,
                 'Service': dbus_tools.get_dbus_obj(service_path),
-                'Value': dbus.Array(value, signature='y'),
+                'Value': dbus_tools.to_byte_array(value),
                 'Notifying': notifying,
                 'Flags': flags}
         }
@@ -254,6 +254,23 @@ class Characteristic(dbus.service.Object):
         """Return the DBus object path"""
         return dbus.ObjectPath(self.path)
 
+    @property
+    def read_callback(self):
+        """
+        Callback for a read of the value.
+
+        The callback takes no arguments or a dictionary of the read options.
+        """
+        return self._read_callback
+
+    @read_callback.setter
+    def read_callback(self, callback):
+        self._read_callback = callback
+        # Inspected once here rather than on every ReadValue
+        self._read_takes_options = (
+            callback is not None and
+            len(signature(callback).parameters) == 1)
+
     @property
     def is_notifying(self):
         """Get the current notify status"""
@@ -267,7 +284,7 @@ class Characteristic(dbus.service.Object):
         :param value: list of integers in little endian format
         """
         self.Set(constants.GATT_CHRC_IFACE, 'Value',
-                 dbus.Array(value, signature='y'))
+                 dbus_tools.to_byte_array(value))
 
     @dbus.service.method(constants.DBUS_PROP_IFACE,
                          in_signature='s',
@@ -352,17 +369,19 @@ class Characteristic(dbus.service.Object):
         :return: value
         """
         if self.read_callback:
-            if len(signature(self.read_callback).parameters) == 1:
-                value = self.read_callback(dbus_tools.dbus_to_python(options))
+            if self._read_takes_options:
+                value = self.read_callback(
+                    dbus_tools.dbus_to_python(options, 'a{sv}'))
             else:
                 value = self.read_callback()
             self.Set(constants.GATT_CHRC_IFACE, 'Value',
-                     dbus.Array(value, signature='y'))
+                     dbus_tools.to_byte_array(value))
             logger.debug('ReadValue: %s', value)
         return self.GetAll(constants.GATT_CHRC_IFACE)['Value']
 
     @dbus.service.method(constants.GATT_CHRC_IFACE,
-                         in_signature='aya{sv}', out_signature='')
+                         in_signature='aya{sv}', out_signature='',
+                         byte_arrays=True)
     def WriteValue(self, value, options):  # pylint: disable=invalid-name
         """
         DBus method for setting the characteristic value
@@ -370,8 +389,8 @@ class Characteristic(dbus.service.Object):
         :return: value
         """
         if self.write_callback:
-            self.write_callback(dbus_tools.dbus_to_python(value),
-                                dbus_tools.dbus_to_python(options))
+            self.write_callback(dbus_tools.dbus_to_python(value, 'ay'),
+                                dbus_tools.dbus_to_python(options, 'a{sv}'))
         self.Set(constants.GATT_CHRC_IFACE, 'Value', value)
 
     @dbus.service.method(constants.GATT_CHRC_IFACE,
@@ -427,7 +446,7 @@ class Descriptor(dbus.service.Object):
         char_path = (f'{constants.BLUEZERO_DBUS_OBJECT}/'
                      f'service{service_id:04d}/char{characteristic_id:04d}')
         self.path = f'{char_path}/desc{descriptor_id:04d}'
-        self.bus = dbus.SystemBus()
+        self.bus = dbus_tools.get_system_bus()
         dbus.service.Object.__init__(self, self.bus, self.path)
         self.props = {
             constants.GATT_DESC_IFACE: {
@@ -532,7 +551,8 @@ class Descriptor(dbus.service.Object):
         return self.GetAll(constants.GATT_DESC_IFACE)['Value']
 
     @dbus.service.method(constants.GATT_DESC_IFACE,
-                         in_signature='aya{sv}', out_signature='')
+                         in_signature='aya{sv}', out_signature='',
+                         byte_arrays=True)
     def WriteValue(self, value, options):  # pylint: disable=invalid-name
         """
         DBus method for setting the descriptor value
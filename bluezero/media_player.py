@@ -18,7 +18,7 @@ def _find_player_path(device_address):
     """ finds the player_path corresponding to the device addr"""
     player_path_list = []
     mngd_objs = dbus_tools.get_managed_objects()
-    for path in dbus_tools.get_managed_objects():
+    for path in mngd_objs:
         if mngd_objs[path].get(constants.MEDIA_PLAYER_IFACE):
             player_path_list.append(path)
 
@@ -15,6 +15,7 @@ http://bluetooth-mdw.blogspot.co.uk/p/bbc-microbit.html
 from time import sleep
 
 from bluezero import central
+from bluezero import device
 from bluezero import tools
 from bluezero import constants
 
@@ -159,7 +160,7 @@ class Microbit:
          adapter
         :return: Microbit Object
         """
-        for ubit in central.Central.available(adapter_address):
+        for ubit in device.available_info(adapter_address):
             if ubit.name and 'micro:bit' in ubit.name:
                 yield Microbit(device_addr=ubit.address,
                                adapter_addr=ubit.adapter)
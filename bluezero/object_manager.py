@@ -0,0 +1,346 @@
+"""
+Process-wide mirror of the BlueZ D-Bus object tree.
+
+Most lookups in :mod:`bluezero.dbus_tools` need the full BlueZ object tree.
+Without a mirror each lookup calls ``GetManagedObjects`` and with a large
+number of cached devices that moves a lot of data over the system bus.
+
+The mirror is opt-in. Once enabled it is seeded with a single
+``GetManagedObjects`` call and is then kept current from the
+``InterfacesAdded``, ``InterfacesRemoved`` and ``PropertiesChanged`` signals.
+Signals are only delivered while a GLib event loop is iterating so the mirror
+has a resync policy:
+
+- A full resync happens when the ``org.bluez`` service changes owner
+  (e.g. ``bluetoothd`` is restarted).
+- A full resync happens on the next read when a signal refers to an object
+  that is not in the mirror.
+- If ``max_age`` is given, a full resync happens on the next read once the
+  last full sync is older than ``max_age`` seconds. Use this when the event
+  loop is not always running.
+
+:Example:
+
+>>> from bluezero import object_manager
+>>> from bluezero import dbus_tools
+>>> object_manager.enable_mirror()
+>>> dbus_tools.get_dbus_path(adapter='00:01:02:03:04:05')
+'/org/bluez/hci0'
+
+"""
+import time
+
+import dbus
+
+from bluezero import constants
+from bluezero import signal_hub
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+_mirror = None
+
+#: Interfaces included in the path index and the property used as the key
+INDEXED_PROPERTIES = {
+    constants.ADAPTER_INTERFACE: 'Address',
+    constants.DEVICE_INTERFACE: 'Address',
+    constants.GATT_SERVICE_IFACE: 'UUID',
+    constants.GATT_CHRC_IFACE: 'UUID',
+    constants.GATT_DESC_IFACE: 'UUID',
+    constants.GATT_PROFILE_IFACE: 'UUIDs',
+}
+
+
+def _normalize(prop, value):
+    """Normalise an address or UUID so it can be used as an index key"""
+    if prop == 'Address':
+        return str(value).upper()
+    return tools.normalize_uuid(value)
+
+
+class PathIndex:
+    """
+    Hash index from (interface, address or UUID, parent path) to object path.
+
+    Addresses are upper-cased and UUIDs are expanded to lower case 128-bit
+    form once, when an object is added, so that resolving a path is a dict
+    lookup per level of the object tree.
+    """
+
+    def __init__(self, objects=None):
+        """
+        Default initialiser.
+
+        :param objects: (optional) Dictionary in ``GetManagedObjects`` form
+        """
+        self._by_parent = {}
+        self._by_value = {}
+        self._keys = {}
+        if objects:
+            for path, interfaces in objects.items():
+                self.add(path, interfaces)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, path, interfaces):
+        """
+        Add the indexable interfaces of an object.
+
+        :param path: D-Bus object path
+        :param interfaces: Dictionary of interface name to properties
+        """
+        path = str(path)
+        parent = path.rpartition('/')[0]
+        for iface, props in interfaces.items():
+            prop = INDEXED_PROPERTIES.get(str(iface))
+            if prop is None:
+                continue
+            values = props.get(prop)
+            if values is None and iface == constants.DEVICE_INTERFACE:
+                values = path.rpartition('/dev_')[2].replace('_', ':')
+            if values is None:
+                continue
+            if prop != 'UUIDs':
+                values = [values]
+            for value in values:
+                key = (str(iface), _normalize(prop, value))
+                self._by_parent.setdefault(key + (parent,), []).append(path)
+                self._by_value.setdefault(key, []).append(path)
+                self._keys.setdefault(path, []).append(key)
+
+    def remove(self, path, interfaces=None):
+        """
+        Remove an object, or some of its interfaces, from the index.
+
+        :param path: D-Bus object path
+        :param interfaces: (optional) Interface names. All if not given.
+        """
+        path = str(path)
+        parent = path.rpartition('/')[0]
+        keys = self._keys.get(path, [])
+        removed = [key for key in keys
+                   if interfaces is None or key[0] in interfaces]
+        for key in removed:
+            for index, index_key in ((self._by_parent, key + (parent,)),
+                                     (self._by_value, key)):
+                paths = index.get(index_key, [])
+                if path in paths:
+                    paths.remove(path)
+                if not paths:
+                    index.pop(index_key, None)
+            keys.remove(key)
+        if not keys:
+            self._keys.pop(path, None)
+
+    def lookup(self, iface, value, parent_path):
+        """
+        Find the object path with the given interface and address or UUID.
+
+        Objects that are direct children of ``parent_path`` are found with a
+        dict lookup. Deeper descendants are also found (this happens when a
+        level is skipped, e.g. a characteristic without its service).
+
+        :param iface: The interface of interest
+        :param value: Address or UUID of the object
+        :param parent_path: Path the object must be below
+        :return: Object path or None
+        """
+        if parent_path is None:
+            return None
+        key = (iface, _normalize(INDEXED_PROPERTIES[iface], value))
+        paths = self._by_parent.get(key + (parent_path,))
+        if paths:
+            return paths[0]
+        prefix = parent_path + '/'
+        for path in self._by_value.get(key, []):
+            if path.startswith(prefix):
+                return path
+        return None
+
+
+class ObjectManagerMirror:
+    """
+    Local copy of the BlueZ object tree kept current from D-Bus signals.
+
+    The ``objects`` attribute has the same layout as the return value from
+    ``GetManagedObjects`` and should be treated as read only.
+    """
+
+    def __init__(self, bus=None, max_age=None):
+        """
+        Default initialiser.
+
+        :param bus: D-Bus connection to use. System bus if not given.
+        :param max_age: (optional) Seconds after which a full resync is done.
+        """
+        if bus is None:
+            bus = dbus.SystemBus()
+        self.bus = bus
+        self.max_age = max_age
+        self.objects = {}
+        self.index = PathIndex()
+        self.last_sync = None
+        self.sync_count = 0
+        self.update_count = 0
+        self._stale = True
+        self._owner = None
+        self._receivers = []
+
+    def start(self):
+        """Subscribe to the object manager signals and seed the mirror."""
+        if self._receivers:
+            return
+        hub = signal_hub.get_hub(self.bus)
+        self._receivers = [
+            hub.subscribe(self._interfaces_added, 'InterfacesAdded',
+                          constants.DBUS_OM_IFACE),
+            hub.subscribe(self._interfaces_removed, 'InterfacesRemoved',
+                          constants.DBUS_OM_IFACE),
+            hub.subscribe(self._properties_changed, 'PropertiesChanged',
+                          dbus.PROPERTIES_IFACE, path_keyword='path'),
+            self.bus.watch_name_owner(constants.BLUEZ_SERVICE_NAME,
+                                      self._name_owner_changed),
+        ]
+        self.resync()
+
+    def stop(self):
+        """Remove the signal subscriptions and empty the mirror."""
+        for receiver in self._receivers:
+            receiver.remove()
+        self._receivers = []
+        self.objects = {}
+        self.index = PathIndex()
+        self._stale = True
+
+    def resync(self):
+        """Replace the mirror content with a fresh ``GetManagedObjects``."""
+        manager = dbus.Interface(
+            self.bus.get_object(constants.BLUEZ_SERVICE_NAME, '/',
+                                introspect=False),
+            constants.DBUS_OM_IFACE)
+        mngd_objs = manager.GetManagedObjects()
+        self.objects = {
+            str(path): {str(iface): dict(props)
+                        for iface, props in ifaces.items()}
+            for path, ifaces in mngd_objs.items()
+        }
+        self.index = PathIndex(self.objects)
+        self.last_sync = time.monotonic()
+        self.sync_count += 1
+        self._stale = False
+        logger.debug('Object mirror synced with %i objects',
+                     len(self.objects))
+
+    def invalidate(self):
+        """Force a full resync on the next read."""
+        self._stale = True
+
+    @property
+    def stale(self):
+        """Return True if the next read will trigger a full resync."""
+        if self._stale or self.last_sync is None:
+            return True
+        if self.max_age is None:
+            return False
+        return time.monotonic() - self.last_sync > self.max_age
+
+    def get_managed_objects(self):
+        """
+        Return the mirrored object tree, resyncing first if it is stale.
+
+        :return: Dictionary of the same form as ``GetManagedObjects``
+        """
+        if self.stale:
+            self.resync()
+        return self.objects
+
+    def get_index(self):
+        """
+        Return the path index, resyncing first if the mirror is stale.
+
+        :return: :class:`PathIndex` for the mirrored objects
+        """
+        if self.stale:
+            self.resync()
+        return self.index
+
+    def _interfaces_added(self, path, interfaces):
+        """Handle the InterfacesAdded signal"""
+        obj = self.objects.setdefault(str(path), {})
+        for iface, props in interfaces.items():
+            obj[str(iface)] = dict(props)
+        self.index.remove(path, interfaces)
+        self.index.add(path, interfaces)
+        self.update_count += 1
+
+    def _interfaces_removed(self, path, interfaces):
+        """Handle the InterfacesRemoved signal"""
+        path = str(path)
+        obj = self.objects.get(path)
+        if obj is None:
+            return
+        self.index.remove(path, [str(iface) for iface in interfaces])
+        for iface in interfaces:
+            obj.pop(str(iface), None)
+        if not obj:
+            del self.objects[path]
+        self.update_count += 1
+
+    def _properties_changed(self, interface, changed, invalidated, path):
+        """Handle the PropertiesChanged signal"""
+        props = self.objects.get(str(path), {}).get(str(interface))
+        if props is None:
+            logger.debug('Properties changed on unknown object %s', path)
+            self._stale = True
+            return
+        props.update(changed)
+        for prop in invalidated:
+            props.pop(str(prop), None)
+        self.update_count += 1
+
+    def _name_owner_changed(self, new_owner):
+        """Handle bluetoothd starting or stopping"""
+        if not new_owner:
+            logger.debug('BlueZ service has gone away')
+            self.objects = {}
+            self.index = PathIndex()
+            self.last_sync = time.monotonic()
+            self._stale = False
+        elif self._owner is not None:
+            logger.debug('BlueZ service owner is now %s', new_owner)
+            self._stale = True
+        self._owner = new_owner
+
+
+def enable_mirror(bus=None, max_age=None):
+    """
+    Create and start the process-wide object mirror.
+
+    If the mirror is already enabled the existing one is returned and only the
+    ``max_age`` is updated.
+
+    :param bus: D-Bus connection to use. System bus if not given.
+    :param max_age: (optional) Seconds after which a full resync is done.
+    :return: The active :class:`ObjectManagerMirror`
+    """
+    global _mirror  # pylint: disable=global-statement
+    if _mirror is None:
+        _mirror = ObjectManagerMirror(bus, max_age)
+        _mirror.start()
+    else:
+        _mirror.max_age = max_age
+    return _mirror
+
+
+def disable_mirror():
+    """Stop the process-wide object mirror if it is running."""
+    global _mirror  # pylint: disable=global-statement
+    if _mirror is not None:
+        _mirror.stop()
+        _mirror = None
+
+
+def get_mirror():
+    """Return the active :class:`ObjectManagerMirror` or None."""
+    return _mirror
@@ -172,9 +172,10 @@ class Scanner:
 
         :param bz_device_obj: Bluezero device object of discovered device
         """
-        rssi = bz_device_obj.RSSI
-        service_data = bz_device_obj.service_data
-        manufacturer_data = bz_device_obj.manufacturer_data
+        dev_props = bz_device_obj.snapshot()
+        rssi = dev_props.get('RSSI')
+        service_data = dev_props.get('ServiceData')
+        manufacturer_data = dev_props.get('ManufacturerData')
         if service_data and cls.ble_16bit_match('feaa', service_data):
             cls.process_eddystone(service_data[EDDYSTONE_SRV_UUID],
                                   rssi)
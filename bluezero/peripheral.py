@@ -26,8 +26,14 @@ class Peripheral:
         self.appearance = appearance
         self.advert = advertisement.Advertisement(1, 'peripheral')
         self.ad_manager = advertisement.AdvertisingManager(adapter_address)
+        self.dongle.add_rebind_callback(self._rebind)
         self.mainloop = async_tools.EventLoop()
 
+    def _rebind(self, dongle):
+        """Register the application and advertisement on the new adapter"""
+        self.srv_mng.rebind(dongle.path)
+        self.ad_manager.rebind(dongle.path)
+
     def add_service(self, srv_id, uuid, primary):
         """
         Add the service information required
@@ -0,0 +1,231 @@
+"""
+Property reads for BlueZ objects with a selectable freshness.
+
+Every property of a BlueZ object is normally read with its own
+``Properties.Get`` call. :class:`PropertyCache` can instead fetch all the
+properties of an interface with one ``GetAll`` call and serve reads from
+that result.
+
+Freshness modes:
+
+- ``LIVE``: every read is a ``Get`` call. This is the default and is how
+  Bluezero has always behaved.
+- ``SNAPSHOT``: reads are served from the last ``GetAll`` result. The values
+  are only updated when :meth:`PropertyCache.refresh` is called.
+- ``SIGNAL``: as ``SNAPSHOT`` but the values are also updated from the
+  ``PropertiesChanged`` signal of the object. Signals are only delivered
+  while an event loop is running. All caches in this mode for the same
+  object share one signal subscription and one set of values.
+
+:Example:
+
+>>> from bluezero import device
+>>> from bluezero import property_cache
+>>> dev = device.Device('00:01:02:03:04:05', '11:22:33:44:55:66',
+...                     freshness=property_cache.SNAPSHOT)
+>>> dev.RSSI, dev.name, dev.service_data  # One GetAll call
+"""
+import weakref
+
+from bluezero import constants
+from bluezero import dbus_tools
+from bluezero import signal_hub
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+LIVE = 'live'
+SNAPSHOT = 'snapshot'
+SIGNAL = 'signal'
+#: The valid freshness modes
+FRESHNESS_MODES = (LIVE, SNAPSHOT, SIGNAL)
+
+_REQUIRED = object()
+_subscriptions = {}
+
+
+class _Subscription:
+    """
+    PropertiesChanged subscription shared by the ``SIGNAL`` mode caches of
+    one object so they add a single match rule between them.
+    """
+
+    def __init__(self, path, interface):
+        self.key = (path, interface)
+        self.interface = interface
+        self.values = None
+        self.refs = 0
+        hub = signal_hub.get_hub(dbus_tools.get_system_bus())
+        self.receiver = hub.subscribe(self._properties_changed,
+                                      'PropertiesChanged',
+                                      constants.DBUS_PROP_IFACE,
+                                      path=path, arg0=interface)
+
+    def _properties_changed(self, interface, changed, invalidated):
+        """Apply a PropertiesChanged signal to the shared values"""
+        if interface != self.interface or self.values is None:
+            return
+        self.values.update(changed)
+        for prop in invalidated:
+            self.values.pop(str(prop), None)
+
+
+def _subscribe(path, interface):
+    """Take a reference to the subscription for an object"""
+    sub = _subscriptions.get((path, interface))
+    if sub is None:
+        sub = _Subscription(path, interface)
+        _subscriptions[sub.key] = sub
+    sub.refs += 1
+    return sub
+
+
+def _unsubscribe(sub):
+    """Drop a reference and remove the match rule with the last one"""
+    sub.refs -= 1
+    if sub.refs <= 0:
+        sub.receiver.remove()
+        if _subscriptions.get(sub.key) is sub:
+            del _subscriptions[sub.key]
+
+
+def check_mode(mode):
+    """
+    Raise ValueError if a freshness mode is not one of the known modes.
+
+    :param mode: Freshness mode to check
+    """
+    if mode not in FRESHNESS_MODES:
+        raise ValueError(f'Unknown freshness mode: {mode}')
+
+
+def subscription_count():
+    """Return the number of PropertiesChanged subscriptions in use."""
+    return len(_subscriptions)
+
+
+class PropertyCache:
+    """
+    Property values of one interface on one BlueZ object.
+    """
+
+    def __init__(self, props_iface, interface, path, mode=LIVE):
+        """
+        Default initialiser.
+
+        :param props_iface: ``org.freedesktop.DBus.Properties`` interface of
+            the object
+        :param interface: D-Bus interface the properties belong to
+        :param path: D-Bus object path
+        :param mode: One of ``LIVE``, ``SNAPSHOT`` or ``SIGNAL``
+        """
+        self.props_iface = props_iface
+        self.interface = interface
+        self.path = str(path)
+        self._values = None
+        self._sub = None
+        self._release = None
+        self._mode = LIVE
+        self.mode = mode
+
+    @property
+    def mode(self):
+        """The freshness mode used for property reads."""
+        return self._mode
+
+    @mode.setter
+    def mode(self, new_mode):
+        check_mode(new_mode)
+        if new_mode == SIGNAL and self._sub is None:
+            self._sub = _subscribe(self.path, self.interface)
+            # Drop the reference if the owner is garbage collected unclosed
+            self._release = weakref.finalize(self, _unsubscribe, self._sub)
+        elif new_mode != SIGNAL and self._sub is not None:
+            if self._sub.values is not None:
+                self._values = dict(self._sub.values)
+            self._release()
+            self._sub = None
+        if new_mode == LIVE:
+            self._values = None
+        self._mode = new_mode
+
+    @property
+    def _cached(self):
+        """The cached values or None"""
+        if self._sub is not None:
+            return self._sub.values
+        return self._values
+
+    @_cached.setter
+    def _cached(self, values):
+        if self._sub is not None:
+            self._sub.values = values
+        else:
+            self._values = values
+
+    def get(self, name, default=_REQUIRED):
+        """
+        Read a property.
+
+        :param name: Name of the property
+        :param default: (optional) Value to return if the property does not
+            exist. If not given a missing property raises the D-Bus error
+            from a ``Get`` call.
+        :return: The property value
+        """
+        if self._mode != LIVE:
+            values = self._cached
+            if values is None:
+                values = self.refresh()
+            if name in values:
+                return values[name]
+            if default is not _REQUIRED:
+                return default
+        if default is _REQUIRED:
+            return self.props_iface.Get(self.interface, name)
+        return dbus_tools.get(self.props_iface, self.interface, name, default)
+
+    def set(self, name, value):
+        """
+        Write a property and update the cached value.
+
+        :param name: Name of the property
+        :param value: New value
+        """
+        self.props_iface.Set(self.interface, name, value)
+        values = self._cached
+        if values is not None:
+            values[name] = value
+
+    def refresh(self):
+        """
+        Fetch all properties with one ``GetAll`` call.
+
+        :return: Dictionary of property names to values
+        """
+        values = dict(self.props_iface.GetAll(self.interface))
+        if self._mode != LIVE:
+            self._cached = values
+        return values
+
+    def snapshot(self):
+        """
+        Return all properties as a dictionary.
+
+        In ``LIVE`` mode this is always a fresh ``GetAll``. Otherwise it is
+        a copy of the cached values.
+
+        :return: Dictionary of property names to values
+        """
+        values = self._cached
+        if self._mode == LIVE or values is None:
+            return dict(self.refresh())
+        return dict(values)
+
+    def invalidate(self):
+        """Discard the cached values so the next read does a ``GetAll``."""
+        self._cached = None
+
+    def close(self):
+        """Remove any signal subscription and discard the cached values."""
+        self.mode = LIVE
@@ -0,0 +1,299 @@
+"""
+Recent RSSI samples of devices for presence and proximity.
+
+:attr:`bluezero.device.Device.RSSI` is only the latest value and each read
+is a D-Bus call. An :class:`RssiHistory` keeps the last samples of every
+device from the ``PropertiesChanged`` signals instead. Each device has a
+ring buffer of a fixed number of (timestamp, RSSI, TxPower) samples held in
+``array`` objects, so the memory used for a device does not grow with the
+number of signals. The number of devices is bounded in the same way as
+:class:`bluezero.device.DeviceRegistry`.
+
+The exponentially weighted moving average and a Kalman filtered RSSI are
+updated with each sample. The mean and median are worked out from the
+samples in the buffer when they are asked for. :meth:`RssiHistory.stats`
+returns them for all the devices in one call.
+
+:Example:
+
+>>> from bluezero import adapter
+>>> dongle = adapter.Adapter()
+>>> history = dongle.track_rssi(samples=16)
+>>> dongle.nearby_discovery(timeout=5)
+>>> for path, stats in history.stats().items():
+...     print(path, stats.median, stats.distance)
+"""
+from array import array
+from collections import OrderedDict
+import statistics
+import sys
+import time
+from typing import NamedTuple
+from typing import Optional
+
+#: Default number of samples kept for each device
+DEFAULT_SAMPLES = 32
+#: Default limit on the number of devices held
+DEFAULT_MAX_DEVICES = 1024
+#: RSSI in dBm at 1 metre used when a device does not send TxPower
+DEFAULT_MEASURED_POWER = -59
+#: Difference between TxPower and the RSSI at 1 metre
+TX_POWER_LOSS_1M = 41
+# Stored in place of a missing TxPower
+_NO_TX_POWER = 127
+
+
+class RssiStats(NamedTuple):
+    """Summary of the RSSI samples of one device."""
+    #: Number of samples in the buffer
+    count: int
+    #: Latest RSSI in dBm
+    latest: int
+    #: Mean RSSI of the samples in dBm
+    mean: float
+    #: Median RSSI of the samples in dBm
+    median: float
+    #: Exponentially weighted moving average of the RSSI in dBm
+    ewma: float
+    #: Kalman filtered RSSI in dBm
+    kalman: float
+    #: Estimated distance in metres from the Kalman filtered RSSI
+    distance: float
+    #: Latest TxPower sent by the device, or None
+    tx_power: Optional[int]
+
+
+def distance(rssi, tx_power=None, path_loss_exponent=2.0):
+    """
+    Estimate the distance to a device with the log-distance path loss model.
+
+    :param rssi: RSSI in dBm
+    :param tx_power: (optional) TxPower sent by the device in dBm
+    :param path_loss_exponent: (optional) 2 in free space, 2.7 to 4 indoors
+    :return: Distance in metres
+    """
+    if tx_power is None:
+        measured_power = DEFAULT_MEASURED_POWER
+    else:
+        measured_power = tx_power - TX_POWER_LOSS_1M
+    return 10 ** ((measured_power - rssi) / (10 * path_loss_exponent))
+
+
+class RssiBuffer:
+    """
+    Ring buffer of the last RSSI samples of one device.
+    """
+    __slots__ = ('times', 'rssi', 'tx_power', 'next', 'count', 'ewma',
+                 'kalman', 'kalman_error', 'alpha', 'process_noise',
+                 'measurement_noise')
+
+    def __init__(self, samples=DEFAULT_SAMPLES, alpha=0.3,
+                 process_noise=0.1, measurement_noise=4.0):
+        """
+        Default initialiser.
+
+        :param samples: (optional) Number of samples to keep
+        :param alpha: (optional) Weight of a new sample in the EWMA
+        :param process_noise: (optional) How much the real RSSI is expected
+            to change between samples, as a variance in dB
+        :param measurement_noise: (optional) Variance of the RSSI readings
+            in dB
+        """
+        self.times = array('d', bytes(8 * samples))
+        self.rssi = array('h', bytes(2 * samples))
+        self.tx_power = array('b', bytes(samples))
+        self.next = 0
+        self.count = 0
+        self.ewma = None
+        self.kalman = None
+        self.kalman_error = 1.0
+        self.alpha = alpha
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+
+    def __len__(self):
+        return self.count
+
+    def append(self, rssi, tx_power=None, now=None):
+        """
+        Add a sample, replacing the oldest if the buffer is full.
+
+        :param rssi: RSSI in dBm
+        :param tx_power: (optional) TxPower sent by the device in dBm
+        :param now: (optional) ``time.monotonic()`` of the sample
+        """
+        index = self.next
+        self.times[index] = time.monotonic() if now is None else now
+        self.rssi[index] = rssi
+        self.tx_power[index] = _NO_TX_POWER if tx_power is None else tx_power
+        self.next = (index + 1) % len(self.rssi)
+        self.count = min(self.count + 1, len(self.rssi))
+        if self.ewma is None:
+            self.ewma = float(rssi)
+            self.kalman = float(rssi)
+        else:
+            self.ewma += self.alpha * (rssi - self.ewma)
+            # One dimensional Kalman filter with a constant model
+            error = self.kalman_error + self.process_noise
+            gain = error / (error + self.measurement_noise)
+            self.kalman += gain * (rssi - self.kalman)
+            self.kalman_error = (1 - gain) * error
+
+    def _order(self):
+        """Indexes of the samples, oldest first"""
+        size = len(self.rssi)
+        start = (self.next - self.count) % size
+        return [(start + offset) % size for offset in range(self.count)]
+
+    def samples(self):
+        """
+        Return the samples in the buffer.
+
+        :return: List of (timestamp, RSSI, TxPower or None), oldest first
+        """
+        return [(self.times[index], self.rssi[index],
+                 None if self.tx_power[index] == _NO_TX_POWER
+                 else self.tx_power[index])
+                for index in self._order()]
+
+    def values(self):
+        """Return the RSSI values in the buffer, oldest first."""
+        return [self.rssi[index] for index in self._order()]
+
+    @property
+    def latest_tx_power(self):
+        """The TxPower of the latest sample, or None."""
+        if not self.count:
+            return None
+        tx_power = self.tx_power[(self.next - 1) % len(self.tx_power)]
+        return None if tx_power == _NO_TX_POWER else tx_power
+
+    def stats(self, path_loss_exponent=2.0):
+        """
+        Return a summary of the samples.
+
+        :param path_loss_exponent: (optional) Used for the distance
+        :return: :class:`RssiStats`, or None if there are no samples
+        """
+        if not self.count:
+            return None
+        values = self.values()
+        tx_power = self.latest_tx_power
+        return RssiStats(self.count, values[-1], statistics.fmean(values),
+                         statistics.median(values), self.ewma, self.kalman,
+                         distance(self.kalman, tx_power, path_loss_exponent),
+                         tx_power)
+
+
+class RssiHistory:
+    """
+    The RSSI buffers of the devices of one adapter, one per D-Bus path.
+
+    If more than ``max_devices`` are held the device that was updated the
+    longest time ago is dropped.
+    """
+
+    def __init__(self, samples=DEFAULT_SAMPLES,
+                 max_devices=DEFAULT_MAX_DEVICES, **filter_args):
+        """
+        Default initialiser.
+
+        :param samples: (optional) Number of samples kept for each device
+        :param max_devices: (optional) Number of devices to hold. No limit
+            if None.
+        :param filter_args: (optional) ``alpha``, ``process_noise`` and
+            ``measurement_noise`` for each :class:`RssiBuffer`
+        """
+        self.samples = samples
+        self.max_devices = max_devices
+        self.filter_args = filter_args
+        self._buffers = OrderedDict()
+
+    def __len__(self):
+        return len(self._buffers)
+
+    def __contains__(self, path):
+        return str(path) in self._buffers
+
+    def buffer(self, path):
+        """
+        Return the buffer of a device, or None if it has no samples.
+
+        :param path: D-Bus path of the remote device
+        """
+        return self._buffers.get(str(path))
+
+    def add(self, path, rssi, tx_power=None, now=None):
+        """
+        Add a sample for a device.
+
+        :param path: D-Bus path of the remote device
+        :param rssi: RSSI in dBm
+        :param tx_power: (optional) TxPower sent by the device in dBm
+        :param now: (optional) ``time.monotonic()`` of the sample
+        """
+        path = str(path)
+        buffer = self._buffers.get(path)
+        if buffer is None:
+            buffer = self._buffers[path] = RssiBuffer(self.samples,
+                                                      **self.filter_args)
+            if self.max_devices is not None:
+                while len(self._buffers) > self.max_devices:
+                    self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(path)
+        buffer.append(int(rssi), tx_power, now)
+
+    def update(self, path, changed):
+        """
+        Add a sample from the properties in a device signal.
+
+        Signals without an ``RSSI`` are ignored. A device only sends
+        ``TxPower`` with some advertisements so the last one is kept.
+
+        :param path: D-Bus path of the remote device
+        :param changed: Dictionary of the device properties in the signal
+        """
+        if 'RSSI' not in changed:
+            return
+        tx_power = changed.get('TxPower')
+        if tx_power is None:
+            buffer = self._buffers.get(str(path))
+            if buffer is not None:
+                tx_power = buffer.latest_tx_power
+        self.add(path, changed['RSSI'],
+                 None if tx_power is None else int(tx_power))
+
+    def remove(self, path):
+        """
+        Forget the samples of a device.
+
+        :param path: D-Bus path of the remote device
+        """
+        self._buffers.pop(str(path), None)
+
+    def clear(self):
+        """Forget the samples of all devices."""
+        self._buffers.clear()
+
+    def stats(self, path_loss_exponent=2.0):
+        """
+        Return a summary of the samples of every device.
+
+        :param path_loss_exponent: (optional) Used for the distances
+        :return: Dictionary of D-Bus path to :class:`RssiStats`
+        """
+        return {path: buffer.stats(path_loss_exponent)
+                for path, buffer in self._buffers.items()}
+
+    def memory_usage(self):
+        """
+        Approximate number of bytes held by the history.
+
+        :return: Size in bytes
+        """
+        total = sys.getsizeof(self._buffers)
+        for path, buffer in self._buffers.items():
+            total += sum(sys.getsizeof(item) for item in (
+                path, buffer, buffer.times, buffer.rssi, buffer.tx_power))
+        return total
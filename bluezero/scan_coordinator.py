@@ -0,0 +1,238 @@
+"""
+Discovery on several adapters at the same time.
+
+:meth:`bluezero.adapter.Adapter.nearby_discovery` runs the event loop for one
+adapter. Scanning each adapter of a gateway in turn takes the sum of their
+timeouts. A :class:`ScanCoordinator` starts discovery on all the adapters at
+once and handles the signals for all of them in one event loop, so a scan
+takes as long as the slowest adapter.
+
+A device seen by more than one adapter is reported once, with the adapter
+that received it with the strongest RSSI.
+
+:Example:
+
+>>> from bluezero import scan_coordinator
+>>> with scan_coordinator.ScanCoordinator() as scanner:
+...     found = scanner.scan(timeout=5, uuid='180d')
+...     for dev_info in found:
+...         print(dev_info.address, dev_info.adapter, dev_info.rssi)
+...     for stats in scanner.stats.values():
+...         print(stats)
+"""
+import time
+
+import dbus
+import dbus.exceptions
+
+from bluezero import adapter
+from bluezero import async_tools
+from bluezero import constants
+from bluezero import dbus_tools
+from bluezero import device
+from bluezero import discovery_filter
+from bluezero import signal_hub
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+
+class AdapterStats:
+    """
+    Discovery statistics for one adapter in a scan.
+    """
+    __slots__ = ('address', 'path', 'signals', 'devices', 'matched',
+                 'started', 'first_match', 'stopped')
+
+    def __init__(self, address, path):
+        """
+        Default initialiser.
+
+        :param address: Address of the adapter
+        :param path: D-Bus path of the adapter
+        """
+        self.address = address
+        self.path = path
+        #: Number of device signals received
+        self.signals = 0
+        #: Number of different devices seen
+        self.devices = 0
+        #: Number of devices that matched the search
+        self.matched = 0
+        #: ``time.monotonic()`` when discovery was started
+        self.started = None
+        #: Seconds from the start until the first match or None
+        self.first_match = None
+        #: ``time.monotonic()`` when discovery was stopped
+        self.stopped = None
+
+    def __repr__(self):
+        return (f'<AdapterStats {self.address} signals={self.signals} '
+                f'devices={self.devices} matched={self.matched} '
+                f'duration={self.duration}>')
+
+    @property
+    def duration(self):
+        """Seconds the adapter was discovering for, or None."""
+        if self.started is None or self.stopped is None:
+            return None
+        return self.stopped - self.started
+
+
+class ScanCoordinator:
+    """
+    Run discovery on several adapters in one event loop.
+    """
+
+    def __init__(self, adapter_addresses=None):
+        """
+        Default initialiser.
+
+        :param adapter_addresses: (optional) Addresses of the adapters to
+            use. All adapters are used if not given.
+        """
+        if adapter_addresses is not None:
+            adapter_addresses = [addr.upper() for addr in adapter_addresses]
+        self.adapters = {}
+        self._addresses = {}
+        for info in adapter.available_info():
+            if adapter_addresses is None or \
+                    info.address.upper() in adapter_addresses:
+                self.adapters[info.path] = info.adapter()
+                self._addresses[info.path] = info.address
+        #: Dictionary of adapter address to :class:`AdapterStats` for the
+        #: last scan
+        self.stats = {}
+        self.mainloop = async_tools.EventLoop()
+        self._search = None
+        self._stats = {}
+        self._timer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Release the adapters used by the coordinator."""
+        for dongle in self.adapters.values():
+            dongle.close()
+        self.adapters = {}
+
+    def scan(self, timeout=10, address=None, name=None, uuid=None,
+             rssi=None, count=None, predicate=None):
+        """
+        Discover nearby devices on all the adapters.
+
+        Takes the same search terms as
+        :meth:`~bluezero.adapter.Adapter.nearby_discovery`. The scan stops
+        when ``count`` different devices have matched on any adapter or
+        after ``timeout`` seconds.
+
+        :param timeout: (optional) Maximum seconds to discover for.
+        :param address: (optional) Address of the device to find.
+        :param name: (optional) Name of the device to find.
+        :param uuid: (optional) Service UUID the device must advertise.
+        :param rssi: (optional) Minimum RSSI in dBm.
+        :param count: (optional) Number of matching devices to find.
+        :param predicate: (optional) Function that is given a dictionary
+            of the device properties and returns True for a match.
+        :return: List of :class:`~bluezero.device.DeviceInfo`, one for each
+            matched device, from the adapter with the strongest RSSI
+        """
+        self._search = discovery_filter.DeviceSearch(
+            address, name, uuid, rssi, count, predicate)
+        self._stats = {path: AdapterStats(self._addresses[path], path)
+                       for path in self.adapters}
+        self.stats = {stats.address: stats for stats in self._stats.values()}
+        hub = signal_hub.get_hub(dbus_tools.get_system_bus())
+        subs = [
+            hub.subscribe(self._interfaces_added, 'InterfacesAdded',
+                          constants.DBUS_OM_IFACE),
+            hub.subscribe(self._properties_changed, 'PropertiesChanged',
+                          dbus.PROPERTIES_IFACE,
+                          arg0=constants.DEVICE_INTERFACE,
+                          path_keyword='path'),
+        ]
+        self._timer = async_tools.add_timer_ms(int(timeout * 1000),
+                                               self._timeout)
+        try:
+            for path, dongle in self.adapters.items():
+                self._stats[path].started = time.monotonic()
+                dongle.start_discovery()
+            self.mainloop.run()
+        finally:
+            for sub in subs:
+                sub.remove()
+            if self._timer is not None:
+                async_tools.remove_timer(self._timer)
+                self._timer = None
+        return self._merged()
+
+    def _merged(self):
+        """Matched devices with the strongest RSSI for each address"""
+        best = {}
+        for path in self._search.matched:
+            props = self._search.props[path]
+            dev_addr = str(props['Address']).upper()
+            current = best.get(dev_addr)
+            if current is None or \
+                    props.get('RSSI', -999) > current[1].get('RSSI', -999):
+                best[dev_addr] = (path, props)
+        return [device.DeviceInfo.from_props(
+                    path, self._addresses[path.rpartition('/')[0]], props)
+                for path, props in best.values()]
+
+    def _interfaces_added(self, path, interfaces):
+        """Handle the InterfacesAdded signal"""
+        if constants.DEVICE_INTERFACE in interfaces:
+            self._seen(str(path), interfaces[constants.DEVICE_INTERFACE])
+
+    def _properties_changed(self, interface, changed, invalidated, path):
+        """Handle the PropertiesChanged signal of a device"""
+        self._seen(str(path), changed)
+
+    def _seen(self, path, props):
+        """Update the search and statistics with a device signal"""
+        stats = self._stats.get(path.rpartition('/')[0])
+        if stats is None or stats.stopped is not None:
+            return
+        search = self._search
+        stats.signals += 1
+        if path not in search.props:
+            stats.devices += 1
+            if search.needs_all_props and 'Address' not in props:
+                # Known to BlueZ before discovery so only changes are sent
+                dongle = self.adapters[stats.path]
+                props = dict(dongle.devices.get(path).snapshot(), **props)
+        matched = len(search.matched)
+        done = search.update(path, props)
+        if len(search.matched) > matched:
+            stats.matched += 1
+            if stats.first_match is None:
+                stats.first_match = time.monotonic() - stats.started
+        if done:
+            self._stop()
+
+    def _timeout(self):
+        """Stop the scan when the timeout is reached"""
+        self._timer = None
+        self._stop()
+        return False
+
+    def _stop(self):
+        """Stop discovery on all the adapters and quit the event loop"""
+        if self._timer is not None:
+            async_tools.remove_timer(self._timer)
+            self._timer = None
+        for path, dongle in self.adapters.items():
+            stats = self._stats[path]
+            if stats.stopped is None:
+                stats.stopped = time.monotonic()
+                try:
+                    dongle.stop_discovery()
+                except dbus.exceptions.DBusException as dbus_err:
+                    logger.warning('Unable to stop discovery on %s: %s',
+                                   stats.address, dbus_err)
+        self.mainloop.quit()
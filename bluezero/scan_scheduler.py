@@ -0,0 +1,333 @@
+"""
+Share the radio of an adapter between discovery and connections.
+
+While an adapter is discovering, the controller spends part of its air time
+scanning. Connections on the same controller get fewer connection events
+and GATT transfers slow down. A :class:`ScanScheduler` discovers for a
+``window`` of seconds in every ``interval`` instead of all the time, and
+pauses discovery while GATT reads and writes on that adapter are in flight.
+Discovery is paused once for a run of transfers. It resumes at the start of
+the next window, or once no transfer has been in flight for ``holdoff``
+seconds, so a stream of reads does not stop and start the scan each time.
+
+The ``priority`` decides what happens when the two compete:
+
+- :data:`SCAN` keeps discovering during transfers.
+- :data:`CONNECTION` pauses discovery for as long as any transfer is in
+  flight, even if that skips windows.
+- :data:`BALANCED` pauses discovery for transfers, but a window that was
+  skipped completely makes the whole of the next window scan regardless.
+
+Remote GATT reads, writes and notifications made through
+:mod:`bluezero.GATT` are counted automatically. Other transfers can be
+counted with :func:`transfer` or, once they are over, with
+:func:`transfer_activity`.
+
+The windows are run by GLib timers so the event loop must be running.
+
+:Example:
+
+>>> from bluezero import adapter
+>>> from bluezero import scan_scheduler
+>>> dongle = adapter.Adapter()
+>>> scheduler = dongle.start_duty_cycle(window=1, interval=4,
+...                                     priority=scan_scheduler.BALANCED)
+>>> dongle.run()
+>>> print(scheduler.coverage)
+"""
+import collections
+import contextlib
+import time
+
+import dbus.exceptions
+
+from bluezero import async_tools
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+#: Discovery is not paused for transfers
+SCAN = 'scan'
+#: Transfers pause discovery but never for a whole window twice in a row
+BALANCED = 'balanced'
+#: Transfers pause discovery for as long as they are in flight
+CONNECTION = 'connection'
+#: Values accepted for ``priority``
+PRIORITIES = (SCAN, BALANCED, CONNECTION)
+#: Default seconds with no transfers before paused discovery resumes
+DEFAULT_HOLDOFF = 0.5
+
+# Transfers in flight and the running schedulers by adapter address
+_in_flight = collections.Counter()
+_schedulers = {}
+
+
+def transfers_in_flight(adapter_addr):
+    """
+    Return the number of GATT transfers in flight on an adapter.
+
+    :param adapter_addr: Address of the adapter
+    """
+    return _in_flight[adapter_addr.upper()]
+
+
+def transfer_started(adapter_addr):
+    """
+    Count a GATT transfer as in flight on an adapter.
+
+    Schedulers for the adapter are told when the first transfer starts.
+
+    :param adapter_addr: Address of the adapter
+    """
+    key = adapter_addr.upper()
+    _in_flight[key] += 1
+    if _in_flight[key] == 1:
+        for scheduler in tuple(_schedulers.get(key, ())):
+            scheduler._transfers_started()  # pylint: disable=protected-access
+
+
+def transfer_finished(adapter_addr):
+    """
+    Count a GATT transfer on an adapter as finished.
+
+    Schedulers for the adapter are told when the last transfer finishes.
+
+    :param adapter_addr: Address of the adapter
+    """
+    key = adapter_addr.upper()
+    if _in_flight[key] <= 0:
+        return
+    _in_flight[key] -= 1
+    if _in_flight[key] == 0:
+        del _in_flight[key]
+        for scheduler in tuple(_schedulers.get(key, ())):
+            scheduler._transfers_finished()  # pylint: disable=protected-access
+
+
+def transfer_activity(adapter_addr):
+    """
+    Count a GATT transfer that has already happened, e.g. a notification.
+
+    :param adapter_addr: Address of the adapter the transfer used
+    """
+    transfer_started(adapter_addr)
+    transfer_finished(adapter_addr)
+
+
+@contextlib.contextmanager
+def transfer(adapter_addr):
+    """
+    Context manager that counts a GATT transfer while the block runs.
+
+    :param adapter_addr: Address of the adapter the transfer uses
+    """
+    transfer_started(adapter_addr)
+    try:
+        yield
+    finally:
+        transfer_finished(adapter_addr)
+
+
+class ScanScheduler:
+    """
+    Discover in windows and pause discovery for GATT transfers.
+    """
+
+    def __init__(self, dongle, window, interval, priority=BALANCED,
+                 holdoff=DEFAULT_HOLDOFF):
+        """
+        Default initialiser.
+
+        :param dongle: :class:`~bluezero.adapter.Adapter` to discover on
+        :param window: Seconds to discover for in each interval
+        :param interval: Seconds from the start of one window to the next.
+            Discovery is continuous if it is the same as ``window``.
+        :param priority: One of :data:`SCAN`, :data:`BALANCED` or
+            :data:`CONNECTION`
+        :param holdoff: (optional) Seconds with no transfers in flight
+            before paused discovery resumes within a window
+        """
+        if not 0 < window <= interval:
+            raise ValueError(f'window must be more than 0 and no more than '
+                             f'interval: {window}, {interval}')
+        if priority not in PRIORITIES:
+            raise ValueError(f'Unknown priority: {priority}')
+        if holdoff < 0:
+            raise ValueError(f'holdoff must not be negative: {holdoff}')
+        self.dongle = dongle
+        self.window = window
+        self.interval = interval
+        self.priority = priority
+        self.holdoff = holdoff
+        self.address = dongle.address.upper()
+        #: Number of windows started
+        self.windows = 0
+        #: Number of windows with no discovery because of transfers
+        self.skipped_windows = 0
+        #: Number of times discovery was paused for transfers
+        self.pauses = 0
+        self.started = None
+        self.stopped = None
+        self._scan_time = 0.0
+        self._scan_started = None
+        self._window_open = False
+        self._window_scanned = False
+        self._starved = False
+        self._timer = None
+        self._holdoff_timer = None
+
+    def __repr__(self):
+        return (f'<ScanScheduler {self.address} window={self.window} '
+                f'interval={self.interval} priority={self.priority}>')
+
+    @property
+    def running(self):
+        """True if the scheduler has been started and not stopped."""
+        return self.started is not None and self.stopped is None
+
+    @property
+    def scanning(self):
+        """True if the scheduler has discovery running."""
+        return self._scan_started is not None
+
+    @property
+    def scan_time(self):
+        """Seconds spent discovering since the scheduler was started."""
+        scan_time = self._scan_time
+        if self._scan_started is not None:
+            scan_time += time.monotonic() - self._scan_started
+        return scan_time
+
+    @property
+    def coverage(self):
+        """
+        Fraction of the time since starting that was spent discovering.
+
+        :return: 0.0 to 1.0, or None if the scheduler has not been started
+        """
+        if self.started is None:
+            return None
+        end = self.stopped if self.stopped is not None else time.monotonic()
+        elapsed = end - self.started
+        if elapsed <= 0:
+            return 0.0
+        return min(self.scan_time / elapsed, 1.0)
+
+    def start(self):
+        """Start the first window. Has no effect if already running."""
+        if self.running:
+            return
+        self.started = time.monotonic()
+        self.stopped = None
+        _schedulers.setdefault(self.address, []).append(self)
+        self._begin_window()
+
+    def stop(self):
+        """Stop the windows and discovery. Has no effect if not running."""
+        if not self.running:
+            return
+        if self._timer is not None:
+            async_tools.remove_timer(self._timer)
+            self._timer = None
+        self._cancel_holdoff()
+        self._window_open = False
+        self._pause()
+        schedulers = _schedulers.get(self.address, [])
+        if self in schedulers:
+            schedulers.remove(self)
+        if not schedulers:
+            _schedulers.pop(self.address, None)
+        self.stopped = time.monotonic()
+
+    def _scan_allowed(self):
+        """True if discovery should run now"""
+        if not self._window_open:
+            return False
+        if self.priority == SCAN or not transfers_in_flight(self.address):
+            return True
+        return self.priority == BALANCED and self._starved
+
+    def _begin_window(self):
+        """Open a window and discover if no transfer prevents it"""
+        self._timer = None
+        self._cancel_holdoff()
+        self.windows += 1
+        self._window_open = True
+        self._window_scanned = self.scanning
+        self._resume()
+        self._timer = async_tools.add_timer_ms(int(self.window * 1000),
+                                               self._end_window)
+        return False
+
+    def _end_window(self):
+        """Close a window and wait for the next one"""
+        self._timer = None
+        if not self._window_scanned:
+            self.skipped_windows += 1
+        self._starved = self.priority == BALANCED and not self._window_scanned
+        gap = self.interval - self.window
+        if gap <= 0:
+            # Continuous discovery so only the window count changes
+            self._begin_window()
+            return False
+        self._cancel_holdoff()
+        self._window_open = False
+        self._pause()
+        self._timer = async_tools.add_timer_ms(int(gap * 1000),
+                                               self._begin_window)
+        return False
+
+    def _transfers_started(self):
+        """Pause discovery for the first transfer in flight"""
+        self._cancel_holdoff()
+        if self.scanning and not self._scan_allowed():
+            self.pauses += 1
+            self._pause()
+
+    def _transfers_finished(self):
+        """Resume discovery once transfers have been quiet for a while"""
+        self._cancel_holdoff()
+        if self.scanning or not self._scan_allowed():
+            return
+        if not self.holdoff:
+            self._resume()
+            return
+        self._holdoff_timer = async_tools.add_timer_ms(
+            int(self.holdoff * 1000), self._end_holdoff)
+
+    def _end_holdoff(self):
+        """Resume discovery after the quiet period"""
+        self._holdoff_timer = None
+        self._resume()
+        return False
+
+    def _cancel_holdoff(self):
+        """Remove the quiet period timer if it is waiting"""
+        if self._holdoff_timer is not None:
+            async_tools.remove_timer(self._holdoff_timer)
+            self._holdoff_timer = None
+
+    def _resume(self):
+        """Start discovery if it is allowed and not already running"""
+        if self.scanning or not self._scan_allowed():
+            return
+        try:
+            self.dongle.start_discovery()
+        except dbus.exceptions.DBusException as dbus_err:
+            logger.warning('Unable to start discovery on %s: %s',
+                           self.address, dbus_err)
+            return
+        self._scan_started = time.monotonic()
+        self._window_scanned = True
+
+    def _pause(self):
+        """Stop discovery if the scheduler started it"""
+        if not self.scanning:
+            return
+        self._scan_time += time.monotonic() - self._scan_started
+        self._scan_started = None
+        try:
+            self.dongle.stop_discovery()
+        except dbus.exceptions.DBusException as dbus_err:
+            logger.warning('Unable to stop discovery on %s: %s',
+                           self.address, dbus_err)
@@ -0,0 +1,162 @@
+"""
+One match rule per BlueZ signal for each D-Bus connection.
+
+Every ``add_signal_receiver`` or ``connect_to_signal`` call adds a match rule
+to the dbus-daemon, and each rule is tested against every signal on the bus.
+With an :class:`~bluezero.adapter.Adapter` adding three rules and each
+characteristic callback adding another, the rules grow with the number of
+objects created.
+
+A :class:`SignalHub` adds one match rule the first time a signal is
+subscribed to and routes each signal to its subscribers with a dictionary
+lookup on the object path and first argument. Further subscribers do not
+add match rules. The rule is removed when the last subscriber is removed.
+
+:Example:
+
+>>> from bluezero import dbus_tools
+>>> from bluezero import signal_hub
+>>> hub = signal_hub.get_hub(dbus_tools.get_system_bus())
+>>> sub = hub.subscribe(print, 'PropertiesChanged',
+...                     'org.freedesktop.DBus.Properties',
+...                     path='/org/bluez/hci0', path_keyword='path')
+>>> sub.remove()
+"""
+import functools
+
+from bluezero import constants
+from bluezero import tools
+
+logger = tools.create_module_logger(__name__)
+
+_hubs = {}
+
+
+class Subscription:
+    """
+    A callback subscribed to a signal through a :class:`SignalHub`.
+
+    Has the same ``remove`` method as the match returned by
+    ``add_signal_receiver``.
+    """
+
+    def __init__(self, hub, signal_key, route_key, callback, path_keyword):
+        self.hub = hub
+        self.signal_key = signal_key
+        self.route_key = route_key
+        self.callback = callback
+        self.path_keyword = path_keyword
+        self.active = True
+
+    def deliver(self, args, path):
+        """Call the callback with the signal arguments"""
+        if self.path_keyword:
+            self.callback(*args, **{self.path_keyword: path})
+        else:
+            self.callback(*args)
+
+    def remove(self):
+        """Stop delivering the signal to the callback."""
+        if self.active:
+            self.active = False
+            self.hub._remove(self)  # pylint: disable=protected-access
+
+
+class SignalHub:
+    """
+    Routes the BlueZ signals on one D-Bus connection to subscribers.
+    """
+
+    def __init__(self, bus):
+        """
+        Default initialiser.
+
+        :param bus: D-Bus connection the match rules are added to
+        """
+        self.bus = bus
+        self._receivers = {}
+        self._routes = {}
+
+    def subscribe(self, callback, signal_name, dbus_interface,
+                  path=None, arg0=None, path_keyword=None):
+        """
+        Call ``callback`` when BlueZ emits a signal.
+
+        The arguments have the same meaning as for ``add_signal_receiver``.
+
+        :param callback: Function called with the signal arguments
+        :param signal_name: Name of the signal e.g. 'PropertiesChanged'
+        :param dbus_interface: Interface the signal belongs to
+        :param path: (optional) Only signals from this object path
+        :param arg0: (optional) Only signals whose first argument is this
+        :param path_keyword: (optional) Keyword argument the object path is
+            passed to the callback as
+        :return: :class:`Subscription`
+        """
+        signal_key = (dbus_interface, signal_name)
+        routes = self._routes.get(signal_key)
+        if routes is None:
+            routes = self._routes[signal_key] = {}
+            self._receivers[signal_key] = self.bus.add_signal_receiver(
+                functools.partial(self._dispatch, signal_key),
+                dbus_interface=dbus_interface,
+                signal_name=signal_name,
+                bus_name=constants.BLUEZ_SERVICE_NAME,
+                path_keyword='path')
+        route_key = (None if path is None else str(path),
+                     None if arg0 is None else str(arg0))
+        sub = Subscription(self, signal_key, route_key, callback,
+                           path_keyword)
+        routes.setdefault(route_key, []).append(sub)
+        return sub
+
+    def _remove(self, sub):
+        """Remove a subscription and the match rule with the last one"""
+        routes = self._routes.get(sub.signal_key, {})
+        subs = routes.get(sub.route_key, [])
+        if sub in subs:
+            subs.remove(sub)
+        if not subs:
+            routes.pop(sub.route_key, None)
+        if not routes and sub.signal_key in self._receivers:
+            self._receivers.pop(sub.signal_key).remove()
+            del self._routes[sub.signal_key]
+
+    def _dispatch(self, signal_key, *args, path=None):
+        """Deliver a signal to the subscribers for its path and arg0"""
+        routes = self._routes.get(signal_key)
+        if not routes:
+            return
+        path = str(path)
+        arg0 = str(args[0]) if args else None
+        for route_key in ((path, arg0), (path, None),
+                          (None, arg0), (None, None)):
+            # Copied as callbacks may subscribe or unsubscribe
+            for sub in tuple(routes.get(route_key, ())):
+                try:
+                    sub.deliver(args, path)
+                except Exception:  # pylint: disable=broad-except
+                    logger.exception('Error in %s callback for %s',
+                                     signal_key[1], path)
+
+    def match_rule_count(self):
+        """Return the number of match rules added to the connection."""
+        return len(self._receivers)
+
+    def subscriber_count(self):
+        """Return the number of active subscriptions."""
+        return sum(len(subs) for routes in self._routes.values()
+                   for subs in routes.values())
+
+
+def get_hub(bus):
+    """
+    Return the signal hub for a D-Bus connection, creating it if needed.
+
+    :param bus: D-Bus connection
+    :return: :class:`SignalHub`
+    """
+    hub = _hubs.get(bus)
+    if hub is None:
+        hub = _hubs[bus] = SignalHub(bus)
+    return hub
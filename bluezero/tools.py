@@ -149,6 +149,26 @@ def url_to_advert(url, frame_type, tx_power):
     return service_data
 
 
+def normalize_uuid(uuid_in):
+    """
+    Return a UUID in the lower case 128-bit string format used by BlueZ.
+
+    16-bit and 32-bit UUIDs (e.g. '180F' or '0x180f') are expanded using the
+    Bluetooth Base UUID.
+
+    :param uuid_in: UUID as a string
+    :return: 128-bit UUID string e.g. '0000180f-0000-1000-8000-00805f9b34fb'
+    """
+    uuid_str = str(uuid_in).lower()
+    if uuid_str.startswith('0x'):
+        uuid_str = uuid_str[2:]
+    if len(uuid_str) == 4:
+        uuid_str = '0000' + uuid_str
+    if len(uuid_str) == 8:
+        uuid_str += '-0000-1000-8000-00805f9b34fb'
+    return uuid_str
+
+
 def get_fn_parameters(fn):
     """ return the number of input parameters of the fn , None on error"""
     param_len = len(inspect.getfullargspec(fn).args)
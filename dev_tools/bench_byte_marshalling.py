@@ -0,0 +1,64 @@
+"""
+Measure the cost of putting a byte payload into a D-Bus message.
+
+Compares the ways Bluezero has built ``ay`` values. Messages are built
+with ``dbus.lowlevel`` so no bus is needed, only ``dbus-python``. Run with:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_byte_marshalling --size 244
+"""
+import argparse
+import time
+
+import dbus
+import dbus.lowlevel
+
+from bluezero import constants
+from bluezero import dbus_tools
+
+
+def byte_per_element(payload):
+    """How ``bytes_to_dbusarray`` used to build the value"""
+    return dbus.Array([dbus.Byte(elem) for elem in payload], 'y')
+
+
+def array_of_ints(payload):
+    """How ``localGATT.Characteristic.set_value`` used to build the value"""
+    return dbus.Array(payload, signature='y')
+
+
+def write_value_message(value):
+    """Build the message for a ``WriteValue`` call"""
+    msg = dbus.lowlevel.MethodCallMessage(
+        constants.BLUEZ_SERVICE_NAME,
+        '/org/bluez/hci0/dev_11_22_33_44_55_66/service0001/char0002',
+        constants.GATT_CHRC_IFACE, 'WriteValue')
+    msg.append(value, dbus.Dictionary({}, signature='sv'),
+               signature='aya{sv}')
+    return msg
+
+
+def run(size, count):
+    payload = bytes(range(256)) * (size // 256) + bytes(range(size % 256))
+    methods = {
+        'dbus.Byte per element': byte_per_element,
+        'dbus.Array of int': array_of_ints,
+        'to_byte_array': dbus_tools.to_byte_array,
+    }
+    print(f'{count} messages of {size} bytes')
+    for name, build in methods.items():
+        start = time.perf_counter()
+        for _ in range(count):
+            write_value_message(build(payload))
+        duration = time.perf_counter() - start
+        print(f'{name:24} {count / duration:12.0f} msg/s '
+              f'{size * count / duration / 1e6:8.2f} MB/s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=244)
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+    run(args.size, args.count)
@@ -0,0 +1,95 @@
+"""
+Benchmark the dispatch of ``on_connect`` and ``on_disconnect`` callbacks.
+
+Compares inspecting the callback signature on every ``Connected`` signal,
+as ``Adapter._properties_changed`` used to, with the dispatcher built when
+the callback is assigned. The handler is timed on its own and with a flood
+of ``Connected`` toggles from the ``bluez_scan`` dbusmock template. Run
+with:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_callback_dispatch --signals 2000
+"""
+import argparse
+import time
+import timeit
+
+import dbus
+
+from dev_tools.bluez_mock import MockBluez
+
+ADAPTER_ADDR = '00:01:02:03:04:05'
+DEVICE_ADDR = 'C0:FF:EE:00:00:00'
+DEVICE_PATH = '/org/bluez/hci0/dev_C0_FF_EE_00_00_00'
+
+
+def inspect_each_call(callback):
+    """The dispatch as it was before the callbacks were precomputed"""
+    from bluezero import tools
+
+    def dispatch(adapter_addr, device_addr):
+        if tools.get_fn_parameters(callback) == 0:
+            callback()
+        elif tools.get_fn_parameters(callback) == 1:
+            callback(device_addr)
+        elif tools.get_fn_parameters(callback) == 2:
+            callback(adapter_addr, device_addr)
+    return dispatch
+
+
+def flood(bluez, dongle, count):
+    """Emit ``count`` Connected toggles and time their dispatch"""
+    from bluezero import async_tools
+    from bluezero import constants
+
+    for index in range(count):
+        bluez.emit_properties_changed(
+            DEVICE_PATH, constants.DEVICE_INTERFACE,
+            {'Connected': dbus.Boolean(index % 2 == 0)})
+    start = time.perf_counter()
+    async_tools.run_pending_events()
+    return time.perf_counter() - start
+
+
+def run(signal_count, repeat):
+    from bluezero import adapter
+    from bluezero import constants
+
+    events = []
+
+    def on_change(adapter_addr, device_addr):
+        events.append(device_addr)
+
+    with MockBluez() as bluez:
+        bluez.add_adapter()
+        bluez.add_devices(1)
+        dongle = adapter.Adapter(ADAPTER_ADDR)
+        dongle.on_connect = on_change
+        dongle.on_disconnect = on_change
+        precomputed = (dongle._connect_cb, dongle._disconnect_cb)
+        inspected = (inspect_each_call(on_change),
+                     inspect_each_call(on_change))
+
+        def handler():
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'Connected': True}, [], DEVICE_PATH)
+
+        print(f'{"dispatch":12} {"handler us":>12} {"flood ms":>12} '
+              f'{"delivered":>10}')
+        for name, callbacks in (('inspect', inspected),
+                                ('precomputed', precomputed)):
+            dongle._connect_cb, dongle._disconnect_cb = callbacks
+            handler_time = timeit.timeit(handler, number=repeat) / repeat
+            events.clear()
+            flood_time = flood(bluez, dongle, signal_count)
+            print(f'{name:12} {handler_time * 1e6:12.2f} '
+                  f'{flood_time * 1e3:12.2f} {len(events):10}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--signals', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=10000)
+    args = parser.parse_args()
+    run(args.signals, args.repeat)
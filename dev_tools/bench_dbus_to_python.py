@@ -0,0 +1,106 @@
+"""
+Benchmark ``dbus_tools.dbus_to_python`` on representative payloads.
+
+Compares the previous ``isinstance`` chain with the type table and with
+the converters built from a signature. Needs ``dbus-python`` but not a
+running bus. Run with:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_dbus_to_python --repeat 20000
+"""
+import argparse
+import timeit
+
+import dbus
+
+from bluezero import dbus_tools
+
+
+def isinstance_chain(data):
+    """The converter as it was before the type table"""
+    if isinstance(data, dbus.String):
+        data = str(data)
+    elif isinstance(data, dbus.Boolean):
+        data = bool(data)
+    elif isinstance(data, dbus.Byte):
+        data = int(data)
+    elif isinstance(data, dbus.UInt16):
+        data = int(data)
+    elif isinstance(data, dbus.UInt32):
+        data = int(data)
+    elif isinstance(data, dbus.Int64):
+        data = int(data)
+    elif isinstance(data, dbus.Double):
+        data = float(data)
+    elif isinstance(data, dbus.ObjectPath):
+        data = str(data)
+    elif isinstance(data, dbus.Array):
+        if data.signature == dbus.Signature('y'):
+            data = bytearray(data)
+        else:
+            data = [isinstance_chain(value) for value in data]
+    elif isinstance(data, dbus.Dictionary):
+        new_data = dict()
+        for key in data:
+            new_data[isinstance_chain(key)] = isinstance_chain(data[key])
+        data = new_data
+    return data
+
+
+def payloads():
+    """Values as dbus-python delivers them to Bluezero"""
+    write_value = dbus.Array([dbus.Byte(i % 256) for i in range(512)],
+                             signature='y')
+    options = dbus.Dictionary({
+        dbus.String('device'): dbus.ObjectPath(
+            '/org/bluez/hci0/dev_67_63_13_0D_37_01', variant_level=1),
+        dbus.String('link'): dbus.String('LE', variant_level=1),
+        dbus.String('mtu'): dbus.UInt16(517, variant_level=1),
+        dbus.String('offset'): dbus.UInt16(0, variant_level=1),
+    }, signature='sv')
+    mfg_data = dbus.Dictionary({
+        dbus.UInt16(0x004c): dbus.Array(
+            [dbus.Byte(i) for i in range(23)], signature='y',
+            variant_level=1),
+    }, signature='qv')
+    device_props = dbus.Dictionary({
+        dbus.String('Address'): dbus.String('11:22:33:44:55:66',
+                                            variant_level=1),
+        dbus.String('Name'): dbus.String('sensor', variant_level=1),
+        dbus.String('RSSI'): dbus.Int16(-60, variant_level=1),
+        dbus.String('Connected'): dbus.Boolean(False, variant_level=1),
+        dbus.String('UUIDs'): dbus.Array(
+            [dbus.String('0000180f-0000-1000-8000-00805f9b34fb')] * 8,
+            signature='s', variant_level=1),
+        dbus.String('ManufacturerData'): mfg_data,
+    }, signature='sv')
+    return {
+        'WriteValue ay (512 bytes)': (write_value, 'ay'),
+        'options a{sv}': (options, 'a{sv}'),
+        'ManufacturerData a{qv}': (mfg_data, 'a{qv}'),
+        'Device1 properties a{sv}': (device_props, 'a{sv}'),
+    }
+
+
+def run(repeat):
+    print(f'Mean of {repeat} calls in microseconds')
+    print(f'{"payload":28} {"isinstance":>12} {"table":>12} '
+          f'{"signature":>12}')
+    for name, (data, signature) in payloads().items():
+        results = [
+            timeit.timeit(lambda: isinstance_chain(data), number=repeat),
+            timeit.timeit(lambda: dbus_tools.dbus_to_python(data),
+                          number=repeat),
+            timeit.timeit(lambda: dbus_tools.dbus_to_python(data, signature),
+                          number=repeat),
+        ]
+        print(f'{name:28}' + ''.join(f' {duration / repeat * 1e6:12.2f}'
+                                     for duration in results))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=20000)
+    args = parser.parse_args()
+    run(args.repeat)
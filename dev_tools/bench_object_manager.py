@@ -0,0 +1,52 @@
+"""
+Benchmark ``dbus_tools`` lookups with and without the object mirror.
+
+Uses the ``bluez_scan`` dbusmock template populated with thousands of
+devices. Run with:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_object_manager --devices 2000
+"""
+import argparse
+
+from dev_tools.bluez_mock import MockBluez, timed
+
+
+def run(device_count, repeat):
+    from bluezero import dbus_tools
+    from bluezero import object_manager
+
+    with MockBluez() as bluez:
+        bluez.add_adapter()
+        addresses = bluez.add_devices(device_count)
+        target = addresses[-1]
+
+        def lookup():
+            dbus_tools.get_dbus_path(adapter='00:01:02:03:04:05',
+                                     device=target)
+
+        def names():
+            dbus_tools.get_device_addresses('no-such-name')
+
+        results = {}
+        results['get_dbus_path (GetManagedObjects)'] = timed(lookup, repeat)
+        results['get_device_addresses (GetManagedObjects)'] = timed(
+            names, repeat)
+        seed_time = timed(object_manager.enable_mirror)
+        results['mirror seed'] = seed_time
+        results['get_dbus_path (mirror)'] = timed(lookup, repeat)
+        results['get_device_addresses (mirror)'] = timed(names, repeat)
+        object_manager.disable_mirror()
+
+    print(f'{device_count} devices, mean of {repeat} calls')
+    for name, duration in results.items():
+        print(f'{name:45} {duration * 1000:10.3f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--devices', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    run(args.devices, args.repeat)
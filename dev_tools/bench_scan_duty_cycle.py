@@ -0,0 +1,165 @@
+"""
+Simulate scan coverage against connection throughput for duty cycles.
+
+A mocked radio can't show the air time discovery takes from a connection,
+so the benchmark uses a simple model on top of the ``bluez_scan`` dbusmock
+template. The scheduler makes real ``StartDiscovery`` and ``StopDiscovery``
+calls to the mock. A workload starts a GATT transfer of a fixed size every
+``--period`` seconds. Transfers move data at ``--rate`` bytes per second,
+reduced by ``--penalty`` while the adapter is discovering, so a transfer
+that overlaps discovery stays in flight for longer.
+
+For each policy the fraction of time spent discovering (coverage) is
+reported with the mean throughput of the transfers. Run with:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_scan_duty_cycle --duration 10
+"""
+import argparse
+import time
+
+from gi.repository import GLib
+
+from dev_tools.bluez_mock import MockBluez
+
+ADAPTER_ADDR = '00:01:02:03:04:05'
+TICK_MS = 10
+
+
+class Workload:
+    """GATT transfers whose speed depends on the adapter discovering"""
+
+    def __init__(self, scan_scheduler, is_scanning, rate, penalty, size):
+        self.scan_scheduler = scan_scheduler
+        self.is_scanning = is_scanning
+        self.rate = rate
+        self.penalty = penalty
+        self.size = size
+        self.remaining = []
+        self.completed = 0
+        self.busy_time = 0.0
+        self.moved = 0.0
+
+    def start_transfer(self):
+        self.scan_scheduler.transfer_started(ADAPTER_ADDR)
+        self.remaining.append(self.size)
+        return True
+
+    def tick(self):
+        if not self.remaining:
+            return True
+        dt = TICK_MS / 1000
+        rate = self.rate * (1 - self.penalty if self.is_scanning() else 1)
+        self.busy_time += dt
+        self.moved += rate * dt
+        self.remaining[0] -= rate * dt
+        if self.remaining[0] <= 0:
+            self.remaining.pop(0)
+            self.completed += 1
+            self.scan_scheduler.transfer_finished(ADAPTER_ADDR)
+        return True
+
+    @property
+    def throughput(self):
+        if not self.busy_time:
+            return 0.0
+        return self.moved / self.busy_time
+
+
+def run_policy(dongle, policy, args):
+    """Run the workload for one policy and print the results"""
+    from bluezero import scan_scheduler
+
+    name, window, interval, priority = policy
+    scheduler = None
+    if priority == 'continuous':
+        dongle.start_discovery()
+
+        def is_scanning():
+            return True
+    elif priority is not None:
+        scheduler = dongle.start_duty_cycle(window, interval, priority,
+                                            args.holdoff)
+
+        def is_scanning():
+            return scheduler.scanning
+    else:
+        def is_scanning():
+            return False
+
+    workload = Workload(scan_scheduler, is_scanning, args.rate,
+                        args.penalty, args.size)
+    loop = GLib.MainLoop()
+    sources = [
+        GLib.timeout_add(TICK_MS, workload.tick),
+        GLib.timeout_add(int(args.period * 1000), workload.start_transfer),
+    ]
+    GLib.timeout_add(int(args.duration * 1000), loop.quit)
+    start = time.monotonic()
+    loop.run()
+    elapsed = time.monotonic() - start
+    for source in sources:
+        GLib.source_remove(source)
+    for _ in workload.remaining:
+        scan_scheduler.transfer_finished(ADAPTER_ADDR)
+
+    if scheduler is not None:
+        dongle.stop_duty_cycle()
+        coverage = scheduler.coverage
+        pauses, skipped = scheduler.pauses, scheduler.skipped_windows
+    else:
+        if priority == 'continuous':
+            dongle.stop_discovery()
+        coverage = 1.0 if priority else 0.0
+        pauses = skipped = 0
+    print(f'{name:24} {coverage * 100:9.1f} '
+          f'{workload.throughput / 1000:12.1f} '
+          f'{workload.completed / elapsed:10.2f} {pauses:7} {skipped:8}')
+
+
+def run(args):
+    from bluezero import adapter
+    from bluezero import scan_scheduler
+
+    policies = [
+        ('no discovery', None, None, None),
+        ('continuous', None, None, 'continuous'),
+        ('scan 25%', args.window, args.window * 4, scan_scheduler.SCAN),
+        ('balanced 25%', args.window, args.window * 4,
+         scan_scheduler.BALANCED),
+        ('connection 25%', args.window, args.window * 4,
+         scan_scheduler.CONNECTION),
+        ('balanced 50%', args.window, args.window * 2,
+         scan_scheduler.BALANCED),
+        ('connection 50%', args.window, args.window * 2,
+         scan_scheduler.CONNECTION),
+    ]
+    with MockBluez() as bluez:
+        bluez.add_adapter()
+        bluez.add_devices(5)
+        with adapter.Adapter(ADAPTER_ADDR) as dongle:
+            print(f'{"policy":24} {"coverage%":>9} {"kB/s busy":>12} '
+                  f'{"xfers/s":>10} {"pauses":>7} {"skipped":>8}')
+            for policy in policies:
+                run_policy(dongle, policy, args)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=10,
+                        help='Seconds to run each policy for')
+    parser.add_argument('--window', type=float, default=0.2,
+                        help='Scan window in seconds')
+    parser.add_argument('--holdoff', type=float, default=0.5,
+                        help='Seconds with no transfers before discovery '
+                             'resumes')
+    parser.add_argument('--period', type=float, default=0.5,
+                        help='Seconds between transfers starting')
+    parser.add_argument('--size', type=float, default=20000,
+                        help='Bytes in each transfer')
+    parser.add_argument('--rate', type=float, default=100000,
+                        help='Bytes per second with no discovery')
+    parser.add_argument('--penalty', type=float, default=0.5,
+                        help='Fraction of the rate lost while discovering')
+    run(parser.parse_args())
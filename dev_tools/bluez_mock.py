@@ -0,0 +1,89 @@
+"""
+Helpers for running benchmarks against the ``bluez_scan`` dbusmock template.
+
+The benchmarks in ``dev_tools`` are not part of the test suite. They are run
+by hand to measure the effect of a change, e.g.:
+
+.. code-block::
+
+    python3 -m dev_tools.bench_object_manager
+
+"""
+from pathlib import Path
+import subprocess
+import time
+
+import dbus
+import dbusmock
+
+here = Path(__file__).parent.parent
+template = str(here.joinpath('tests', 'dbusmock_templates', 'bluez_scan.py'))
+
+
+class MockBluez:
+    """
+    Start a private system bus with a mocked bluetoothd on it.
+
+    Use as a context manager so the bus and the mock are always stopped.
+    """
+
+    def __init__(self):
+        self.p_mock = None
+        self.obj_bluez = None
+        self.bluez_mock = None
+
+    def __enter__(self):
+        dbusmock.DBusTestCase.start_system_bus()
+        dbusmock.DBusTestCase.get_dbus(True)
+        (self.p_mock, self.obj_bluez) = \
+            dbusmock.DBusTestCase.spawn_server_template(
+                template, {}, stdout=subprocess.DEVNULL)
+        self.bluez_mock = dbus.Interface(self.obj_bluez, 'org.bluez.Mock')
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.p_mock.terminate()
+        self.p_mock.wait()
+        dbusmock.DBusTestCase.stop_dbus(
+            dbusmock.DBusTestCase.system_bus_pid)
+
+    def add_adapter(self, device_name='hci0', system_name='bench'):
+        """Add an adapter to the mocked bluetoothd"""
+        return self.bluez_mock.AddAdapter(device_name, system_name)
+
+    def add_devices(self, count, adapter_name='hci0'):
+        """
+        Add ``count`` advertising devices to the given adapter.
+
+        :return: List of the device addresses added
+        """
+        addresses = []
+        for index in range(count):
+            address = 'C0:FF:EE:{:02X}:{:02X}:{:02X}'.format(
+                (index >> 16) & 0xff, (index >> 8) & 0xff, index & 0xff)
+            self.bluez_mock.AddBeacon(adapter_name, address,
+                                      dbus.UInt16(0),
+                                      dbus.Array([], signature='y'),
+                                      '', dbus.Byte(0))
+            addresses.append(address)
+        return addresses
+
+    def emit_properties_changed(self, path, interface, changed):
+        """
+        Emit ``PropertiesChanged`` from a mocked object without changing the
+        stored property values.
+        """
+        obj = dbus.SystemBus().get_object('org.bluez', path)
+        dbus.Interface(obj, dbusmock.MOCK_IFACE).EmitSignal(
+            dbus.PROPERTIES_IFACE, 'PropertiesChanged', 'sa{sv}as',
+            [interface, changed, dbus.Array([], signature='s')])
+
+
+def timed(func, repeat=1):
+    """
+    Call ``func`` repeatedly and return the mean duration in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
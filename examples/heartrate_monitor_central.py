@@ -2,8 +2,8 @@
 from enum import IntEnum
 import struct
 
-from bluezero import adapter
 from bluezero import central
+from bluezero import scan_coordinator
 
 # Documentation can be found on Bluetooth.com
 # https://www.bluetooth.com/specifications/specs/heart-rate-service-1-0/
@@ -62,24 +62,18 @@ def scan_for_heartrate_monitors(
     :return: generator of Devices that match the search parameters
     """
     # If there are multiple adapters on your system, this will scan using
-    # all dongles unless an adapter is specified through its MAC address
-    for dongle in adapter.Adapter.available():
-        # Filter dongles by adapter_address if specified
-        if adapter_address and adapter_address.upper() != dongle.address():
-            continue
-
-        # Actually listen to nearby advertisements for timeout seconds
-        dongle.nearby_discovery(timeout=timeout)
-
-        # Iterate through discovered devices
-        for dev in central.Central.available(dongle.address):
-            # Filter devices if we specified a HRM address
-            if hrm_address and hrm_address == dev.address:
-                yield dev
-
-            # Otherwise, return devices that advertised the HRM Service UUID
-            if HRM_SRV.lower() in dev.uuids:
-                yield dev
+    # all dongles at the same time unless an adapter is specified through
+    # its MAC address
+    adapters = [adapter_address] if adapter_address else None
+    with scan_coordinator.ScanCoordinator(adapters) as scanner:
+        # Listen to nearby advertisements until a monitor is found or
+        # timeout seconds have passed
+        if hrm_address:
+            found = scanner.scan(timeout=timeout, address=hrm_address)
+        else:
+            found = scanner.scan(timeout=timeout, uuid=HRM_SRV)
+    for dev_info in found:
+        yield dev_info.device()
 
 
 def on_new_heart_rate_measurement(iface, changed_props, invalidated_props):
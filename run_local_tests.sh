@@ -21,6 +21,24 @@ coverage run --append -m unittest -v tests.test_gatt
 test1007=$?
 coverage run --append -m unittest -v tests.test_dbus_tools_mock
 test1008=$?
+coverage run --append -m unittest -v tests.test_object_manager
+test1009=$?
+coverage run --append -m unittest -v tests.test_property_cache
+test1010=$?
+coverage run --append -m unittest -v tests.test_capabilities
+test1011=$?
+coverage run --append -m unittest -v tests.test_signal_hub
+test1012=$?
+coverage run --append -m unittest -v tests.test_discovery_filter
+test1014=$?
+coverage run --append -m unittest -v tests.test_scan_coordinator
+test1015=$?
+coverage run --append -m unittest -v tests.test_scan_scheduler
+test1016=$?
+coverage run --append -m unittest -v tests.test_rssi_history
+test1017=$?
+coverage run --append -m unittest -v tests.test_connection_manager
+test1018=$?
 coverage run --append -m unittest -v tests.test_broadcaster
 test101=$?
 coverage run --append -m unittest -v tests.test_central
@@ -50,6 +68,8 @@ coverage run --append -m unittest -v tests.test_microbit_uart_db_mock
 test_example7=$?
 coverage run --append -m unittest -v tests.test_peripheral_db_mock
 test_example8=$?
+coverage run --append -m unittest -v tests.test_lifecycle_db_mock
+test1013=$?
 
 
 pycodestyle -v bluezero
@@ -64,7 +84,10 @@ coverage html
 echo file://`pwd`/htmlcov/index.html
 # google-chrome `pwd`/htmlcov/index.html &
 group100=$((test1001 + test1002 + test1003 + test1004 + test1005 + \
-            test1006 + test1007 + test1008))
+            test1006 + test1007 + test1008 + test1009 + \
+            test1010 + test1011 + test1012 + test1013 + \
+            test1014 + test1015 + test1016 + test1017 + \
+            test1018))
 group10=$((test101 + test102 + test103))
 group1=$((test11 + test12 + test13))
 group_examples=$((test_example1 + test_example2 + test_example3 + test_example4 + \
@@ -267,6 +267,349 @@ class TestBluezeroAdapter(unittest.TestCase):
         dongle.nearby_discovery()
         self.assertEqual(dongle.discovering, 1)
 
+    def test_properties_changed_cached_address(self):
+        """
+        Test ``Connected`` signals are dispatched without fetching the
+        object tree each time.
+        """
+        dongle = self.module_under_test.Adapter()
+        connected = []
+
+        def on_connect(adapter_addr, device_addr):
+            connected.append((adapter_addr, device_addr))
+
+        dongle.on_connect = on_connect
+        dev_path = '/org/bluez/hci0/dev_E4_43_33_7E_54_1C'
+        dbus_iface = self.module_under_test.dbus_tools.dbus.Interface
+        dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'Connected': True}, [], dev_path)
+        fetches = dbus_iface.return_value.GetManagedObjects.call_count
+        for _ in range(10):
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'Connected': True}, [], dev_path)
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'RSSI': -40}, [], dev_path)
+        self.assertEqual(
+            fetches, dbus_iface.return_value.GetManagedObjects.call_count)
+        self.assertEqual(11, len(connected))
+        self.assertEqual(('00:00:00:00:5A:AD', 'E4:43:33:7E:54:1C'),
+                         connected[0])
+        # Paths not under a known adapter are not dispatched
+        dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'Connected': True}, [],
+                                   '/org/bluez/hci9/dev_E4_43_33_7E_54_1C')
+        self.assertEqual(11, len(connected))
+
+    def test_callback_dispatch_precomputed(self):
+        """
+        Test callbacks are inspected when assigned, not on every signal.
+        """
+        dongle = self.module_under_test.Adapter()
+        events = []
+        dongle.on_connect = lambda: events.append('connect')
+        dongle.on_disconnect = lambda dev: events.append(type(dev).__name__)
+        dev_path = '/org/bluez/hci0/dev_E4_43_33_7E_54_1C'
+        with patch.object(self.module_under_test.tools,
+                          'get_fn_parameters') as get_params:
+            for connected in (True, False, True):
+                dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                           {'Connected': connected}, [],
+                                           dev_path)
+            get_params.assert_not_called()
+        self.assertEqual(['connect', 'Device', 'connect'], events)
+        dongle.on_connect = None
+        self.assertIsNone(dongle.on_connect)
+        dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'Connected': True}, [], dev_path)
+        self.assertEqual(3, len(events))
+
+    def test_disconnect_other_adapter(self):
+        """
+        Test a device of another adapter is given with its own path.
+        """
+        dongle = self.module_under_test.Adapter()
+        disconnected = []
+        dongle.on_disconnect = lambda dev: disconnected.append(dev)
+        dev_path = '/org/bluez/hci1/dev_E4_43_33_7E_54_1C'
+        with patch.object(self.module_under_test.dbus_tools,
+                          'get_adapter_address_from_dbus_path',
+                          return_value='00:00:00:00:5A:AE'):
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'Connected': False}, [], dev_path)
+        self.assertEqual(dev_path, disconnected[0].remote_device_path)
+        self.assertNotIn(dev_path, dongle.devices)
+        self.assertEqual(0, len(dongle.devices))
+
+    def test_device_registry(self):
+        """
+        Test signals for the same path give the same Device until the
+        device is removed.
+        """
+        dongle = self.module_under_test.Adapter()
+        found = []
+        dongle.on_device_found = found.append
+        dev_path = '/org/bluez/hci0/dev_E4_43_33_7E_54_1C'
+        dev_info = {constants.DEVICE_INTERFACE: {
+            'Address': 'E4:43:33:7E:54:1C', 'Connected': False}}
+        dongle._interfaces_added(dev_path, dev_info)
+        dongle._interfaces_added(dev_path, dev_info)
+        self.assertIs(found[0], found[1])
+        self.assertIn(dev_path, dongle.devices)
+        dongle._interfaces_removed(dev_path, [constants.DEVICE_INTERFACE])
+        self.assertNotIn(dev_path, dongle.devices)
+        dongle._interfaces_added(dev_path, dev_info)
+        self.assertIsNot(found[0], found[2])
+
+    def test_nearby_discovery_stops(self):
+        """
+        Test discovery stops on the signal that finds the device.
+        """
+        dongle = self.module_under_test.Adapter()
+        dongle.mainloop = MagicMock()
+        dongle.adapter_methods.StopDiscovery.reset_mock()
+        other = '/org/bluez/hci0/dev_11_22_33_44_55_66'
+        target = '/org/bluez/hci0/dev_E4_43_33_7E_54_1C'
+
+        def signals():
+            dongle._interfaces_added(other, {constants.DEVICE_INTERFACE: {
+                'Address': '11:22:33:44:55:66', 'RSSI': -90}})
+            dongle.mainloop.quit.assert_not_called()
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'RSSI': -40}, [], path=target)
+            dongle.mainloop.quit.assert_called_once()
+
+        dongle.mainloop.run.side_effect = signals
+        found = dongle.nearby_discovery(address='e4:43:33:7e:54:1c')
+        self.assertListEqual([target],
+                             [dev.remote_device_path for dev in found])
+        dongle.adapter_methods.StopDiscovery.assert_called_once()
+        self.assertIs(found[0], dongle.devices.get(target))
+
+    def test_nearby_discovery_timeout(self):
+        """
+        Test discovery without enough matches runs until the timeout.
+        """
+        dongle = self.module_under_test.Adapter()
+        dongle.mainloop = MagicMock()
+        paths = [f'/org/bluez/hci0/dev_11_22_33_44_55_6{index}'
+                 for index in range(3)]
+
+        def signals():
+            for index, path in enumerate(paths):
+                dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                           {'RSSI': -40 - index * 20}, [],
+                                           path=path)
+            dongle.mainloop.quit.assert_not_called()
+            dongle._nearby_timeout()
+            dongle.mainloop.quit.assert_called_once()
+
+        dongle.mainloop.run.side_effect = signals
+        found = dongle.nearby_discovery(rssi=-70, count=3)
+        self.assertListEqual(paths[:2],
+                             [dev.remote_device_path for dev in found])
+        dongle.mainloop.quit.reset_mock()
+        self.assertEqual(3, len(dongle.nearby_discovery()))
+
+    def test_discovery_filter(self):
+        """
+        Test discovery filter fields are merged rather than replaced.
+        """
+        dongle = self.module_under_test.Adapter()
+        set_filter = dongle.adapter_methods.SetDiscoveryFilter
+        set_filter.reset_mock()
+        dongle.show_duplicates()
+        dongle.set_discovery_filter(rssi=-70, transport='le')
+        self.assertDictEqual(
+            {'duplicate_data': True, 'rssi': -70, 'transport': 'le'},
+            dongle.discovery_filter.fields())
+        dongle.hide_duplicates()
+        self.assertEqual(False, dongle.discovery_filter.duplicate_data)
+        self.assertEqual(3, set_filter.call_count)
+        dongle.clear_discovery_filter()
+        self.assertDictEqual({}, dongle.discovery_filter.fields())
+
+    def test_unsupported_discovery_filter(self):
+        """
+        Test filters bluetoothd does not report are refused.
+        """
+        dongle = self.module_under_test.Adapter()
+        get_filters = dongle.adapter_methods.GetDiscoveryFilters
+        get_filters.reset_mock()
+        get_filters.return_value = ['UUIDs', 'RSSI', 'Transport']
+        dongle.set_discovery_filter(rssi=-70)
+        self.assertRaises(ValueError, dongle.set_discovery_filter,
+                          pattern='micro')
+        self.assertEqual(-70, dongle.discovery_filter.rssi)
+        get_filters.assert_called_once()
+
+    def test_available_info(self):
+        """
+        Test adapters are listed from one fetch of the object tree.
+        """
+        dbus_tools = self.module_under_test.dbus_tools
+        with patch.object(dbus_tools, 'get_managed_objects',
+                          return_value=tests.obj_data.full_ubits) as get_objs:
+            infos = list(self.module_under_test.available_info())
+            self.assertEqual(['00:00:00:00:5A:AD'],
+                             self.module_under_test.list_adapters())
+            self.assertEqual(2, get_objs.call_count)
+            self.assertEqual(self.path, infos[0].path)
+            self.assertEqual(self.adapter_name, infos[0].name)
+            dongle = infos[0].adapter()
+            self.assertEqual(self.path, dongle.path)
+            self.assertEqual(2, get_objs.call_count)
+            dongle.close()
+
+    def test_close(self):
+        """
+        Test closing adapters removes their signal subscriptions.
+        """
+        from bluezero import signal_hub
+        hub = signal_hub.get_hub(
+            self.module_under_test.dbus_tools.get_system_bus())
+        subscribers = hub.subscriber_count()
+        with self.module_under_test.Adapter() as dongle:
+            dongles = [self.module_under_test.Adapter() for _ in range(10)]
+            self.assertEqual(subscribers + 33, hub.subscriber_count())
+            self.assertEqual(3, hub.match_rule_count())
+            for other in dongles:
+                other.close()
+            self.assertEqual(subscribers + 3, hub.subscriber_count())
+        self.assertEqual(subscribers, hub.subscriber_count())
+        dongle.close()
+        self.assertEqual(subscribers, hub.subscriber_count())
+
+        # A nearby_discovery timer left running is removed
+        dongle = self.module_under_test.Adapter()
+        dongle._nearby = MagicMock()
+        dongle._nearby_timer = 7
+        with patch.object(self.module_under_test.async_tools,
+                          'remove_timer') as remove_timer:
+            dongle.close()
+        remove_timer.assert_called_once_with(7)
+        self.assertIsNone(dongle._nearby)
+        self.assertIsNone(dongle._nearby_timer)
+
+    def test_device_lost(self):
+        """
+        Test devices are lost when not seen or removed, unless connected.
+        """
+        dongle = self.module_under_test.Adapter()
+        paths = [f'/org/bluez/hci0/dev_00_00_00_00_00_0{index}'
+                 for index in range(3)]
+        lost = []
+        updated = []
+
+        def on_lost(dev):
+            lost.append(dev.remote_device_path)
+
+        def on_updated(dev, changed):
+            updated.append(dev.remote_device_path)
+
+        dongle.on_device_lost = on_lost
+        dongle.on_device_updated = on_updated
+        dongle._interfaces_added(paths[0], {
+            constants.DEVICE_INTERFACE: {'Address': '00:00:00:00:00:00'}})
+        dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'RSSI': -60}, [], paths[1])
+        dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'Connected': True}, [], paths[2])
+        self.assertListEqual(paths[1:], updated)
+        dongle._age_devices()
+        self.assertListEqual([], lost)
+        dongle.device_lost_timeout = 0
+        dongle._interfaces_removed(paths[1], [constants.DEVICE_INTERFACE])
+        self.assertListEqual(paths[1:2], lost)
+        self.assertTrue(dongle._age_devices())
+        self.assertListEqual([paths[1], paths[0]], lost)
+        self.assertIn(paths[2], dongle._last_seen)
+        dongle.close()
+        self.assertEqual(0, len(dongle._last_seen))
+
+    def test_device_updated_error(self):
+        """
+        Test an error in on_device_updated does not stop other callbacks.
+        """
+        dongle = self.module_under_test.Adapter()
+        connected = []
+
+        def on_updated(dev, changed):
+            raise RuntimeError('callback failed')
+
+        dongle.on_device_updated = on_updated
+        dongle.on_connect = lambda dev: connected.append(dev)
+        with self.assertLogs('bluezero.adapter', 'ERROR'):
+            dongle._properties_changed(
+                constants.DEVICE_INTERFACE, {'Connected': True}, [],
+                '/org/bluez/hci0/dev_E4_43_33_7E_54_1C')
+        self.assertEqual(1, len(connected))
+
+    def test_track_rssi(self):
+        """
+        Test RSSI samples are kept from the device signals.
+        """
+        dongle = self.module_under_test.Adapter()
+        path = '/org/bluez/hci0/dev_00_00_00_00_00_01'
+        history = dongle.track_rssi(samples=4)
+        for rssi in (-60, -62, -64):
+            dongle._properties_changed(constants.DEVICE_INTERFACE,
+                                       {'RSSI': rssi}, [], path)
+        self.assertListEqual([-60, -62, -64], history.buffer(path).values())
+        dongle._interfaces_removed(path, [constants.DEVICE_INTERFACE])
+        self.assertNotIn(path, history)
+
+    def test_rebind(self):
+        """
+        Test an adapter that is replugged at a new path is rebound.
+        """
+        dongle = self.module_under_test.Adapter()
+        dongle.powered = True
+        dongle.set_discovery_filter(rssi=-70)
+        dongle.start_discovery()
+        rebound = []
+        dongle.add_rebind_callback(rebound.append)
+        dongle._interfaces_removed('/org/bluez/hci0',
+                                   [constants.ADAPTER_INTERFACE])
+        self.assertFalse(dongle.present)
+        methods = dongle.adapter_methods
+        methods.reset_mock()
+        dongle._interfaces_added('/org/bluez/hci1', {
+            constants.ADAPTER_INTERFACE: {'Address': '11:22:33:44:55:66'}})
+        self.assertEqual('/org/bluez/hci0', dongle.path)
+        dongle._interfaces_added('/org/bluez/hci1', {
+            constants.ADAPTER_INTERFACE: {'Address': '00:00:00:00:5A:AD'}})
+        self.assertTrue(dongle.present)
+        self.assertEqual('/org/bluez/hci1', dongle.path)
+        self.assertListEqual([dongle], rebound)
+        methods.SetDiscoveryFilter.assert_called_once()
+        methods.StartDiscovery.assert_called_once_with()
+        self.assertTrue(dongle.devices.owns('/org/bluez/hci1/dev_00'))
+        dongle._interfaces_removed('/org/bluez/hci1',
+                                   [constants.ADAPTER_INTERFACE])
+
+    def test_duty_cycle(self):
+        """
+        Test the duty cycle discovers in windows and stops on close.
+        """
+        dongle = self.module_under_test.Adapter()
+        methods = dongle.adapter_methods
+        methods.reset_mock()
+        scheduler = dongle.start_duty_cycle(1, 4)
+        self.assertIs(scheduler, dongle.duty_cycle)
+        methods.StartDiscovery.assert_called_once_with()
+        for _ in range(5):
+            with self.module_under_test.scan_scheduler.transfer(
+                    dongle.address):
+                methods.StopDiscovery.assert_called_once_with()
+        # Resumed once after the hold-off, not after every transfer
+        methods.StartDiscovery.assert_called_once_with()
+        scheduler._end_holdoff()
+        self.assertEqual(2, methods.StartDiscovery.call_count)
+        dongle.close()
+        self.assertEqual(2, methods.StopDiscovery.call_count)
+        self.assertIsNone(dongle.duty_cycle)
+        self.assertFalse(scheduler.running)
+
 
 if __name__ == '__main__':
     # avoid writing to stderr
@@ -0,0 +1,121 @@
+"""Tests for finding the features of the BlueZ daemon."""
+import copy
+import os
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import mock_open
+from unittest.mock import patch
+import tests.obj_data
+from bluezero import constants
+
+
+class TestCapabilities(unittest.TestCase):
+    """
+    Check capabilities are found from D-Bus and only probed once.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.mngd_objs = copy.deepcopy(tests.obj_data.full_ubits)
+        adapter = self.mngd_objs['/org/bluez/hci0']
+        adapter[constants.LE_ADVERTISING_MANAGER_IFACE] = {
+            'SupportedFeatures': ['CanSetTxPower', 'HardwareOffload'],
+            'SupportedIncludes': ['tx-power', 'appearance', 'local-name'],
+            'SupportedInstances': 5}
+        adapter[constants.ADV_MONITOR_MANAGER_IFACE] = {
+            'SupportedMonitorTypes': ['or_patterns']}
+        self.get_managed_objects = MagicMock(return_value=self.mngd_objs)
+        self.dbus_mock.Interface.return_value.GetManagedObjects = \
+            self.get_managed_objects
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import capabilities
+        self.module_under_test = capabilities
+        self.bus = capabilities.dbus_tools.get_system_bus()
+        self.bus.call_blocking.return_value = os.getpid()
+        self.bus.call_blocking.side_effect = None
+        capabilities.reset()
+
+    def tearDown(self):
+        self.module_under_test.reset()
+        self.module_patcher.stop()
+
+    def test_probed_once(self):
+        caps = self.module_under_test.probe()
+        self.assertIs(caps, self.module_under_test.probe())
+        self.assertIs(caps, self.module_under_test.probe('/org/bluez/hci0'))
+        self.assertEqual(1, self.get_managed_objects.call_count)
+        self.assertEqual('/org/bluez/hci0', caps.adapter_path)
+
+    def test_features(self):
+        caps = self.module_under_test.probe()
+        self.assertTrue(caps.le_advertising)
+        self.assertTrue(caps.gatt_server)
+        self.assertTrue(caps.advertisement_monitor)
+        self.assertTrue(caps.supports_adv_feature('CanSetTxPower'))
+        self.assertFalse(caps.supports_adv_feature('CanSetTxPowerLevel'))
+        self.assertIn('tx-power', caps.adv_includes)
+        self.assertEqual(5, caps.adv_instances)
+        self.assertTrue(caps.has_interface('org.bluez.Media1'))
+
+    def test_not_experimental(self):
+        caps = self.module_under_test.probe()
+        self.assertIs(False, caps.experimental)
+
+    def test_experimental_cmdline(self):
+        cmdline = b'/usr/libexec/bluetooth/bluetoothd\0--experimental\0'
+        with patch('builtins.open', mock_open(read_data=cmdline)):
+            caps = self.module_under_test.probe()
+        self.assertIs(True, caps.experimental)
+
+    def test_experimental_flags(self):
+        has_flag = self.module_under_test._has_experimental_flag
+        self.assertTrue(has_flag([b'-nE']))
+        self.assertTrue(has_flag([b'-n', b'--experimental']))
+        self.assertTrue(has_flag([b'-p', b'a2dp', b'-E']))
+        self.assertFalse(has_flag([b'-p', b'-E']))
+        self.assertFalse(has_flag([b'-fE']))
+        self.assertFalse(has_flag([b'-n', b'--', b'-E']))
+        self.assertFalse(has_flag([b'-nd']))
+
+    def test_experimental_unknown(self):
+        self.bus.call_blocking.side_effect = OSError('No such process')
+        caps = self.module_under_test.probe()
+        self.assertIsNone(caps.experimental)
+        self.module_under_test.reset()
+        self.mngd_objs['/org/bluez/hci0'][constants.ADAPTER_INTERFACE][
+            'ExperimentalFeatures'] = ['d4992530-b9ec-469f-ab01-6c481c47da1c']
+        caps = self.module_under_test.probe()
+        self.assertIs(True, caps.experimental)
+
+    def test_version_cached(self):
+        with patch.object(self.module_under_test.dbus_tools, 'bluez_version',
+                          return_value='5.66') as version:
+            caps = self.module_under_test.probe()
+            self.assertEqual('5.66', caps.version)
+            self.assertEqual('5.66', caps.version)
+            version.assert_called_once()
+
+    def test_version_failed(self):
+        error = self.module_under_test.subprocess.CalledProcessError(
+            1, ['bluetoothctl', '-v'])
+        with patch.object(self.module_under_test.dbus_tools, 'bluez_version',
+                          side_effect=error):
+            caps = self.module_under_test.probe()
+            self.assertIsNone(caps.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -63,3 +63,72 @@ class TestBluezeroCentral(unittest.TestCase):
         # Test for the UUID
         self.assertEqual(test_central.connected, True)
 
+    def test_reconnect(self):
+        """Test reconnecting and restoring notifications."""
+        test_central = self.module_under_test.Central(adapter_addr=self.adapter_addr,
+                                                      device_addr=self.device_addr)
+        moved = MagicMock(object_path='/old', notify_wanted=True)
+        same = MagicMock(object_path='/same', notify_wanted=False)
+        test_central._characteristics = [moved, same]
+        timers = []
+        with patch.object(self.module_under_test.signal_hub, 'get_hub') as get_hub, \
+                patch.object(self.module_under_test.async_tools, 'add_timer_ms',
+                             side_effect=lambda ms, cb: timers.append((ms, cb)) or len(timers)), \
+                patch.object(self.module_under_test.async_tools, 'remove_timer') as remove_timer, \
+                patch.object(self.module_under_test.dbus_tools, 'get_path_index') as get_index, \
+                patch.object(self.module_under_test.dbus_tools, 'get_dbus_path',
+                             side_effect=['/new', '/same']) as get_path, \
+                patch.object(test_central.rmt_device, 'connect_async') as connect_async:
+            test_central.enable_reconnect(backoff=1, max_backoff=4, jitter=0)
+            changed = get_hub.return_value.subscribe.call_args[0][0]
+            test_central.on_reconnect = MagicMock()
+
+            # A failed attempt doubles the backoff
+            changed('org.bluez.Device1', {'Connected': False}, [])
+            self.assertEqual(1000, timers[-1][0])
+            self.assertFalse(timers[-1][1]())
+            call = connect_async.return_value
+            done = call.add_done_callback.call_args[0][0]
+            call.cancelled.return_value = False
+            call.exception.return_value = RuntimeError('failed')
+            done(call)
+            self.assertEqual(2000, timers[-1][0])
+
+            # A disconnect while an attempt is in flight is left to it
+            self.assertFalse(timers[-1][1]())
+            changed('org.bluez.Device1', {'Connected': False}, [])
+            self.assertEqual(2, len(timers))
+            call.exception.return_value = None
+            with patch.object(type(test_central.rmt_device), 'services_resolved', False):
+                done(call)
+
+            # The link drops again before the services are resolved
+            changed('org.bluez.Device1', {'Connected': False}, [])
+            self.assertEqual(4000, timers[-1][0])
+            self.assertFalse(timers[-1][1]())
+            with patch.object(type(test_central.rmt_device), 'services_resolved', False):
+                done(call)
+
+            # Once resolved only the moved characteristic is resolved again
+            changed('org.bluez.Device1', {'ServicesResolved': True}, [])
+            get_index.assert_called_once_with()
+            for call_args in get_path.call_args_list:
+                self.assertIs(get_index.return_value, call_args[1]['index'])
+            moved.resolve_gatt.assert_called_once_with()
+            moved.start_notify.assert_called_once_with()
+            same.resolve_gatt.assert_not_called()
+            same.start_notify.assert_not_called()
+            test_central.on_reconnect.assert_called_once_with(test_central)
+            self.assertEqual(3, test_central.reconnect_stats.attempts)
+            self.assertEqual(1, test_central.reconnect_stats.reconnects)
+            self.assertGreaterEqual(test_central.reconnect_stats.max, 0)
+
+            # No reconnect after disconnect() is called
+            test_central.disconnect()
+            changed('org.bluez.Device1', {'Connected': False}, [])
+            self.assertEqual(3, len(timers))
+            test_central.disable_reconnect()
+            get_hub.return_value.subscribe.return_value.remove.assert_called_once_with()
+            remove_timer.assert_not_called()
+            call.cancel.assert_not_called()
+
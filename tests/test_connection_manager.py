@@ -0,0 +1,191 @@
+"""Tests for running connection workflows on many devices."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+ADDRESSES = [f'11:22:33:44:55:0{index}' for index in range(5)]
+
+
+class TestConnectionManager(unittest.TestCase):
+    """
+    Check the connection limit, retries and latencies.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module, the GLib timers and the signal hub
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.exceptions': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import connection_manager
+        self.module_under_test = connection_manager
+        self.timers = []
+
+        def add_timer_ms(time, callback):
+            self.timers.append((time, callback))
+            return len(self.timers)
+
+        self.hub = MagicMock()
+        self.patchers = [
+            patch.object(connection_manager.async_tools, 'add_timer_ms',
+                         side_effect=add_timer_ms),
+            patch.object(connection_manager.async_tools, 'remove_timer'),
+            patch.object(connection_manager.signal_hub, 'get_hub',
+                         return_value=self.hub),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.devices = {}
+        self.dongle = MagicMock()
+        self.dongle.devices.path_for.side_effect = lambda addr: addr
+        self.dongle.devices.get.side_effect = self._device
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        self.module_patcher.stop()
+
+    def _device(self, path, address):
+        """A device whose calls are completed by the test"""
+        if address not in self.devices:
+            dev = MagicMock(remote_device_path=path, services_resolved=False)
+            dev.calls = []
+
+            def call(name):
+                def start(**kwargs):
+                    pending = self.module_under_test.async_tools.PendingCall(
+                        name)
+                    dev.calls.append(pending)
+                    return pending
+                return start
+
+            dev.connect_async.side_effect = call('connect')
+            dev.disconnect_async.side_effect = call('disconnect')
+            self.devices[address] = dev
+        return self.devices[address]
+
+    def _resolve(self, address):
+        """Send ServicesResolved for a device"""
+        for call_args in self.hub.subscribe.call_args_list:
+            if call_args[1]['path'] == address:
+                call_args[0][0]('org.bluez.Device1',
+                                {'ServicesResolved': True}, [])
+
+    def _manager(self, work, **kwargs):
+        manager = self.module_under_test.ConnectionManager(
+            self.dongle, work, **kwargs)
+        manager.add(ADDRESSES)
+        return manager
+
+    def test_bounded_concurrency(self):
+        worked = []
+
+        def work(job):
+            worked.append(job.address)
+
+        manager = self._manager(work, max_connections=2)
+
+        def loop():
+            self.assertEqual(2, len(self.devices))
+            for address in ADDRESSES:
+                dev = self.devices[address]
+                dev.calls[-1].reply_handler()
+                self._resolve(address)
+                dev.calls[-1].reply_handler()
+
+        self.dongle.run.side_effect = loop
+        jobs = manager.run()
+        self.assertListEqual(ADDRESSES, worked)
+        self.assertTrue(all(job.state == job.DONE for job in jobs))
+        self.assertListEqual(list(self.module_under_test.STAGES),
+                             list(jobs[0].latencies))
+        stats = manager.stage_stats()
+        self.assertEqual(5, stats['resolve'][0])
+        self.dongle.quit.assert_called_once_with()
+
+    def test_retry(self):
+        manager = self.module_under_test.ConnectionManager(
+            self.dongle, MagicMock(), retries=1, backoff=2)
+        manager.add(ADDRESSES[0])
+        failed = []
+        manager.on_job_done = failed.append
+
+        def loop():
+            dev = self.devices[ADDRESSES[0]]
+            dev.calls[-1].error_handler(RuntimeError('no connection'))
+            self.assertEqual((2000, ), self.timers[-1][:1])
+            self.assertFalse(self.timers[-1][1]())
+            dev.calls[-1].reply_handler()
+            self.timers[-1][1]()
+
+        self.dongle.run.side_effect = loop
+        job, = manager.run()
+        self.assertEqual(job.FAILED, job.state)
+        self.assertEqual(2, job.attempts)
+        self.assertEqual('resolve', job.stage)
+        self.assertIsInstance(job.error, TimeoutError)
+        self.assertListEqual([job], failed)
+
+    def test_work_pending_call(self):
+        calls = []
+
+        def work(job):
+            call = self.module_under_test.async_tools.PendingCall('notify')
+            calls.append(call)
+            return call
+
+        manager = self._manager(work, max_connections=1)
+        manager._running = True
+        manager._pump()
+        dev = self.devices[ADDRESSES[0]]
+        dev.calls[-1].reply_handler()
+        self._resolve(ADDRESSES[0])
+        self.assertEqual(1, len(dev.calls))
+        calls[0].reply_handler()
+        self.assertEqual(2, len(dev.calls))
+        dev.calls[-1].reply_handler()
+        self.assertIn(ADDRESSES[1], self.devices)
+
+    def test_work_cancelled(self):
+        calls = []
+
+        def work(job):
+            call = self.module_under_test.async_tools.PendingCall('notify')
+            calls.append(call)
+            return call
+
+        manager = self.module_under_test.ConnectionManager(self.dongle, work)
+        manager.add(ADDRESSES[0])
+
+        def loop():
+            dev = self.devices[ADDRESSES[0]]
+            dev.calls[-1].reply_handler()
+            self._resolve(ADDRESSES[0])
+            self.assertTrue(calls[0].cancel())
+            dev.calls[-1].reply_handler()
+
+        self.dongle.run.side_effect = loop
+        job, = manager.run()
+        self.assertEqual(job.FAILED, job.state)
+        self.assertEqual('work', job.stage)
+        self.assertEqual(1, job.attempts)
+        self.assertEqual(0, manager.pending())
+        self.assertEqual(['connect', 'disconnect'],
+                         [call.name for call in
+                          self.devices[ADDRESSES[0]].calls])
+        self.dongle.quit.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,15 @@ import tests.obj_data
 from bluezero import constants
 
 
+class FakeProxy:
+    """Stand-in for a dbus proxy object that can be garbage collected"""
+    def __init__(self, bus_name, object_path, introspect=True):
+        self.bus_name = bus_name
+        self.object_path = object_path
+        self.introspect = introspect
+        self._introspect_method_map = {}
+
+
 class TestDbusModuleCalls(unittest.TestCase):
     """
     Testing things that use the Dbus module
@@ -111,6 +120,20 @@ class TestDbusModuleCalls(unittest.TestCase):
                         test_data[i][0]
                     ))
 
+    def test_get_adapter_address_from_dbus_path(self):
+        self.module_under_test._adapter_addresses.clear()
+        self.assertEqual(
+            '00:00:00:00:5A:AD',
+            self.module_under_test.get_adapter_address_from_dbus_path(
+                '/org/bluez/hci0/dev_EB_F6_95_27_84_A0'))
+        self.assertIsNone(
+            self.module_under_test.get_adapter_address_from_dbus_path(
+                '/org/bluez'))
+        self.assertIsNone(
+            self.module_under_test.get_adapter_address_from_dbus_path(
+                '/org/bluez/hci9/dev_EB_F6_95_27_84_A0'))
+        self.module_under_test._adapter_addresses.clear()
+
     def test_mac_addr_deprecated(self):
         with patch('logging.Logger.warning') as logger:
             self.module_under_test.get_mac_addr_from_dbus_path(
@@ -126,6 +149,73 @@ class TestDbusModuleCalls(unittest.TestCase):
         self.assertTrue(isinstance(result, list))
         self.assertDictEqual(expected[0], result[0])
 
+    def test_proxy_reuse(self):
+        bus = self.module_under_test.get_system_bus()
+        bus.get_object.side_effect = FakeProxy
+        dev_path = '/org/bluez/hci0/dev_EB_F6_95_27_84_A0'
+        proxy1 = self.module_under_test.get_dbus_obj(dev_path)
+        proxy2 = self.module_under_test.get_dbus_obj(dev_path)
+        self.assertIs(proxy1, proxy2)
+        self.assertIsNot(proxy1,
+                         self.module_under_test.get_dbus_obj('/org/bluez/hci0'))
+        iface1 = self.module_under_test.get_dbus_iface(
+            constants.DEVICE_INTERFACE, proxy1)
+        iface2 = self.module_under_test.get_dbus_iface(
+            constants.DEVICE_INTERFACE, proxy2)
+        self.assertIs(iface1, iface2)
+        bus.get_object.side_effect = None
+
+    def test_proxy_eviction(self):
+        bus = self.module_under_test.get_system_bus()
+        bus.get_object.side_effect = FakeProxy
+        created = self.module_under_test.proxy_stats['created']
+        self.module_under_test.get_dbus_obj('/org/bluez/hci1')
+        self.module_under_test.get_dbus_obj('/org/bluez/hci1')
+        self.assertEqual(created + 2,
+                         self.module_under_test.proxy_stats['created'])
+        bus.get_object.side_effect = None
+
+    def test_proxy_signatures(self):
+        bus = self.module_under_test.get_system_bus()
+        bus.get_object.side_effect = FakeProxy
+        proxy = self.module_under_test.get_dbus_obj(
+            '/org/bluez/hci0/dev_EB_F6_95_27_84_A0/service0031/char0035')
+        self.assertFalse(proxy.introspect)
+        self.assertEqual(
+            'aya{sv}',
+            proxy._introspect_method_map[
+                'org.bluez.GattCharacteristic1.WriteValue'])
+        self.assertEqual(
+            'ssv',
+            proxy._introspect_method_map[
+                'org.freedesktop.DBus.Properties.Set'])
+        bus.get_object.side_effect = None
+
+    def test_dbus_to_python_signature(self):
+        convert = self.module_under_test.dbus_to_python
+        self.assertEqual(bytearray(b'Baz'), convert([66, 97, 122], 'ay'))
+        self.assertDictEqual({'mtu': 512, 'link': 'LE'},
+                             convert({'mtu': 512, 'link': 'LE'}, 'a{sv}'))
+        self.assertDictEqual({76: bytearray(b'\x02\x15')},
+                             convert({76: [2, 21]}, 'a{qay}'))
+        self.assertEqual([('a', 1), ('b', 2)],
+                         convert([['a', 1], ['b', 2]], 'a(sq)'))
+        self.assertEqual(['x', 'y'], convert(['x', 'y'], 'as'))
+
+    def test_dbus_to_python_bad_signature(self):
+        convert = self.module_under_test.dbus_to_python
+        self.assertRaises(ValueError, convert, {}, 'a{sv')
+        self.assertRaises(ValueError, convert, 1, 'ii')
+        self.assertRaises(ValueError, convert, 1, 'z')
+
+    def test_to_byte_array(self):
+        byte_array = self.module_under_test.dbus.ByteArray
+        byte_array.reset_mock()
+        payload = memoryview(bytes(range(244)))
+        result = self.module_under_test.to_byte_array(payload)
+        byte_array.assert_called_once_with(payload)
+        self.assertIs(byte_array.return_value, result)
+
 
 if __name__ == '__main__':
     unittest.main()
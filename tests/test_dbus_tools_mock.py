@@ -1,3 +1,4 @@
+import array
 import dbus
 import dbusmock
 import io
@@ -135,6 +136,38 @@ class TestAdapterExample(dbusmock.DBusTestCase):
         result = dbus_tools.dbus_to_python(data)
         self.assertEqual(b'\x1d', result)
 
+    def test_dbus_int16_uint64(self):
+        self.assertEqual(-3, dbus_tools.dbus_to_python(dbus.Int16(-3)))
+        result = dbus_tools.dbus_to_python(dbus.UInt64(2**40))
+        self.assertIs(type(result), int)
+
+    def test_dbus_signature(self):
+        result = dbus_tools.dbus_to_python(dbus.Signature('a{sv}'))
+        self.assertIs(type(result), str)
+
+    def test_dbus_struct(self):
+        result = dbus_tools.dbus_to_python(
+            dbus.Struct((dbus.String('LE'), dbus.UInt16(23))))
+        self.assertEqual(('LE', 23), result)
+
+    def test_dbus_dict_signature(self):
+        data = dbus.Dictionary(
+            {dbus.UInt16(0x004c): dbus.Array([dbus.Byte(2), dbus.Byte(21)],
+                                             signature='y',
+                                             variant_level=1)},
+            signature='qv')
+        self.assertDictEqual({0x004c: b'\x02\x15'},
+                             dbus_tools.dbus_to_python(data, 'a{qv}'))
+
+    def test_to_byte_array(self):
+        for payload in (b'\x01\x02\xff', bytearray(b'\x01\x02\xff'),
+                        memoryview(b'\x01\x02\xff'),
+                        array.array('B', [1, 2, 255]), [1, 2, 255]):
+            result = dbus_tools.to_byte_array(payload)
+            self.assertIs(type(result), dbus.ByteArray)
+            self.assertEqual(b'\x01\x02\xff', result)
+        self.assertIs(result, dbus_tools.to_byte_array(result))
+
     def test_str_to_dbusarray(self):
         expected = dbus.Array([dbus.Byte(70), dbus.Byte(111), dbus.Byte(120)],
                               signature=dbus.Signature('y'))
@@ -1,3 +1,5 @@
+import asyncio
+import gc
 import sys
 import unittest
 from unittest.mock import MagicMock
@@ -155,6 +157,163 @@ class TestBluezeroDevice(unittest.TestCase):
     def test_adverting_flags(self):
         pass
 
+    def test_device_path(self):
+        get_objs = self.dbus_mock.Interface.return_value.GetManagedObjects
+        get_objs.reset_mock()
+        ble_dev = self.module_under_test.Device(
+            self.adapter_addr, self.device_addr, device_path=self.path)
+        get_objs.assert_not_called()
+        self.assertEqual(ble_dev.remote_device_path, self.path)
+
+    def _async_calls(self, ble_dev):
+        """Method names and arguments of the asynchronous D-Bus calls"""
+        return [(call_args[0][3], call_args[0][5], call_args[1]['timeout'])
+                for call_args in ble_dev.bus.call_async.call_args_list]
+
+    def test_connect_async(self):
+        ble_dev = self.module_under_test.Device(self.adapter_addr,
+                                                self.device_addr)
+        ble_dev.bus.call_async.reset_mock()
+        replies = []
+        call = ble_dev.connect_async(profile='180d', timeout=10,
+                                     reply_handler=lambda: replies.append(1))
+        self.assertListEqual([('ConnectProfile', ['180d'], 10)],
+                             self._async_calls(ble_dev))
+        self.assertFalse(call.done())
+        ble_dev.bus.call_async.call_args[0][6]()
+        self.assertListEqual([1], replies)
+        self.assertIsNone(call.result())
+        self.assertFalse(call.cancel())
+
+    def test_connect_no_reply(self):
+        class NoReply(Exception):
+            def get_dbus_name(self):
+                return 'org.freedesktop.DBus.Error.NoReply'
+
+        ble_dev = self.module_under_test.Device(self.adapter_addr,
+                                                self.device_addr)
+        ble_dev.bus.call_async.reset_mock()
+        errors = []
+        call = ble_dev.connect_async(error_handler=errors.append)
+        ble_dev.bus.call_async.call_args[0][7](NoReply())
+        self.assertEqual(1, len(errors))
+        self.assertRaises(NoReply, call.result)
+        self.assertListEqual([('Connect', [], 35), ('Disconnect', [], -1)],
+                             self._async_calls(ble_dev))
+
+    def test_await_async(self):
+        ble_dev = self.module_under_test.Device(self.adapter_addr,
+                                                self.device_addr)
+        ble_dev.bus.call_async.reset_mock()
+
+        async def disconnect():
+            call = ble_dev.disconnect_async()
+            reply = ble_dev.bus.call_async.call_args[0][6]
+            asyncio.get_running_loop().call_soon(reply)
+            return await call
+
+        self.assertIsNone(asyncio.run(disconnect()))
+
+    def test_cancel_pairing(self):
+        ble_dev = self.module_under_test.Device(self.adapter_addr,
+                                                self.device_addr)
+        ble_dev.bus.call_async.reset_mock()
+
+        async def pair():
+            future = ble_dev.pair_async(timeout=60).future()
+            future.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await future
+
+        asyncio.run(pair())
+        self.assertListEqual([('Pair', [], 60), ('CancelPairing', [], -1)],
+                             self._async_calls(ble_dev))
+
+    def test_available_info(self):
+        dbus_tools = self.module_under_test.dbus_tools
+        with patch.object(dbus_tools, 'get_managed_objects',
+                          return_value=tests.obj_data.full_ubits) as get_objs:
+            infos = list(self.module_under_test.available_info())
+            self.assertEqual(1, get_objs.call_count)
+            by_path = {info.path: info for info in infos}
+            info = by_path[self.path]
+            self.assertEqual(self.device_addr, info.address)
+            self.assertEqual(self.adapter_addr, info.adapter)
+            self.assertEqual(self.dev_name, info.name)
+            self.assertIsInstance(info.uuids, tuple)
+            self.assertRaises(AttributeError, setattr, info, 'name', 'x')
+            self.assertEqual(self.path, info.device().remote_device_path)
+            self.assertEqual(1, get_objs.call_count)
+        self.assertListEqual(
+            [], list(self.module_under_test.available_info('no:adapter')))
+
+    def test_available(self):
+        dbus_tools = self.module_under_test.dbus_tools
+        with patch.object(dbus_tools, 'get_managed_objects',
+                          return_value=tests.obj_data.full_ubits) as get_objs:
+            devices = list(self.module_under_test.Device.available())
+            self.assertEqual(1, get_objs.call_count)
+        self.assertTrue(all(isinstance(dev, self.module_under_test.Device)
+                            for dev in devices))
+        self.assertIn(self.path,
+                      [dev.remote_device_path for dev in devices])
+        self.assertListEqual(
+            [], list(self.module_under_test.Device.available('no:adapter')))
+
+    def test_registry(self):
+        registry = self.module_under_test.DeviceRegistry(self.adapter_path)
+        get_objs = self.dbus_mock.Interface.return_value.GetManagedObjects
+        get_objs.reset_mock()
+        ble_dev = registry.get(self.path, self.device_addr)
+        self.assertIs(ble_dev, registry.get(self.path))
+        self.assertIs(ble_dev, registry.get(
+            registry.path_for(self.device_addr)))
+        get_objs.assert_not_called()
+        self.assertTrue(registry.owns(self.path))
+        self.assertFalse(registry.owns('/org/bluez/hci1/dev_D4_AE_95_4C_3E_A4'))
+        self.assertEqual(1, len(registry))
+        self.assertGreater(registry.memory_usage(), 0)
+        registry.remove(self.path)
+        self.assertNotIn(self.path, registry)
+        self.assertIsNot(ble_dev, registry.get(self.path))
+
+    def test_registry_bounded(self):
+        registry = self.module_under_test.DeviceRegistry(self.adapter_path,
+                                                         max_devices=2)
+        paths = [f'{self.adapter_path}/dev_00_00_00_00_00_0{index}'
+                 for index in range(3)]
+        devices = [registry.get(path) for path in paths[:2]]
+        with patch.object(devices[0], 'close') as close:
+            registry.get(paths[2])
+            # Still held by the caller so it is not closed
+            close.assert_not_called()
+        self.assertEqual(2, len(registry))
+        self.assertNotIn(paths[0], registry)
+        # The same instance is returned while a reference remains
+        self.assertIs(devices[0], registry.get(paths[0]))
+        self.assertNotIn(paths[1], registry)
+        devices = None
+        gc.collect()
+        self.assertEqual(0, len(registry._evicted))
+        single = registry.memory_usage()
+        registry.clear()
+        self.assertEqual(0, len(registry))
+        self.assertLess(registry.memory_usage(), single)
+
+    def test_last_seen(self):
+        last_seen = self.module_under_test.LastSeen(timeout=10)
+        paths = [f'{self.adapter_path}/dev_00_00_00_00_00_0{index}'
+                 for index in range(3)]
+        for now, path in enumerate(paths):
+            self.assertTrue(last_seen.seen(path, now=now))
+        self.assertFalse(last_seen.seen(paths[0], now=5))
+        self.assertListEqual([], last_seen.expired(now=10.5))
+        self.assertListEqual(paths[1:], last_seen.expired(now=12))
+        self.assertEqual(5, last_seen.last_seen(paths[0]))
+        self.assertTrue(last_seen.remove(paths[0]))
+        self.assertFalse(last_seen.remove(paths[0]))
+        self.assertEqual(0, len(last_seen))
+
 if __name__ == '__main__':
     # avoid writing to stderr
     unittest.main(testRunner=unittest.TextTestRunner(stream=sys.stdout,
@@ -0,0 +1,81 @@
+"""Tests for building the discovery filters applied by bluetoothd."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+
+class TestDiscoveryFilter(unittest.TestCase):
+    """
+    Check the fields of a discovery filter and the D-Bus argument built.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import discovery_filter
+        self.module_under_test = discovery_filter
+
+    def tearDown(self):
+        self.module_patcher.stop()
+
+    def test_empty(self):
+        scan_filter = self.module_under_test.DiscoveryFilter()
+        self.assertDictEqual({}, scan_filter.fields())
+        self.assertSetEqual(set(), scan_filter.keys())
+
+    def test_keys(self):
+        scan_filter = self.module_under_test.DiscoveryFilter(
+            uuids=['180f'], rssi=-70, transport='le', duplicate_data=False)
+        self.assertSetEqual({'UUIDs', 'RSSI', 'Transport', 'DuplicateData'},
+                            scan_filter.keys())
+
+    def test_to_dbus(self):
+        self.dbus_mock.Dictionary.reset_mock()
+        self.dbus_mock.Array.reset_mock()
+        self.module_under_test.DiscoveryFilter(
+            uuids=['180f'], pattern='micro:bit').to_dbus()
+        self.dbus_mock.Array.assert_called_once_with(
+            ['0000180f-0000-1000-8000-00805f9b34fb'], signature='s')
+        filter_dict = self.dbus_mock.Dictionary.call_args.args[0]
+        self.assertListEqual(['UUIDs', 'Pattern'], list(filter_dict))
+
+    def test_single_uuid(self):
+        self.dbus_mock.Array.reset_mock()
+        scan_filter = self.module_under_test.DiscoveryFilter(uuids='180f')
+        self.assertListEqual(['180f'], scan_filter.uuids)
+        scan_filter.to_dbus()
+        self.dbus_mock.Array.assert_called_once_with(
+            ['0000180f-0000-1000-8000-00805f9b34fb'], signature='s')
+
+    def test_updated(self):
+        scan_filter = self.module_under_test.DiscoveryFilter(
+            rssi=-70, duplicate_data=True)
+        new_filter = scan_filter.updated(rssi=None, pathloss=60)
+        self.assertDictEqual({'pathloss': 60, 'duplicate_data': True},
+                             new_filter.fields())
+        self.assertEqual(-70, scan_filter.rssi)
+        self.assertRaises(ValueError, scan_filter.updated, rssi_min=-70)
+
+    def test_invalid(self):
+        filter_class = self.module_under_test.DiscoveryFilter
+        self.assertRaises(ValueError, filter_class, rssi=-70, pathloss=60)
+        self.assertRaises(ValueError, filter_class, rssi=-200)
+        self.assertRaises(ValueError, filter_class, pathloss=200)
+        self.assertRaises(ValueError, filter_class, transport='usb')
+
+
+if __name__ == '__main__':
+    unittest.main()
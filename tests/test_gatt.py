@@ -84,6 +84,53 @@ class TestBluezeroService(unittest.TestCase):
         # Test for the UUID
         self.assertEqual(test_service.primary, True)
 
+    def test_not_resolved(self):
+        """Test unresolved objects give a clear error and check the mode."""
+        chrc = self.module_under_test.Characteristic(
+            self.adapter_addr, self.device_addr, self.service_uuid,
+            'e95d9250-251d-470a-a062-fa1922dfa9a8')
+        with self.assertRaisesRegex(RuntimeError, 'not resolved'):
+            chrc.snapshot()
+        with self.assertRaisesRegex(RuntimeError, 'not resolved'):
+            chrc.refresh()
+        with self.assertRaises(ValueError):
+            chrc.freshness = 'stale'
+        with self.assertRaises(ValueError):
+            self.module_under_test.Service(self.adapter_addr,
+                                           self.device_addr,
+                                           self.service_uuid, 'stale')
+
+    def test_notify_counted_as_transfer(self):
+        """Test notifications pause discovery like reads and writes."""
+        chrc = self.module_under_test.Characteristic(
+            self.adapter_addr, self.device_addr, self.service_uuid,
+            'e95d9250-251d-470a-a062-fa1922dfa9a8')
+        chrc.characteristic_methods = MagicMock()
+        chrc.characteristic_props = MagicMock(object_path=self.path)
+        scheduler = self.module_under_test.scan_scheduler
+        callback = MagicMock()
+        with patch.object(scheduler, 'transfer_started') as started, \
+                patch.object(scheduler, 'transfer_finished') as finished, \
+                patch.object(scheduler, 'transfer_activity') as activity, \
+                patch.object(self.module_under_test.signal_hub,
+                             'get_hub') as get_hub:
+            chrc.start_notify()
+            started.assert_called_once_with(self.adapter_addr)
+            finished.assert_not_called()
+            chrc.characteristic_methods.StartNotify.call_args[1][
+                'reply_handler']()
+            finished.assert_called_once_with(self.adapter_addr)
+
+            chrc.add_characteristic_cb(callback)
+            properties_changed = get_hub.return_value.subscribe.call_args[0][0]
+            properties_changed(constants.GATT_CHRC_IFACE, {'Value': [1]}, [])
+            activity.assert_called_once_with(self.adapter_addr)
+            callback.assert_called_once_with(constants.GATT_CHRC_IFACE,
+                                             {'Value': [1]}, [])
+            properties_changed(constants.GATT_CHRC_IFACE,
+                               {'Notifying': True}, [])
+            activity.assert_called_once_with(self.adapter_addr)
+
 
 if __name__ == '__main__':
     # avoid writing to stderr
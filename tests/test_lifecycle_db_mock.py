@@ -0,0 +1,101 @@
+"""
+Soak test that closing Bluezero objects releases their resources.
+
+The number of cycles is small by default so the test can run in CI. Set
+``BLUEZERO_SOAK_CYCLES`` for a longer run, e.g. 10000.
+"""
+import gc
+import os
+from pathlib import Path
+import subprocess
+
+import dbus
+import dbusmock
+
+from bluezero import central
+from bluezero import dbus_tools
+from bluezero import property_cache
+from bluezero import signal_hub
+
+CYCLES = int(os.environ.get('BLUEZERO_SOAK_CYCLES', '200'))
+WARM_UP = max(CYCLES // 20, 10)
+# Allowance for allocator noise, not for per-cycle growth
+RSS_ALLOWANCE = 8 * 1024 * 1024
+DEVICE_ADDR = 'E9:06:4D:45:FC:8D'
+SRV_UUID = 'e95d6100-251d-470a-a062-fa1922dfa9a8'
+CHRC_UUID = 'e95d9250-251d-470a-a062-fa1922dfa9a8'
+
+
+def rss_bytes():
+    """Resident set size of this process"""
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def match_count(bus):
+    """
+    Match rules the bus daemon holds for the connection, or None if the
+    daemon was built without the statistics interface
+    """
+    stats = dbus.Interface(bus.get_object('org.freedesktop.DBus',
+                                          '/org/freedesktop/DBus'),
+                           'org.freedesktop.DBus.Debug.Stats')
+    try:
+        return int(stats.GetConnectionStats(bus.get_unique_name())
+                   ['MatchRules'])
+    except dbus.exceptions.DBusException:
+        return None
+
+
+class TestLifecycle(dbusmock.DBusTestCase):
+    """
+    Create and close Central objects against a mocked bluetoothd.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        here = Path(__file__).parent
+        template = str(here.joinpath('dbusmock_templates', 'bluez_scan.py'))
+        cls.start_system_bus()
+        cls.dbus_con = cls.get_dbus(True)
+        (cls.p_mock, cls.obj_bluez) = cls.spawn_server_template(
+            template, {}, stdout=subprocess.PIPE)
+
+    def setUp(self):
+        self.obj_bluez.Reset()
+        self.dbusmock = dbus.Interface(self.obj_bluez, dbusmock.MOCK_IFACE)
+        self.dbusmock_bluez = dbus.Interface(self.obj_bluez, 'org.bluez.Mock')
+        self.dbusmock_bluez.AddAdapter('hci0', 'My-Test-Device')
+        self.dbusmock_bluez.AddDevice('hci0', DEVICE_ADDR, 'micro:bit[test]')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.stop_dbus(cls.system_bus_pid)
+        cls.p_mock.terminate()
+        cls.p_mock.wait()
+
+    @staticmethod
+    def cycle():
+        with central.Central(DEVICE_ADDR) as monitor:
+            monitor.dongle.on_connect = lambda dev: None
+            monitor.rmt_device.freshness = property_cache.SIGNAL
+            monitor.rmt_device.name
+            monitor.add_characteristic(SRV_UUID, CHRC_UUID)
+
+    def test_create_close(self):
+        bus = dbus_tools.get_system_bus()
+        hub = signal_hub.get_hub(bus)
+        baseline_matches = match_count(bus)
+        for _ in range(WARM_UP):
+            self.cycle()
+        gc.collect()
+        start_rss = rss_bytes()
+        for _ in range(CYCLES):
+            self.cycle()
+        gc.collect()
+        if baseline_matches is not None:
+            self.assertEqual(baseline_matches, match_count(bus))
+        self.assertEqual(0, hub.match_rule_count())
+        self.assertEqual(0, hub.subscriber_count())
+        self.assertEqual(0, property_cache.subscription_count())
+        self.assertLess(rss_bytes() - start_rss, RSS_ALLOWANCE)
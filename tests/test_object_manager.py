@@ -0,0 +1,167 @@
+"""Tests for the process-wide mirror of the BlueZ object tree."""
+import copy
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+import tests.obj_data
+from bluezero import constants
+
+
+class TestObjectManagerMirror(unittest.TestCase):
+    """
+    Use a mocked DBus to check the mirror is seeded once and then
+    updated from the object manager signals.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.mngd_objs = copy.deepcopy(tests.obj_data.full_ubits)
+        self.get_managed_objects = MagicMock(return_value=self.mngd_objs)
+        self.dbus_mock.Interface.return_value.GetManagedObjects = \
+            self.get_managed_objects
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import object_manager
+        from bluezero import dbus_tools
+        self.module_under_test = object_manager
+        self.dbus_tools = dbus_tools
+        self.bus = MagicMock()
+        self.bus.get_object.return_value = MagicMock()
+        self.dev_path = '/org/bluez/hci0/dev_11_22_33_44_55_66'
+
+    def tearDown(self):
+        self.module_under_test.disable_mirror()
+        self.module_patcher.stop()
+
+    def test_seeded_once(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        self.assertEqual(1, self.get_managed_objects.call_count)
+        for _ in range(5):
+            self.dbus_tools.get_managed_objects()
+        self.dbus_tools.get_dbus_path(adapter='00:00:00:00:5A:AD',
+                                      device='F7:17:E4:09:C0:C6')
+        self.assertEqual(1, self.get_managed_objects.call_count)
+        self.assertEqual(1, mirror.sync_count)
+
+    def test_signal_subscriptions(self):
+        self.module_under_test.enable_mirror(self.bus)
+        signals = [call.kwargs['signal_name']
+                   for call in self.bus.add_signal_receiver.call_args_list]
+        self.assertListEqual(['InterfacesAdded', 'InterfacesRemoved',
+                              'PropertiesChanged'], signals)
+        self.bus.watch_name_owner.assert_called_once()
+        self.module_under_test.disable_mirror()
+        receiver = self.bus.add_signal_receiver.return_value
+        self.assertEqual(3, receiver.remove.call_count)
+
+    def test_interfaces_added_removed(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        mirror._interfaces_added(self.dev_path, {
+            constants.DEVICE_INTERFACE: {'Address': '11:22:33:44:55:66',
+                                         'Name': 'Test Dev'}})
+        found = self.dbus_tools.get_device_addresses('Test Dev')
+        self.assertListEqual([{'11:22:33:44:55:66': 'Test Dev'}], found)
+        mirror._interfaces_removed(self.dev_path,
+                                   [constants.DEVICE_INTERFACE])
+        self.assertNotIn(self.dev_path,
+                         self.dbus_tools.get_managed_objects())
+        self.assertEqual(1, self.get_managed_objects.call_count)
+
+    def test_properties_changed(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        path = '/org/bluez/hci0/dev_EB_F6_95_27_84_A0'
+        mirror._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'Connected': False},
+                                   ['Name'],
+                                   path)
+        props = mirror.objects[path][constants.DEVICE_INTERFACE]
+        self.assertFalse(props['Connected'])
+        self.assertNotIn('Name', props)
+        self.assertFalse(mirror.stale)
+
+    def test_unknown_object_resync(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        mirror._properties_changed(constants.DEVICE_INTERFACE,
+                                   {'RSSI': -50}, [], self.dev_path)
+        self.assertTrue(mirror.stale)
+        self.dbus_tools.get_managed_objects()
+        self.assertEqual(2, self.get_managed_objects.call_count)
+
+    def test_max_age(self):
+        mirror = self.module_under_test.enable_mirror(self.bus, max_age=10)
+        self.assertFalse(mirror.stale)
+        mirror.last_sync -= 11
+        self.assertTrue(mirror.stale)
+        self.dbus_tools.get_managed_objects()
+        self.assertEqual(2, mirror.sync_count)
+
+    def test_bluez_restart(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        mirror._name_owner_changed(':1.5')
+        self.assertFalse(mirror.stale)
+        mirror._name_owner_changed('')
+        self.assertDictEqual({}, self.dbus_tools.get_managed_objects())
+        mirror._name_owner_changed(':1.9')
+        self.assertTrue(mirror.stale)
+
+    def test_index_lookup(self):
+        index = self.module_under_test.PathIndex(self.mngd_objs)
+        dev_path = index.lookup(constants.DEVICE_INTERFACE,
+                                'f7:17:e4:09:c0:c6', '/org/bluez/hci0')
+        self.assertEqual('/org/bluez/hci0/dev_F7_17_E4_09_C0_C6', dev_path)
+        srv_path = index.lookup(constants.GATT_SERVICE_IFACE,
+                                'E95DF2D8-251D-470A-A062-FA1922DFA9A8',
+                                dev_path)
+        self.assertEqual(dev_path + '/service0031', srv_path)
+        self.assertIsNone(index.lookup(constants.GATT_SERVICE_IFACE,
+                                       '1800', None))
+
+    def test_index_16bit_uuid(self):
+        index = self.module_under_test.PathIndex(self.mngd_objs)
+        chrc_path = '/org/bluez/hci0/dev_F7_17_E4_09_C0_C6/service0031/' \
+                    'char0035'
+        self.assertEqual(chrc_path + '/desc0037',
+                         index.lookup(constants.GATT_DESC_IFACE,
+                                      '2902', chrc_path))
+
+    def test_index_skipped_level(self):
+        index = self.module_under_test.PathIndex(self.mngd_objs)
+        self.assertEqual(
+            '/org/bluez/hci0/dev_F7_17_E4_09_C0_C6/service0031/char0035',
+            index.lookup(constants.GATT_CHRC_IFACE,
+                         'e95d9715-251d-470a-a062-fa1922dfa9a8',
+                         '/org/bluez/hci0/dev_F7_17_E4_09_C0_C6'))
+
+    def test_index_incremental(self):
+        mirror = self.module_under_test.enable_mirror(self.bus)
+        mirror._interfaces_added(self.dev_path, {
+            constants.DEVICE_INTERFACE: {'Address': '11:22:33:44:55:66'}})
+        mirror._interfaces_added(self.dev_path + '/service0001', {
+            constants.GATT_SERVICE_IFACE: {'UUID': '0000180f-0000-1000-'
+                                                   '8000-00805f9b34fb'}})
+        self.assertEqual(self.dev_path + '/service0001',
+                         self.dbus_tools.get_dbus_path('00:00:00:00:5A:AD',
+                                                       '11:22:33:44:55:66',
+                                                       '180F'))
+        mirror._interfaces_removed(self.dev_path + '/service0001',
+                                   [constants.GATT_SERVICE_IFACE])
+        self.assertIsNone(self.dbus_tools.get_dbus_path('00:00:00:00:5A:AD',
+                                                        '11:22:33:44:55:66',
+                                                        '180F'))
+        self.assertEqual(1, self.get_managed_objects.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""Tests for reading BlueZ properties with a selectable freshness."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+import tests.obj_data
+from bluezero import constants
+
+
+class TestPropertyCache(unittest.TestCase):
+    """
+    Check how many D-Bus calls are made for each freshness mode.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import property_cache
+        self.module_under_test = property_cache
+        self.path = '/org/bluez/hci0/dev_E4_43_33_7E_54_1C'
+        self.dev_props = dict(
+            tests.obj_data.full_ubits[self.path][constants.DEVICE_INTERFACE])
+        self.props_iface = MagicMock()
+        self.props_iface.Get.side_effect = (
+            lambda iface, name: self.dev_props[name])
+        self.props_iface.GetAll.side_effect = (
+            lambda iface: dict(self.dev_props))
+
+    def tearDown(self):
+        self.module_patcher.stop()
+
+    def _cache(self, mode):
+        return self.module_under_test.PropertyCache(
+            self.props_iface, constants.DEVICE_INTERFACE, self.path, mode)
+
+    def test_live(self):
+        cache = self._cache(self.module_under_test.LIVE)
+        self.assertEqual('BBC micro:bit [pugit]', cache.get('Name'))
+        self.assertEqual(True, cache.get('Connected'))
+        self.assertEqual(2, self.props_iface.Get.call_count)
+        self.props_iface.GetAll.assert_not_called()
+
+    def test_snapshot(self):
+        cache = self._cache(self.module_under_test.SNAPSHOT)
+        self.assertEqual('BBC micro:bit [pugit]', cache.get('Name'))
+        self.assertEqual(True, cache.get('Connected'))
+        self.assertEqual(1, self.props_iface.GetAll.call_count)
+        self.props_iface.Get.assert_not_called()
+        self.dev_props['Connected'] = False
+        self.assertEqual(True, cache.get('Connected'))
+        cache.refresh()
+        self.assertEqual(False, cache.get('Connected'))
+        self.assertEqual(2, self.props_iface.GetAll.call_count)
+
+    def test_snapshot_missing(self):
+        cache = self._cache(self.module_under_test.SNAPSHOT)
+        self.assertIsNone(cache.get('RSSI', None))
+        self.assertRaises(KeyError, cache.get, 'RSSI')
+
+    def test_snapshot_copy(self):
+        cache = self._cache(self.module_under_test.SNAPSHOT)
+        values = cache.snapshot()
+        values['Name'] = 'changed'
+        self.assertEqual('BBC micro:bit [pugit]', cache.get('Name'))
+        self.assertEqual(1, self.props_iface.GetAll.call_count)
+
+    def test_set(self):
+        cache = self._cache(self.module_under_test.SNAPSHOT)
+        cache.refresh()
+        cache.set('Trusted', True)
+        self.props_iface.Set.assert_called_once_with(
+            constants.DEVICE_INTERFACE, 'Trusted', True)
+        self.assertEqual(True, cache.get('Trusted'))
+
+    def test_signal(self):
+        bus = self.module_under_test.dbus_tools.get_system_bus()
+        bus.reset_mock()
+        cache = self._cache(self.module_under_test.SIGNAL)
+        receiver = bus.add_signal_receiver.return_value
+        self.assertEqual('PropertiesChanged',
+                         bus.add_signal_receiver.call_args.kwargs[
+                             'signal_name'])
+        cache.get('Name')
+        signal_cb = bus.add_signal_receiver.call_args.args[0]
+        signal_cb(constants.DEVICE_INTERFACE, {'RSSI': -70}, [],
+                  path='/org/bluez/hci0/dev_00_00_00_00_00_01')
+        self.assertIsNone(cache.get('RSSI', None))
+        signal_cb(constants.DEVICE_INTERFACE, {'RSSI': -60}, ['Name'],
+                  path=self.path)
+        self.assertEqual(-60, cache.get('RSSI'))
+        self.assertIsNone(cache.get('Name', None))
+        cache.close()
+        receiver.remove.assert_called_once()
+        self.assertEqual(0, self.module_under_test.subscription_count())
+
+    def test_shared_subscription(self):
+        bus = self.module_under_test.dbus_tools.get_system_bus()
+        bus.reset_mock()
+        caches = [self._cache(self.module_under_test.SIGNAL)
+                  for _ in range(5)]
+        self.assertEqual(1, bus.add_signal_receiver.call_count)
+        self.assertEqual(1, self.module_under_test.subscription_count())
+        self.assertEqual(True, caches[0].get('Connected'))
+        signal_cb = bus.add_signal_receiver.call_args.args[0]
+        signal_cb(constants.DEVICE_INTERFACE, {'Connected': False}, [],
+                  path=self.path)
+        self.assertEqual(False, caches[4].get('Connected'))
+        self.assertEqual(1, self.props_iface.GetAll.call_count)
+        receiver = bus.add_signal_receiver.return_value
+        caches[0].close()
+        del caches[1]
+        receiver.remove.assert_not_called()
+        del caches[:]
+        receiver.remove.assert_called_once()
+        self.assertEqual(0, self.module_under_test.subscription_count())
+
+    def test_bad_mode(self):
+        self.assertRaises(ValueError, self._cache, 'sometimes')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for the RSSI ring buffers of devices."""
+import unittest
+
+from bluezero import rssi_history
+
+DEV_PATH = '/org/bluez/hci0/dev_11_22_33_44_55_66'
+
+
+class TestRssiHistory(unittest.TestCase):
+    """
+    Check the buffers are bounded and the statistics are correct.
+    """
+
+    def test_ring_buffer(self):
+        buffer = rssi_history.RssiBuffer(samples=3)
+        for now, rssi in enumerate((-70, -60, -50, -40)):
+            buffer.append(rssi, now=now)
+        self.assertEqual(3, len(buffer))
+        self.assertListEqual([-60, -50, -40], buffer.values())
+        self.assertListEqual([(1, -60, None), (2, -50, None),
+                              (3, -40, None)], buffer.samples())
+        stats = buffer.stats()
+        self.assertEqual(-40, stats.latest)
+        self.assertEqual(-50, stats.mean)
+        self.assertEqual(-50, stats.median)
+        self.assertLess(stats.ewma, -40)
+        self.assertGreater(stats.ewma, -70)
+        self.assertIsNone(rssi_history.RssiBuffer().stats())
+
+    def test_kalman_smoothing(self):
+        buffer = rssi_history.RssiBuffer()
+        for rssi in (-60, -80) * 10:
+            buffer.append(rssi)
+        self.assertAlmostEqual(-70, buffer.kalman, delta=3)
+
+    def test_distance(self):
+        self.assertAlmostEqual(1.0, rssi_history.distance(-59))
+        self.assertAlmostEqual(10.0, rssi_history.distance(-79))
+        self.assertAlmostEqual(1.0, rssi_history.distance(-41, tx_power=0))
+
+    def test_update(self):
+        history = rssi_history.RssiHistory(samples=4)
+        history.update(DEV_PATH, {'Name': 'sensor'})
+        self.assertNotIn(DEV_PATH, history)
+        history.update(DEV_PATH, {'RSSI': -60, 'TxPower': 4})
+        history.update(DEV_PATH, {'RSSI': -62})
+        stats = history.stats()[DEV_PATH]
+        self.assertEqual(2, stats.count)
+        self.assertEqual(4, stats.tx_power)
+        history.remove(DEV_PATH)
+        self.assertEqual(0, len(history))
+
+    def test_bounded(self):
+        history = rssi_history.RssiHistory(samples=8, max_devices=2)
+        paths = [f'{DEV_PATH[:-1]}{index}' for index in range(3)]
+        for path in paths:
+            history.add(path, -60)
+        self.assertEqual(2, len(history))
+        self.assertNotIn(paths[0], history)
+        size = history.memory_usage()
+        for _ in range(100):
+            history.add(paths[1], -61)
+        self.assertEqual(size, history.memory_usage())
+
+
+if __name__ == '__main__':
+    unittest.main()
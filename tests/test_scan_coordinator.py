@@ -0,0 +1,108 @@
+"""Tests for discovery on several adapters in one event loop."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from bluezero import constants
+
+HCI0 = '/org/bluez/hci0'
+HCI1 = '/org/bluez/hci1'
+DEV_ADDR = '11:22:33:44:55:66'
+DEV_NAME = 'dev_11_22_33_44_55_66'
+
+
+class TestScanCoordinator(unittest.TestCase):
+    """
+    Check signals from all adapters are merged into one result.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.exceptions': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import scan_coordinator
+        self.module_under_test = scan_coordinator
+        infos = []
+        for path, address in ((HCI0, '00:00:00:00:00:01'),
+                              (HCI1, '00:00:00:00:00:02')):
+            info = MagicMock(path=path, address=address)
+            info.adapter.return_value = MagicMock(path=path)
+            infos.append(info)
+        with patch.object(scan_coordinator.adapter, 'available_info',
+                          return_value=infos):
+            self.scanner = scan_coordinator.ScanCoordinator()
+        self.scanner.mainloop = MagicMock()
+
+    def tearDown(self):
+        self.module_patcher.stop()
+
+    def _advert(self, adapter_path, rssi):
+        self.scanner._interfaces_added(
+            f'{adapter_path}/{DEV_NAME}',
+            {constants.DEVICE_INTERFACE: {'Address': DEV_ADDR,
+                                          'RSSI': rssi}})
+
+    def test_strongest_rssi(self):
+        def signals():
+            self._advert(HCI0, -80)
+            self._advert(HCI1, -50)
+            self.scanner._properties_changed(
+                constants.DEVICE_INTERFACE, {'RSSI': -85}, [],
+                path=f'{HCI0}/dev_AA_BB_CC_DD_EE_FF')
+            self.scanner.mainloop.quit.assert_not_called()
+            self.scanner._timeout()
+
+        self.scanner.mainloop.run.side_effect = signals
+        found = self.scanner.scan(timeout=5)
+        self.assertListEqual([(DEV_ADDR, '00:00:00:00:00:02', -50),
+                              ('AA:BB:CC:DD:EE:FF', '00:00:00:00:00:01',
+                               -85)],
+                             [(dev.address, dev.adapter, dev.rssi)
+                              for dev in found])
+        stats = self.scanner.stats['00:00:00:00:00:01']
+        self.assertEqual(2, stats.signals)
+        self.assertEqual(2, stats.devices)
+        self.assertIsNotNone(stats.duration)
+        self.assertEqual(1, self.scanner.stats['00:00:00:00:00:02'].devices)
+
+    def test_stop_on_match(self):
+        def signals():
+            self._advert(HCI0, -90)
+            self.scanner.mainloop.quit.assert_not_called()
+            self._advert(HCI1, -60)
+            self.scanner.mainloop.quit.assert_called_once()
+            self._advert(HCI0, -40)
+
+        self.scanner.mainloop.run.side_effect = signals
+        found = self.scanner.scan(rssi=-70)
+        self.assertEqual(1, len(found))
+        self.assertEqual(-60, found[0].rssi)
+        for dongle in self.scanner.adapters.values():
+            dongle.start_discovery.assert_called_once()
+            dongle.stop_discovery.assert_called_once()
+        self.assertEqual(1, self.scanner.stats['00:00:00:00:00:02'].matched)
+        self.assertEqual(0, self.scanner.stats['00:00:00:00:00:01'].matched)
+
+    def test_close(self):
+        dongles = list(self.scanner.adapters.values())
+        with self.scanner:
+            pass
+        for dongle in dongles:
+            dongle.close.assert_called_once()
+        self.assertDictEqual({}, self.scanner.adapters)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""Tests for the scan duty cycle and pausing discovery for transfers."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+ADAPTER_ADDR = '00:00:00:00:5A:AD'
+
+
+class TestScanScheduler(unittest.TestCase):
+    """
+    Check windows start and stop discovery and transfers pause it.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module and the GLib timers
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.exceptions': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import scan_scheduler
+        self.module_under_test = scan_scheduler
+        self.timers = {}
+
+        def add_timer_ms(time, callback):
+            timer = len(self.timers) + 1000
+            while timer in self.timers:
+                timer += 1
+            self.timers[timer] = (time, callback)
+            return timer
+
+        def remove_timer(timer):
+            del self.timers[timer]
+
+        self.timer_patchers = [
+            patch.object(scan_scheduler.async_tools, 'add_timer_ms',
+                         side_effect=add_timer_ms),
+            patch.object(scan_scheduler.async_tools, 'remove_timer',
+                         side_effect=remove_timer),
+        ]
+        for patcher in self.timer_patchers:
+            patcher.start()
+        self.dongle = MagicMock(address=ADAPTER_ADDR.lower())
+
+    def tearDown(self):
+        for patcher in self.timer_patchers:
+            patcher.stop()
+        self.module_under_test._in_flight.clear()
+        self.module_under_test._schedulers.clear()
+        self.module_patcher.stop()
+
+    def _fire(self):
+        """Call the last timer added and return its interval"""
+        time, callback = self.timers.pop(list(self.timers)[-1])
+        self.assertFalse(callback())
+        return time
+
+    def _scheduler(self, priority):
+        scheduler = self.module_under_test.ScanScheduler(
+            self.dongle, 1, 4, priority)
+        scheduler.start()
+        return scheduler
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            self.module_under_test.ScanScheduler(self.dongle, 5, 4)
+        with self.assertRaises(ValueError):
+            self.module_under_test.ScanScheduler(self.dongle, 0, 4)
+        with self.assertRaises(ValueError):
+            self.module_under_test.ScanScheduler(self.dongle, 1, 4, 'radio')
+        with self.assertRaises(ValueError):
+            self.module_under_test.ScanScheduler(self.dongle, 1, 4,
+                                                 holdoff=-1)
+
+    def test_windows(self):
+        scheduler = self._scheduler(self.module_under_test.BALANCED)
+        self.dongle.start_discovery.assert_called_once_with()
+        self.assertTrue(scheduler.scanning)
+        self.assertEqual(1000, self._fire())
+        self.dongle.stop_discovery.assert_called_once_with()
+        self.assertFalse(scheduler.scanning)
+        self.assertEqual(3000, self._fire())
+        self.assertEqual(2, self.dongle.start_discovery.call_count)
+        self.assertEqual(2, scheduler.windows)
+        scheduler.stop()
+        self.assertEqual(2, self.dongle.stop_discovery.call_count)
+        self.assertFalse(scheduler.running)
+        self.assertGreater(scheduler.coverage, 0)
+        self.assertDictEqual({}, self.module_under_test._schedulers)
+
+    def test_continuous(self):
+        scheduler = self.module_under_test.ScanScheduler(self.dongle, 2, 2)
+        scheduler.start()
+        self.assertEqual(2000, self._fire())
+        self.assertEqual(2000, self._fire())
+        self.dongle.start_discovery.assert_called_once_with()
+        self.dongle.stop_discovery.assert_not_called()
+        self.assertEqual(3, scheduler.windows)
+
+    def test_connection_priority(self):
+        scheduler = self._scheduler(self.module_under_test.CONNECTION)
+        with self.module_under_test.transfer(ADAPTER_ADDR):
+            self.dongle.stop_discovery.assert_called_once_with()
+            self.assertEqual(1, scheduler.pauses)
+            with self.module_under_test.transfer(ADAPTER_ADDR):
+                self.assertEqual(
+                    2, self.module_under_test.transfers_in_flight(
+                        ADAPTER_ADDR))
+        # Discovery resumes after a quiet period, not after each transfer
+        for _ in range(3):
+            with self.module_under_test.transfer(ADAPTER_ADDR):
+                pass
+            self.module_under_test.transfer_activity(ADAPTER_ADDR)
+        self.dongle.start_discovery.assert_called_once_with()
+        self.dongle.stop_discovery.assert_called_once_with()
+        self.assertEqual(500, self._fire())
+        self.assertEqual(2, self.dongle.start_discovery.call_count)
+        # Windows are skipped for as long as transfers continue
+        self._fire()
+        self.module_under_test.transfer_started(ADAPTER_ADDR)
+        for _ in range(4):
+            self._fire()
+        self.assertEqual(2, self.dongle.start_discovery.call_count)
+        self.assertEqual(2, scheduler.skipped_windows)
+
+    def test_balanced_priority(self):
+        scheduler = self._scheduler(self.module_under_test.BALANCED)
+        self.module_under_test.transfer_started(ADAPTER_ADDR)
+        self.assertFalse(scheduler.scanning)
+        self._fire()
+        self._fire()
+        self.assertFalse(scheduler.scanning)
+        self._fire()
+        # The skipped window makes the next one scan during the transfer
+        self._fire()
+        self.assertTrue(scheduler.scanning)
+        self.assertEqual(1, scheduler.skipped_windows)
+        # Further transfers in the starved window do not pause it
+        self.module_under_test.transfer_finished(ADAPTER_ADDR)
+        for _ in range(5):
+            with self.module_under_test.transfer(ADAPTER_ADDR):
+                self.assertTrue(scheduler.scanning)
+        self.assertEqual(1, scheduler.pauses)
+        self.assertTrue(scheduler.scanning)
+        # The next window is not starved so transfers pause it again
+        self._fire()
+        self._fire()
+        with self.module_under_test.transfer(ADAPTER_ADDR):
+            self.assertFalse(scheduler.scanning)
+        self.assertEqual(2, scheduler.pauses)
+
+    def test_no_holdoff(self):
+        scheduler = self.module_under_test.ScanScheduler(
+            self.dongle, 1, 4, self.module_under_test.CONNECTION, holdoff=0)
+        scheduler.start()
+        self.module_under_test.transfer_activity(ADAPTER_ADDR)
+        self.assertEqual(2, self.dongle.start_discovery.call_count)
+        self.assertEqual(1, len(self.timers))
+
+    def test_holdoff_ends_with_window(self):
+        scheduler = self._scheduler(self.module_under_test.CONNECTION)
+        self.module_under_test.transfer_activity(ADAPTER_ADDR)
+        self.assertEqual(2, len(self.timers))
+        # Closing the window drops the hold-off and the next one resumes
+        _, end_window = self.timers.pop(list(self.timers)[0])
+        end_window()
+        self.assertEqual(1, len(self.timers))
+        self._fire()
+        self.assertTrue(scheduler.scanning)
+        self.assertEqual(2, self.dongle.start_discovery.call_count)
+        scheduler.stop()
+        self.assertDictEqual({}, self.timers)
+
+    def test_scan_priority(self):
+        scheduler = self._scheduler(self.module_under_test.SCAN)
+        with self.module_under_test.transfer(ADAPTER_ADDR):
+            self.assertTrue(scheduler.scanning)
+        self.dongle.stop_discovery.assert_not_called()
+        self.assertEqual(0, scheduler.pauses)
+
+    def test_transfer_error(self):
+        with self.assertRaises(RuntimeError):
+            with self.module_under_test.transfer(ADAPTER_ADDR):
+                raise RuntimeError('failed')
+        self.assertEqual(
+            0, self.module_under_test.transfers_in_flight(ADAPTER_ADDR))
+
+
+if __name__ == '__main__':
+    unittest.main()
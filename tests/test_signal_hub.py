@@ -0,0 +1,97 @@
+"""Tests for routing BlueZ signals through one match rule per signal."""
+import unittest
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from bluezero import constants
+
+DEV_PATH = '/org/bluez/hci0/dev_11_22_33_44_55_66'
+PROPS_IFACE = 'org.freedesktop.DBus.Properties'
+
+
+class TestSignalHub(unittest.TestCase):
+    """
+    Check match rules are shared and signals reach the right subscribers.
+    """
+
+    dbus_mock = MagicMock()
+    mainloop_mock = MagicMock()
+    gobject_mock = MagicMock()
+
+    def setUp(self):
+        """
+        Patch the DBus module
+        :return:
+        """
+        modules = {
+            'dbus': self.dbus_mock,
+            'dbus.mainloop.glib': self.mainloop_mock,
+            'gi.repository': self.gobject_mock,
+        }
+        self.module_patcher = patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        from bluezero import signal_hub
+        self.module_under_test = signal_hub
+        self.bus = MagicMock()
+        self.hub = signal_hub.get_hub(self.bus)
+
+    def tearDown(self):
+        self.module_patcher.stop()
+
+    def _emit(self, *args, path):
+        dispatch = self.bus.add_signal_receiver.call_args.args[0]
+        dispatch(*args, path=path)
+
+    def test_one_hub_per_bus(self):
+        self.assertIs(self.hub, self.module_under_test.get_hub(self.bus))
+        self.assertIsNot(self.hub,
+                         self.module_under_test.get_hub(MagicMock()))
+
+    def test_one_match_rule(self):
+        subs = [self.hub.subscribe(MagicMock(), 'PropertiesChanged',
+                                   PROPS_IFACE, path=f'{DEV_PATH}{index}')
+                for index in range(50)]
+        self.assertEqual(1, self.bus.add_signal_receiver.call_count)
+        self.assertEqual(1, self.hub.match_rule_count())
+        self.assertEqual(50, self.hub.subscriber_count())
+        receiver = self.bus.add_signal_receiver.return_value
+        for sub in subs[1:]:
+            sub.remove()
+        receiver.remove.assert_not_called()
+        subs[0].remove()
+        subs[0].remove()
+        receiver.remove.assert_called_once()
+        self.assertEqual(0, self.hub.match_rule_count())
+
+    def test_routing(self):
+        on_path = MagicMock()
+        on_iface = MagicMock()
+        on_other = MagicMock()
+        self.hub.subscribe(on_path, 'PropertiesChanged', PROPS_IFACE,
+                           path=DEV_PATH)
+        self.hub.subscribe(on_iface, 'PropertiesChanged', PROPS_IFACE,
+                           arg0=constants.DEVICE_INTERFACE,
+                           path_keyword='path')
+        self.hub.subscribe(on_other, 'PropertiesChanged', PROPS_IFACE,
+                           path='/org/bluez/hci1')
+        self._emit(constants.DEVICE_INTERFACE, {'RSSI': -40}, [],
+                   path=DEV_PATH)
+        on_path.assert_called_once_with(constants.DEVICE_INTERFACE,
+                                        {'RSSI': -40}, [])
+        on_iface.assert_called_once_with(constants.DEVICE_INTERFACE,
+                                         {'RSSI': -40}, [], path=DEV_PATH)
+        on_other.assert_not_called()
+        self._emit(constants.GATT_CHRC_IFACE, {}, [], path=DEV_PATH)
+        self.assertEqual(2, on_path.call_count)
+        self.assertEqual(1, on_iface.call_count)
+
+    def test_callback_error(self):
+        after = MagicMock()
+        self.hub.subscribe(MagicMock(side_effect=ValueError),
+                           'InterfacesAdded', constants.DBUS_OM_IFACE)
+        self.hub.subscribe(after, 'InterfacesAdded', constants.DBUS_OM_IFACE)
+        self._emit(DEV_PATH, {}, path='/')
+        after.assert_called_once_with(DEV_PATH, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
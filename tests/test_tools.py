@@ -157,6 +157,14 @@ class TestDbusModuleCalls(unittest.TestCase):
         result = self.module_under_test.bytes_to_xyz([0x20, 0x00, 0xD0, 0x00, 0x20, 0xFC])
         self.assertEqual(result, [0.032, 0.208, -0.992])
 
+    def test_normalize_uuid(self):
+        expected = '0000180f-0000-1000-8000-00805f9b34fb'
+        for uuid_in in ['180F', '0x180f', '0000180F',
+                        '0000180F-0000-1000-8000-00805F9B34FB']:
+            with self.subTest(uuid_in=uuid_in):
+                self.assertEqual(
+                    expected, self.module_under_test.normalize_uuid(uuid_in))
+
 
 if __name__ == '__main__':
     unittest.main()